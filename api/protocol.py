@@ -0,0 +1,166 @@
+import asyncio
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class ApiError(Exception):
+    """
+    Raised by route handlers to send a specific HTTP status and message.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    """
+    A parsed HTTP/1.x request.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        target: str,
+        version: str,
+        headers: Dict[str, str],
+        body: bytes,
+    ):
+        self.method = method
+        self.version = version
+        self.headers = headers
+        self.body = body
+        # set by the server for authenticated routes
+        self.user: Optional[Dict[str, Any]] = None
+        self.client_ip: Optional[str] = None
+
+        parts = urlsplit(target)
+        self.path = parts.path
+        self.query = dict(parse_qsl(parts.query))
+
+    @property
+    def bearer_token(self) -> Optional[str]:
+        scheme, _, token = self.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer":
+            return None
+        return token.strip() or None
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self) -> Dict[str, Any]:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise ApiError(400, "Request body is not valid JSON.")
+        if not isinstance(data, dict):
+            raise ApiError(400, "Request body must be a JSON object.")
+        return data
+
+
+class Response:
+    """
+    An HTTP response whose body is serialised as JSON.
+    """
+
+    def __init__(self, status: int = 200, data: Any = None, headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {}
+
+    def encode(self, keep_alive: bool) -> bytes:
+        body = b"" if self.data is None else dumps(self.data)
+        reason = HTTPStatus(self.status).phrase
+        head = [
+            f"HTTP/1.1 {self.status} {reason}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        head.extend(f"{name}: {value}" for name, value in self.headers.items())
+        return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+def _default(value: Any) -> Any:
+    """
+    JSON fallback for the column types mysql-connector returns.
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        # TIME columns come back as timedelta
+        total = int(value.total_seconds())
+        return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}"
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_encoder = json.JSONEncoder(default=_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(data: Any) -> bytes:
+    return _encoder.encode(data).encode("utf-8")
+
+
+async def read_request(reader) -> Optional[Request]:
+    """
+    Read one request from the stream; None on a clean EOF between requests.
+    Only Content-Length bodies are supported (no chunked uploads).
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        # no bytes at all is a normal keep-alive close
+        if not e.partial:
+            return None
+        raise
+    except asyncio.LimitOverrunError:
+        raise ApiError(431, "Request headers too large.")
+
+    if len(head) > MAX_HEADER_BYTES:
+        raise ApiError(431, "Request headers too large.")
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise ApiError(400, "Malformed request line.")
+
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise ApiError(411, "Chunked request bodies are not supported.")
+
+    # digits only: int() would also take "-5", "+5" and "1_000"
+    value = headers.get("content-length") or "0"
+    if not (value.isascii() and value.isdigit()):
+        raise ApiError(400, "Invalid Content-Length header.")
+    length = int(value)
+    if length > MAX_BODY_BYTES:
+        raise ApiError(413, "Request body too large.")
+    body = await reader.readexactly(length) if length else b""
+
+    return Request(method.upper(), target, version, headers, body)
@@ -0,0 +1,348 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from api.protocol import ApiError, Request
+from dataacesslayer.instrumentation import instrumentation
+
+
+Handler = Callable[..., Any]
+
+
+class Router:
+    """
+    Maps (method, path) to a handler. Path segments written as {name}
+    match a positive integer and are passed to the handler as keyword
+    arguments. Routes need a session token unless added with public=True.
+    """
+
+    def __init__(self):
+        self._routes: List[Tuple[str, Pattern, Handler, bool]] = []
+
+    def add(self, method: str, pattern: str, handler: Handler, public: bool = False) -> None:
+        regex = re.sub(r"\{(\w+)\}", r"(?P<\1>\\d+)", pattern)
+        self._routes.append((method, re.compile(f"^{regex}$"), handler, public))
+
+    def match(self, method: str, path: str) -> Tuple[Handler, Dict[str, int], bool]:
+        """
+        (handler, path params, public) for the request.
+        """
+        path_matched = False
+        for route_method, regex, handler, public in self._routes:
+            m = regex.match(path)
+            if not m:
+                continue
+            path_matched = True
+            if route_method == method:
+                return handler, {k: int(v) for k, v in m.groupdict().items()}, public
+        if path_matched:
+            raise ApiError(405, f"Method {method} not allowed for {path}.")
+        raise ApiError(404, f"No route for {path}.")
+
+
+def _require(data: Dict[str, Any], *fields: str) -> List[Any]:
+    missing = [f for f in fields if data.get(f) in (None, "")]
+    if missing:
+        raise ApiError(400, f"Missing field(s): {', '.join(missing)}.")
+    return [data[f] for f in fields]
+
+
+def _number(data: Dict[str, Any], field: str) -> Optional[float]:
+    value = data.get(field)
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"'{field}' must be a number.")
+
+
+def _require_admin(request: Request, action: str) -> None:
+    if (request.user or {}).get("role") != "admin":
+        raise PermissionError(f"Only administrators can {action}.")
+
+
+def _require_self_or_admin(request: Request, role: str, target_id: int) -> None:
+    """
+    Allow admins, and the customer/driver whose id is `target_id`.
+    """
+    user = request.user or {}
+    if user.get("role") == "admin":
+        return
+    if user.get("role") != role or user.get(f"{role}_id") != target_id:
+        raise PermissionError(f"You can only act on your own {role} account.")
+
+
+def _acting_id(request: Request, data: Dict[str, Any], role: str) -> int:
+    """
+    The customer/driver id a request acts for: the caller's own, or for
+    an admin the `<role>_id` field of the body.
+    """
+    field = f"{role}_id"
+    user = request.user or {}
+    if user.get("role") == "admin":
+        (value,) = _require(data, field)
+    elif user.get("role") == role and user.get(field):
+        value = data.get(field, user[field])
+    else:
+        raise PermissionError(f"Only {role}s and administrators can do this.")
+    try:
+        acting_id = int(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"'{field}' must be an integer.")
+    _require_self_or_admin(request, role, acting_id)
+    return acting_id
+
+
+def _found(row: Optional[Dict[str, Any]], what: str) -> Dict[str, Any]:
+    if row is None:
+        raise ApiError(404, f"{what} not found.")
+    return row
+
+
+# ---------------------------------------------------------------------------
+# Handlers: (context, request, **path_params) -> JSON-able result
+# ---------------------------------------------------------------------------
+
+def health(ctx, request: Request):
+    return {"status": "ok"}
+
+
+def login(ctx, request: Request):
+    username, password = _require(request.json(), "username", "password")
+    result = ctx.session_service.login(username, password, request.client_ip)
+    if not result:
+        raise ApiError(401, "Invalid credentials or inactive account.")
+    token, user = result
+    return {"token": token, "user": user}
+
+
+def logout(ctx, request: Request):
+    ctx.session_service.logout(request.bearer_token)
+    return {"status": "logged out"}
+
+
+def me(ctx, request: Request):
+    return request.user
+
+
+def register_customer(ctx, request: Request):
+    data = request.json()
+    full_name, address, phone, email, username, password = _require(
+        data, "full_name", "address", "phone", "email", "username", "password"
+    )
+    user_id = ctx.user_service.register_customer(
+        full_name=full_name,
+        address=address,
+        phone=phone,
+        email=email,
+        username=username,
+        password=password,
+    )
+    return 201, {"user_id": user_id}
+
+
+def register_driver(ctx, request: Request):
+    data = request.json()
+    (
+        full_name, address, phone, email,
+        username, password, license_number, vehicle_number,
+    ) = _require(
+        data, "full_name", "address", "phone", "email",
+        "username", "password", "license_number", "vehicle_number",
+    )
+    user_id = ctx.user_service.register_driver(
+        full_name=full_name,
+        address=address,
+        phone=phone,
+        email=email,
+        username=username,
+        password=password,
+        license_number=license_number,
+        vehicle_number=vehicle_number,
+    )
+    return 201, {"user_id": user_id}
+
+
+def list_customers(ctx, request: Request):
+    _require_admin(request, "list customers")
+    return ctx.customer_service.list_all()
+
+
+def get_customer(ctx, request: Request, customer_id: int):
+    _require_self_or_admin(request, "customer", customer_id)
+    return _found(ctx.customer_service.get_by_id(customer_id), "Customer")
+
+
+def customer_bookings(ctx, request: Request, customer_id: int):
+    _require_self_or_admin(request, "customer", customer_id)
+    return ctx.booking_service.get_customer_bookings(customer_id)
+
+
+def list_drivers(ctx, request: Request):
+    return ctx.driver_service.list_all()
+
+
+def list_available_drivers(ctx, request: Request):
+    return ctx.driver_service.list_available()
+
+
+def get_driver(ctx, request: Request, driver_id: int):
+    return _found(ctx.driver_service.get_by_id(driver_id), "Driver")
+
+
+def update_driver_status(ctx, request: Request, driver_id: int):
+    _require_self_or_admin(request, "driver", driver_id)
+    (status,) = _require(request.json(), "status")
+    if status not in ("available", "busy", "inactive"):
+        raise ApiError(400, "Status must be 'available', 'busy' or 'inactive'.")
+    ctx.driver_service.update_status(driver_id, status)
+    return {"driver_id": driver_id, "status": status}
+
+
+def driver_bookings(ctx, request: Request, driver_id: int):
+    _require_self_or_admin(request, "driver", driver_id)
+    return ctx.booking_service.get_driver_bookings(driver_id)
+
+
+def list_bookings(ctx, request: Request):
+    _require_admin(request, "list all bookings")
+    return ctx.booking_service.list_all()
+
+
+def create_booking(ctx, request: Request):
+    data = request.json()
+    customer_id = _acting_id(request, data, "customer")
+    pickup, dropoff, pickup_datetime = _require(
+        data, "pickup_location", "dropoff_location", "pickup_datetime"
+    )
+    booking_id = ctx.booking_service.create_booking_for_customer(
+        customer_id=customer_id,
+        pickup_location=pickup,
+        dropoff_location=dropoff,
+        pickup_datetime_str=pickup_datetime,
+        notes=data.get("notes"),
+    )
+    return 201, {"booking_id": booking_id}
+
+
+def update_booking(ctx, request: Request, booking_id: int):
+    data = request.json()
+    customer_id = _acting_id(request, data, "customer")
+    pickup, dropoff, pickup_datetime = _require(
+        data, "pickup_location", "dropoff_location", "pickup_datetime"
+    )
+    ctx.booking_service.update_booking(
+        booking_id=booking_id,
+        customer_id=customer_id,
+        pickup_location=pickup,
+        dropoff_location=dropoff,
+        pickup_datetime_str=pickup_datetime,
+        notes=data.get("notes"),
+    )
+    return {"booking_id": booking_id}
+
+
+def cancel_booking(ctx, request: Request, booking_id: int):
+    customer_id = _acting_id(request, request.json(), "customer")
+    ctx.booking_service.cancel_booking(booking_id, customer_id)
+    return {"booking_id": booking_id, "status": "cancelled"}
+
+
+def assign_driver(ctx, request: Request, booking_id: int):
+    _require_admin(request, "assign drivers")
+    (driver_id,) = _require(request.json(), "driver_id")
+    ctx.booking_service.assign_driver_to_booking(booking_id, int(driver_id))
+    return {"booking_id": booking_id, "status": "assigned"}
+
+
+def start_ride(ctx, request: Request, booking_id: int):
+    driver_id = _acting_id(request, request.json(), "driver")
+    ctx.booking_service.start_ride(booking_id, driver_id)
+    return {"booking_id": booking_id, "status": "ongoing"}
+
+
+def complete_ride(ctx, request: Request, booking_id: int):
+    data = request.json()
+    driver_id = _acting_id(request, data, "driver")
+    fare = ctx.booking_service.complete_ride(
+        booking_id,
+        driver_id,
+        distance_km=_number(data, "distance_km"),
+        duration_minutes=_number(data, "duration_minutes"),
+    )
+    return {"booking_id": booking_id, "status": "completed", "fare": fare}
+
+
+def quote_fare(ctx, request: Request):
+    data = request.json()
+    pickup, dropoff = _require(data, "pickup_location", "dropoff_location")
+    quote = ctx.booking_service.quote_fare(
+        pickup,
+        dropoff,
+        pickup_datetime_str=data.get("pickup_datetime"),
+        distance_km=_number(data, "distance_km"),
+        duration_minutes=_number(data, "duration_minutes"),
+    )
+    return quote.as_dict()
+
+
+def surge_status(ctx, request: Request):
+    surge = ctx.surge_pricing
+    if surge is None:
+        return {"enabled": False, "zones": {}}
+    return {"enabled": True, "zones": surge.snapshot()}
+
+
+def complete_location(ctx, request: Request):
+    return {"suggestions": ctx.locations.complete(request.query.get("q", ""))}
+
+
+def escalated_bookings(ctx, request: Request):
+    _require_admin(request, "view escalated bookings")
+    scheduler = ctx.ride_scheduler
+    if scheduler is None:
+        return []
+    return [
+        {"booking_id": booking_id, "escalated_at": at}
+        for booking_id, at in sorted(scheduler.escalated().items(), key=lambda item: item[1])
+    ]
+
+
+def sql_stats(ctx, request: Request):
+    _require_admin(request, "view SQL statistics")
+    return instrumentation.snapshot()
+
+
+def build_router() -> Router:
+    router = Router()
+    router.add("GET", "/health", health, public=True)
+    router.add("POST", "/api/login", login, public=True)
+    router.add("POST", "/api/logout", logout)
+    router.add("GET", "/api/me", me)
+
+    router.add("GET", "/api/customers", list_customers)
+    router.add("POST", "/api/customers", register_customer, public=True)
+    router.add("GET", "/api/customers/{customer_id}", get_customer)
+    router.add("GET", "/api/customers/{customer_id}/bookings", customer_bookings)
+
+    router.add("GET", "/api/drivers", list_drivers)
+    router.add("POST", "/api/drivers", register_driver, public=True)
+    router.add("GET", "/api/drivers/available", list_available_drivers)
+    router.add("GET", "/api/drivers/{driver_id}", get_driver)
+    router.add("PUT", "/api/drivers/{driver_id}/status", update_driver_status)
+    router.add("GET", "/api/drivers/{driver_id}/bookings", driver_bookings)
+
+    router.add("GET", "/api/bookings", list_bookings)
+    router.add("GET", "/api/bookings/escalated", escalated_bookings)
+    router.add("POST", "/api/bookings", create_booking)
+    router.add("PUT", "/api/bookings/{booking_id}", update_booking)
+    router.add("POST", "/api/bookings/{booking_id}/cancel", cancel_booking)
+    router.add("POST", "/api/bookings/{booking_id}/assign", assign_driver)
+    router.add("POST", "/api/bookings/{booking_id}/start", start_ride)
+    router.add("POST", "/api/bookings/{booking_id}/complete", complete_ride)
+    router.add("POST", "/api/fares/quote", quote_fare)
+    router.add("GET", "/api/fares/surge", surge_status)
+    router.add("GET", "/api/locations/complete", complete_location)
+
+    router.add("GET", "/api/diagnostics/sql", sql_stats)
+    return router
@@ -0,0 +1,248 @@
+import asyncio
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set
+
+from api.protocol import ApiError, Request, Response, read_request
+from api.routes import Router, build_router
+from dataacesslayer.instrumentation import instrumentation
+from services.rate_limiter import LoginRateLimited
+
+
+class ApiServer:
+    """
+    asyncio HTTP/1.1 JSON server over the service layer.
+
+    - Service calls are blocking (mysql-connector), so they run on a
+      thread pool whose size matches the Database connection pool.
+    - Keep-alive connections are pipelined: requests are parsed and
+      dispatched as they arrive, and responses are written back in
+      request order. GETs run concurrently; any other request waits for
+      everything before it on the connection, and later requests wait
+      for it, so pipelined writes take effect in order. At most
+      `pipeline_depth` requests per connection are in flight.
+    - stop() stops accepting, lets in-flight requests finish, then
+      releases the worker pool.
+    - Routes other than login/registration/health need an
+      "Authorization: Bearer <token>" header from POST /api/login.
+    """
+
+    def __init__(
+        self,
+        context,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        workers: int = 16,
+        pipeline_depth: int = 16,
+        router: Optional[Router] = None,
+    ):
+        self.context = context
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.pipeline_depth = pipeline_depth
+        self.router = router or build_router()
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-worker")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._reading: Set[asyncio.Task] = set()
+        self._closing = False
+
+    # ---- lifecycle -------------------------------------------------------
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        print(f"API server listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                # Windows event loops do not support signal handlers
+                pass
+        try:
+            await stop_event.wait()
+        finally:
+            await self.stop()
+
+    async def stop(self, grace_period: float = 10.0) -> None:
+        """
+        Graceful shutdown: no new connections, finish in-flight requests,
+        close idle keep-alive connections, then shut down the workers.
+        """
+        if self._closing:
+            return
+        self._closing = True
+        print("API server shutting down...")
+
+        if self._server is not None:
+            self._server.close()
+
+        # connections waiting for their next request hold no work; their
+        # already-dispatched responses are still written before closing
+        for task in self._reading:
+            task.cancel()
+
+        if self._connections:
+            _, pending = await asyncio.wait(self._connections, timeout=grace_period)
+            for task in pending:
+                task.cancel()
+
+        if self._server is not None:
+            # on 3.12+ this also waits for the connections handled above
+            await self._server.wait_closed()
+
+        self._executor.shutdown(wait=True)
+        self.context.event_bus.close()
+        print("API server stopped.")
+
+    # ---- connection handling ---------------------------------------------
+
+    async def _serve_connection(self, reader, writer) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        peer = writer.get_extra_info("peername")
+        client_ip = peer[0] if peer else None
+        in_flight: "asyncio.Queue" = asyncio.Queue(maxsize=self.pipeline_depth)
+        responder = asyncio.ensure_future(self._write_responses(in_flight, writer))
+        # the last write on this connection, and the reads started since
+        last_write: Optional[asyncio.Future] = None
+        reads: List[asyncio.Future] = []
+        try:
+            while not self._closing:
+                self._reading.add(task)
+                try:
+                    request = await read_request(reader)
+                except ApiError as e:
+                    await in_flight.put((asyncio.ensure_future(self._error(e)), False))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                finally:
+                    self._reading.discard(task)
+                if request is None:
+                    break
+                request.client_ip = client_ip
+
+                keep_alive = request.keep_alive and not self._closing
+                if request.method in ("GET", "HEAD"):
+                    future = asyncio.ensure_future(self._dispatch_after([last_write], request))
+                    reads.append(future)
+                else:
+                    future = asyncio.ensure_future(self._dispatch_after([last_write, *reads], request))
+                    last_write, reads = future, []
+                await in_flight.put((future, keep_alive))
+                if not keep_alive:
+                    break
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await in_flight.put(None)
+            await responder
+            self._connections.discard(task)
+
+    async def _write_responses(self, in_flight: "asyncio.Queue", writer) -> None:
+        """
+        Write responses in request order. Keeps draining the queue after
+        the peer goes away so the reader side never blocks on a full queue.
+        """
+        done = False
+        try:
+            while True:
+                item = await in_flight.get()
+                if item is None:
+                    break
+                future, keep_alive = item
+                response = await future
+                if done:
+                    continue
+                try:
+                    writer.write(response.encode(keep_alive and not self._closing))
+                    await writer.drain()
+                except ConnectionError:
+                    done = True
+                if not keep_alive:
+                    done = True
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def _call_handler(self, handler, request: Request, params):
+        # one request = one service call for the SQL N+1 detector
+        with instrumentation.service_call(f"api.{handler.__name__}"):
+            return handler(self.context, request, **params)
+
+    async def _error(self, error: ApiError) -> Response:
+        return Response(error.status, {"error": error.message})
+
+    async def _dispatch_after(self, earlier: List[Optional[asyncio.Future]], request: Request) -> Response:
+        earlier = [future for future in earlier if future is not None]
+        if earlier:
+            await asyncio.wait(earlier)
+        return await self._dispatch(request)
+
+    async def _dispatch(self, request: Request) -> Response:
+        try:
+            handler, params, public = self.router.match(request.method, request.path)
+            if not public:
+                # O(1) in-memory check on the loop thread; no DB round-trip
+                request.user = self.context.session_service.authenticate(request.bearer_token)
+                if request.user is None:
+                    raise ApiError(401, "Missing, invalid or expired session token.")
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._executor, self._call_handler, handler, request, params
+            )
+        except ApiError as e:
+            return Response(e.status, {"error": e.message})
+        except LoginRateLimited as e:
+            return Response(429, {"error": str(e)}, {"Retry-After": str(int(e.retry_after) + 1)})
+        except PermissionError as e:
+            return Response(403, {"error": str(e)})
+        except ValueError as e:
+            return Response(400, {"error": str(e)})
+        except Exception as e:
+            print(f"Unhandled error for {request.method} {request.path}: {e!r}")
+            return Response(500, {"error": "Internal server error."})
+
+        if isinstance(result, tuple):
+            status, data = result
+            return Response(status, data)
+        return Response(200, result)
+
+
+def run(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    workers: int = 16,
+    metrics_port: Optional[int] = None,
+) -> None:
+    """
+    Build a headless AppContext and serve until SIGINT/SIGTERM.
+    With `metrics_port` (or METRICS["exporter_port"]) Prometheus
+    metrics are served on that port as well.
+    """
+    from ui.app_context import AppContext
+    from services.metrics import start_exporter
+
+    start_exporter(metrics_port)
+
+    # one pooled connection per worker, plus one for the main thread;
+    # AppContext adds one for each background thread it starts and one for
+    # password-hash upgrades
+    context = AppContext(pool_size=workers + 1)
+    # connect and check the schema now rather than on the first request,
+    # and build the session table before several threads race for it
+    context.db.release_connection()
+    context.session_service
+    context.start_background_services()
+    server = ApiServer(context, host=host, port=port, workers=workers)
+    asyncio.run(server.serve_forever())
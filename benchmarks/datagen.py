@@ -0,0 +1,155 @@
+# benchmarks/datagen.py
+#
+# Deterministic synthetic data: the same seed and sizes always produce the
+# same customers, drivers and bookings, so runs are comparable.
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from dataacesslayer.db_connector import Database
+from dataacesslayer.booking_dal import BookingDAL
+from dataacesslayer.customer_dal import CustomerDAL
+from dataacesslayer.driver_dal import DriverDAL
+from dataacesslayer.user_dal import UserDAL
+from services.password_hasher import get_default_hasher
+
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+# Fixed "now" so the time distribution does not depend on the wall clock.
+REFERENCE_TIME = datetime(2025, 6, 2, 12, 0)
+
+_FIRST_NAMES = ("Aarav", "Sita", "Ram", "Gita", "Hari", "Maya", "Bikash", "Anita", "Suman", "Priya")
+_LAST_NAMES = ("Shrestha", "Gurung", "Tamang", "Thapa", "Rai", "Karki", "Adhikari", "Magar")
+_PLACES = (
+    "Thamel", "Baneshwor", "Patan Durbar Square", "Tribhuvan Airport", "Boudha",
+    "Kalanki", "Koteshwor", "Lazimpat", "Jawalakhel", "Chabahil", "Balaju", "Bhaktapur",
+)
+
+# Relative demand per hour of day: morning and evening peaks, quiet nights.
+_HOUR_WEIGHTS = (
+    1, 1, 1, 1, 1, 2, 4, 8, 10, 7, 5, 5,
+    6, 5, 5, 6, 8, 10, 9, 7, 5, 4, 2, 1,
+)
+
+
+class SyntheticData:
+    """
+    Ids of what load() inserted, for picking benchmark inputs.
+    """
+
+    def __init__(self):
+        self.customer_ids: List[int] = []
+        self.driver_ids: List[int] = []
+        self.usernames: List[str] = []
+        self.booking_ids: List[int] = []
+        self.status_counts: Dict[str, int] = {}
+
+
+def _pickup_time(rng: random.Random, past_days: int, future_days: int) -> datetime:
+    day = rng.randint(-past_days, future_days)
+    hour = rng.choices(range(24), weights=_HOUR_WEIGHTS)[0]
+    minute = rng.randrange(0, 60, 5)
+    base = REFERENCE_TIME.replace(hour=0, minute=0)
+    return base + timedelta(days=day, hours=hour, minutes=minute)
+
+
+def _status_for(rng: random.Random, pickup: datetime) -> str:
+    if pickup < REFERENCE_TIME - timedelta(hours=2):
+        return rng.choices(("completed", "cancelled"), weights=(88, 12))[0]
+    if pickup < REFERENCE_TIME:
+        return "ongoing"
+    return rng.choices(("pending", "assigned", "cancelled"), weights=(60, 30, 10))[0]
+
+
+def load(
+    db: Database,
+    customers: int,
+    drivers: int,
+    bookings: int,
+    seed: int = 42,
+    past_days: int = 90,
+    future_days: int = 14,
+) -> SyntheticData:
+    """
+    Insert `customers` customers and `drivers` drivers (each with a login)
+    and `bookings` bookings through the DALs.
+
+    Every account shares BENCHMARK_PASSWORD, hashed once with the
+    configured scrypt cost so login timings are realistic without
+    spending minutes on set-up.
+    """
+    rng = random.Random(seed)
+    data = SyntheticData()
+    customer_dal = CustomerDAL(db)
+    driver_dal = DriverDAL(db)
+    user_dal = UserDAL(db)
+    booking_dal = BookingDAL(db)
+    password_hash = get_default_hasher().hash(BENCHMARK_PASSWORD)
+
+    def person(i: int, kind: str) -> Dict[str, str]:
+        return {
+            "full_name": f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}",
+            "address": rng.choice(_PLACES),
+            "phone": f"98{rng.randrange(10 ** 8):08d}",
+            "email": f"{kind}{i}@bench.example",
+        }
+
+    with db.transaction():
+        rows = [person(i, "customer") for i in range(customers)]
+        ids = customer_dal.create_customers(rows)
+        data.customer_ids = [ids[r["email"]] for r in rows]
+
+        rows = [
+            dict(person(i, "driver"), license_number=f"LIC-{i:06d}", vehicle_number=f"BA {i % 100} PA {i:04d}")
+            for i in range(drivers)
+        ]
+        ids = driver_dal.create_drivers(rows)
+        data.driver_ids = [ids[r["email"]] for r in rows]
+
+        users = [
+            {"username": f"customer{i}", "password_hash": password_hash, "role": "customer", "customer_id": cid}
+            for i, cid in enumerate(data.customer_ids)
+        ]
+        users += [
+            {"username": f"driver{i}", "password_hash": password_hash, "role": "driver", "driver_id": did}
+            for i, did in enumerate(data.driver_ids)
+        ]
+        user_dal.create_users(users)
+        data.usernames = [u["username"] for u in users if u["role"] == "customer"]
+
+    # Customers book at very different rates: a few heavy users, a long tail.
+    customer_weights = [rng.paretovariate(1.5) for _ in data.customer_ids]
+    busy_drivers = set()
+    # keep a fifth of the fleet free so there is someone to assign
+    max_busy = int(len(data.driver_ids) * 0.8)
+
+    with db.transaction():
+        for _ in range(bookings):
+            customer_id = rng.choices(data.customer_ids, weights=customer_weights)[0]
+            pickup, dropoff = rng.sample(_PLACES, 2)
+            pickup_dt = _pickup_time(rng, past_days, future_days)
+            booking_id = booking_dal.create_booking(customer_id, pickup, dropoff, pickup_dt)
+            data.booking_ids.append(booking_id)
+
+            status = _status_for(rng, pickup_dt)
+            if status in ("assigned", "ongoing"):
+                # at most one active ride per driver, as the service enforces
+                free = [d for d in data.driver_ids if d not in busy_drivers]
+                if len(busy_drivers) >= max_busy:
+                    status = "pending"
+                else:
+                    driver_id = rng.choice(free)
+                    busy_drivers.add(driver_id)
+                    booking_dal.assign_driver(booking_id, driver_id)
+                    if status == "ongoing":
+                        driver_dal.update_status(driver_id, "busy")
+            elif status == "completed":
+                booking_dal.assign_driver(booking_id, rng.choice(data.driver_ids))
+
+            if status != "pending":
+                booking_dal.update_status(booking_id, status)
+            data.status_counts[status] = data.status_counts.get(status, 0) + 1
+
+    return data
@@ -0,0 +1,239 @@
+# benchmarks/run.py
+#
+# Service-layer benchmarks against an embedded SQLite database:
+#
+#   python -m benchmarks.run
+#   python -m benchmarks.run --customers 2000 --bookings 50000 --output base.json
+#   python -m benchmarks.run --compare base.json
+#
+# Results are written as JSON (default: benchmarks/results/<commit>.json);
+# --compare prints the change against an earlier file and exits with
+# status 1 when an operation's p50 or p95 got slower than --threshold.
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.datagen import BENCHMARK_PASSWORD, REFERENCE_TIME, load
+from benchmarks.sqlite_db import SQLiteDatabase
+from services.booking_service import BookingService
+from services.rate_limiter import TokenBucketLimiter
+from services.user_services import UserService
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarise(samples: List[float]) -> Dict[str, float]:
+    """
+    Latency statistics in milliseconds for a list of durations in seconds.
+    """
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "mean_ms": total / len(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p95_ms": percentile(ordered, 95) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+        "ops_per_sec": len(ordered) / total if total else 0.0,
+    }
+
+
+class Timer:
+    """
+    Collects per-call durations, keyed by operation name.
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def time(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.samples.setdefault(name, []).append(time.perf_counter() - start)
+        return result
+
+    def results(self) -> Dict[str, Dict[str, float]]:
+        return {name: summarise(samples) for name, samples in self.samples.items()}
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    db = SQLiteDatabase(args.db_path)
+    db.init_schema()
+
+    started = time.perf_counter()
+    data = load(db, args.customers, args.drivers, args.bookings, seed=args.seed)
+    load_seconds = time.perf_counter() - started
+
+    user_service = UserService(db)
+    # measure the login path itself, not the credential-stuffing throttle
+    user_service.username_limiter = TokenBucketLimiter(float("inf"), 1.0)
+    booking_service = BookingService(db)
+
+    rng = random.Random(args.seed + 1)
+    timer = Timer()
+    iterations = args.iterations
+
+    for _ in range(args.warmup):
+        user_service.login(rng.choice(data.usernames), BENCHMARK_PASSWORD)
+        booking_service.get_customer_bookings(rng.choice(data.customer_ids))
+
+    for _ in range(iterations):
+        user = timer.time("login", user_service.login, rng.choice(data.usernames), BENCHMARK_PASSWORD)
+        if not user:
+            raise RuntimeError("Benchmark login failed; was the data generated with another password?")
+
+    new_bookings = []
+    for i in range(iterations):
+        pickup, dropoff = rng.sample(("Thamel", "Boudha", "Patan Durbar Square", "Kalanki"), 2)
+        pickup_at = REFERENCE_TIME + timedelta(days=1, minutes=5 * i)
+        new_bookings.append(
+            timer.time(
+                "create_booking_for_customer",
+                booking_service.create_booking_for_customer,
+                rng.choice(data.customer_ids),
+                pickup,
+                dropoff,
+                pickup_at.strftime("%Y-%m-%d %H:%M"),
+            )
+        )
+
+    for _ in range(iterations):
+        timer.time("get_customer_bookings", booking_service.get_customer_bookings, rng.choice(data.customer_ids))
+
+    for _ in range(max(5, iterations // 10)):
+        timer.time("list_all", booking_service.list_all)
+
+    # assign -> start -> complete on the bookings created above, cycling
+    # through the drivers and skipping any whose schedule clashes
+    schedule = booking_service.driver_schedule
+    for i, booking_id in enumerate(new_bookings):
+        window = schedule.window(booking_service.booking_dal.get_by_id(booking_id))
+        drivers = data.driver_ids[i % len(data.driver_ids):] + data.driver_ids[: i % len(data.driver_ids)]
+        driver_id = next((d for d in drivers if schedule.conflict(d, *window) is None), None)
+        if driver_id is None:
+            raise RuntimeError("No free drivers; generate more drivers than active bookings.")
+        timer.time("assign_driver_to_booking", booking_service.assign_driver_to_booking, booking_id, driver_id)
+        timer.time("start_ride", booking_service.start_ride, booking_id, driver_id)
+        timer.time("complete_ride", booking_service.complete_ride, booking_id, driver_id)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": "sqlite",
+            "customers": args.customers,
+            "drivers": args.drivers,
+            "bookings": args.bookings,
+            "iterations": iterations,
+            "seed": args.seed,
+            "load_seconds": round(load_seconds, 3),
+            "booking_statuses": data.status_counts,
+        },
+        "results": timer.results(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(report: Dict[str, Any]) -> None:
+    meta = report["meta"]
+    print(
+        f"{meta['customers']} customers, {meta['drivers']} drivers, {meta['bookings']} bookings "
+        f"(loaded in {meta['load_seconds']}s), {meta['iterations']} iterations"
+    )
+    print(f"{'operation':<30}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/sec':>12}")
+    for name, stats in report["results"].items():
+        print(
+            f"{name:<30}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+            f"{stats['p99_ms']:>10.3f}{stats['ops_per_sec']:>12.1f}"
+        )
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Print the change per operation; returns the regressed operation names.
+    """
+    regressions = []
+    print(f"\nagainst {baseline['meta'].get('commit') or 'baseline'}:")
+    print(f"{'operation':<30}{'p50':>10}{'p95':>10}")
+    for name, stats in report["results"].items():
+        before = baseline["results"].get(name)
+        if not before:
+            print(f"{name:<30}{'new':>10}{'new':>10}")
+            continue
+        changes = []
+        for key in ("p50_ms", "p95_ms"):
+            change = (stats[key] - before[key]) / before[key] if before[key] else 0.0
+            changes.append(change)
+        flag = "  REGRESSION" if max(changes) > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<30}{changes[0]:>+10.1%}{changes[1]:>+10.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the service layer on synthetic data.")
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--drivers", type=int, default=200)
+    parser.add_argument("--bookings", type=int, default=20000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-path", default=":memory:", help="SQLite file (default: in memory)")
+    parser.add_argument("--output", help="results JSON (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, 0.10 = 10%%")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args)
+    print_results(report)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['meta']['commit'] or 'latest'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
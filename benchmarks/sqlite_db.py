@@ -0,0 +1,203 @@
+# benchmarks/sqlite_db.py
+#
+# An embedded stand-in for dataacesslayer.db_connector.Database, so the
+# benchmarks run the real DALs and services without a MySQL server.
+
+import sqlite3
+import threading
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from dataacesslayer.db_connector import SCHEMA_VERSION, Database
+
+
+# The MySQL schema (all migrations applied) in SQLite terms. NOCASE
+# matches MySQL's case-insensitive default collation for the UNIQUE
+# columns the services look up by.
+SQLITE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS customers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        full_name TEXT NOT NULL,
+        address TEXT,
+        phone TEXT,
+        email TEXT UNIQUE COLLATE NOCASE,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS drivers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        full_name TEXT NOT NULL,
+        address TEXT,
+        phone TEXT,
+        email TEXT UNIQUE COLLATE NOCASE,
+        license_number TEXT,
+        vehicle_number TEXT,
+        status TEXT DEFAULT 'available'
+            CHECK (status IN ('available', 'busy', 'inactive')),
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL UNIQUE COLLATE NOCASE,
+        password_hash TEXT NOT NULL,
+        role TEXT NOT NULL CHECK (role IN ('customer', 'driver', 'admin')),
+        customer_id INTEGER NULL REFERENCES customers(id) ON DELETE SET NULL,
+        driver_id INTEGER NULL REFERENCES drivers(id) ON DELETE SET NULL,
+        is_active INTEGER DEFAULT 1,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS bookings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        customer_id INTEGER NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
+        pickup_location TEXT NOT NULL,
+        dropoff_location TEXT NOT NULL,
+        pickup_datetime DATETIME NOT NULL,
+        status TEXT DEFAULT 'pending'
+            CHECK (status IN ('pending', 'assigned', 'ongoing', 'completed', 'cancelled')),
+        driver_id INTEGER NULL REFERENCES drivers(id) ON DELETE SET NULL,
+        fare DECIMAL(10, 2) NULL,
+        surge_multiplier DECIMAL(4, 2) NOT NULL DEFAULT 1.00,
+        distance_km DECIMAL(7, 2),
+        duration_minutes DECIMAL(7, 1),
+        notes TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_booking_driver_datetime ON bookings (driver_id, pickup_datetime)",
+    "CREATE INDEX IF NOT EXISTS idx_booking_driver_status ON bookings (driver_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_booking_customer_datetime ON bookings (customer_id, pickup_datetime)",
+    "CREATE INDEX IF NOT EXISTS idx_booking_datetime ON bookings (pickup_datetime)",
+    "CREATE INDEX IF NOT EXISTS idx_driver_status ON drivers (status)",
+    "CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)",
+]
+
+
+def _parse_datetime(value: bytes) -> datetime:
+    return datetime.fromisoformat(value.decode("ascii"))
+
+
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(" "))
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_converter("DATETIME", _parse_datetime)
+sqlite3.register_converter("DECIMAL", lambda value: Decimal(value.decode("ascii")))
+
+
+class SQLiteCursor:
+    """
+    The subset of a mysql.connector cursor the DALs use: %s placeholders
+    and optional dict rows.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, dictionary: bool):
+        self._cursor = conn.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, query, params=None):
+        self._cursor.execute(query.replace("%s", "?"), tuple(params or ()))
+
+    def executemany(self, query, seq_params):
+        self._cursor.executemany(query.replace("%s", "?"), [tuple(p) for p in seq_params])
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {col[0]: value for col, value in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    @property
+    def rowcount(self) -> int:
+        # like CLIENT_FOUND_ROWS: SQLite counts matched rows for UPDATE
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(
+            path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA foreign_keys = ON")
+
+    def cursor(self, dictionary: bool = False) -> SQLiteCursor:
+        return SQLiteCursor(self._conn, dictionary)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def close(self):
+        self._conn.close()
+
+
+class SQLiteDatabase(Database):
+    """
+    Database backed by an embedded SQLite file (":memory:" by default).
+    commit()/transaction() are inherited, so services behave as they do
+    on MySQL. One connection is shared; use it from one thread.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.database_name = path
+        self.pool_size = None
+        self._pool = None
+        self._local = threading.local()
+        self.connection = SQLiteConnection(path)
+
+    def get_connection(self):
+        return self.connection
+
+    def release_connection(self):
+        pass
+
+    def get_schema_version(self) -> int:
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+        )
+        exists = cursor.fetchone()
+        row = None
+        if exists:
+            cursor.execute("SELECT version FROM schema_version")
+            row = cursor.fetchone()
+        cursor.close()
+        return row[0] if row else 0
+
+    def init_schema(self):
+        if self.get_schema_version() >= SCHEMA_VERSION:
+            return
+        cursor = self.connection.cursor()
+        for statement in SQLITE_SCHEMA:
+            cursor.execute(statement)
+        cursor.execute("DELETE FROM schema_version")
+        cursor.execute("INSERT INTO schema_version (version) VALUES (%s)", (SCHEMA_VERSION,))
+        self.connection.commit()
+        cursor.close()
@@ -4,3 +4,184 @@ DB_CONFIG = {
     "password": "Nep@l@123",
     "database": "taxi_booking_system"
 }
+
+# scrypt cost for users.password_hash; tune with
+#   python -m services.password_hasher --target-ms 100
+# Existing hashes are upgraded on the next successful login.
+PASSWORD_HASHING = {
+    "n": 16384,
+    "r": 8,
+    "p": 1,
+    "workers": 4,
+}
+
+# API sessions. With persist_path set, sessions (and the signing secret,
+# unless one is given here) survive restarts in that SQLite file.
+SESSION_SETTINGS = {
+    "ttl_seconds": 3600,
+    "max_sessions": 100000,
+    "persist_path": None,
+    "secret": None,
+}
+
+# Login throttling: token buckets per username and per client IP, and how
+# long an unknown username is answered from memory without a DB lookup.
+LOGIN_PROTECTION = {
+    "username_attempts": 5,
+    "username_refill_per_second": 1 / 12,
+    "ip_attempts": 30,
+    "ip_refill_per_second": 1.0,
+    "unknown_username_ttl_seconds": 60,
+    "max_tracked_keys": 100000,
+}
+
+# SQL statement statistics collected by BaseDAL (see
+# dataacesslayer/instrumentation.py). Off by default; the environment
+# variable TAXI_SQL_INSTRUMENTATION=1 turns it on without editing this file.
+SQL_INSTRUMENTATION = {
+    "enabled": False,
+    "slow_query_ms": 100,
+    "n_plus_one_threshold": 10,
+}
+
+# Per-method call counts and latency histograms for the service classes
+# (services/metrics.py). With exporter_port set, Prometheus can scrape
+# http://<exporter_host>:<exporter_port>/metrics.
+METRICS = {
+    "enabled": True,
+    "exporter_host": "127.0.0.1",
+    "exporter_port": None,
+}
+
+# Fares (services/fare_engine.py), in NPR. A trip costs
+#   max(minimum_fare, (base_fare + per_km * km + per_minute * minutes) * surcharge)
+#   + the flat fee of the pickup and dropoff zones.
+# Time-of-day surcharges are (first hour, end hour, multiplier) on the pickup
+# time; ranges may wrap past midnight and the highest multiplier wins.
+# Without a measured distance, the trip length comes from the zone table.
+TARIFF = {
+    "base_fare": 100,
+    "per_km": 45,
+    "per_minute": 3,
+    "minimum_fare": 150,
+    "average_speed_kmh": 20,
+    "time_surcharges": [
+        (22, 6, 1.5),
+        (7, 10, 1.2),
+        (17, 20, 1.2),
+    ],
+    "zones": {
+        "Thamel": "central",
+        "Lazimpat": "central",
+        "Baneshwor": "central",
+        "New Road": "central",
+        "Durbar Marg": "central",
+        "Boudha": "east",
+        "Chabahil": "east",
+        "Koteshwor": "east",
+        "Kalanki": "west",
+        "Balaju": "west",
+        "Swayambhu": "west",
+        "Patan Durbar Square": "south",
+        "Jawalakhel": "south",
+        "Lagankhel": "south",
+        "Tribhuvan Airport": "airport",
+        "Bhaktapur": "outer",
+        "Kirtipur": "outer",
+    },
+    # one-way km between zones; symmetric, so each pair is listed once
+    "zone_distances_km": {
+        "central": {"central": 3, "east": 6, "west": 5, "south": 5, "airport": 6, "outer": 12},
+        "east": {"east": 3, "west": 10, "south": 7, "airport": 3, "outer": 8},
+        "west": {"west": 3, "south": 7, "airport": 10, "outer": 9},
+        "south": {"south": 3, "airport": 6, "outer": 11},
+        "airport": {"airport": 2, "outer": 9},
+        "outer": {"outer": 6},
+    },
+    "zone_fees": {"airport": 200},
+    # used when a place is not in `zones`
+    "default_distance_km": 8,
+}
+
+# Surge pricing per tariff zone (services/surge_pricing.py). Demand is the
+# bookings created in a zone over the last window_seconds; supply is the
+# drivers available there. Above `threshold` bookings per available driver
+# the fare is multiplied by 1 + sensitivity * (pressure - threshold), up to
+# max_multiplier. The multiplier quoted at booking time is stored with the
+# booking and charged on completion.
+SURGE_PRICING = {
+    "enabled": True,
+    "window_seconds": 600,
+    "bucket_seconds": 10,
+    "recompute_seconds": 5,
+    "resync_seconds": 300,
+    "threshold": 1.0,
+    "sensitivity": 0.5,
+    "max_multiplier": 2.5,
+    "step": 0.1,
+}
+
+# Scheduled rides (services/ride_scheduler.py). Pending bookings are
+# dispatched to a free driver dispatch_lead_minutes before pickup, retried
+# every retry_seconds, and escalated to the admins when still unassigned
+# escalate_lead_minutes before pickup.
+RIDE_SCHEDULER = {
+    "enabled": True,
+    "dispatch_lead_minutes": 30,
+    "escalate_lead_minutes": 10,
+    "retry_seconds": 60,
+}
+
+# Driver schedules (services/driver_schedule.py). A ride keeps its driver
+# busy from pickup for the fare engine's estimated trip duration plus
+# turnaround_minutes; a driver can be assigned to any booking whose window
+# does not overlap one of theirs, so rides can be chained back-to-back.
+DRIVER_SCHEDULE = {
+    "turnaround_minutes": 10,
+}
+
+# Trip planner (services/trip_planner.py). Orders each driver's assigned
+# rides and suggests drivers for unassigned bookings by least extra empty
+# driving. A pickup may be up to pickup_slack_minutes late; no suggestion
+# needs an empty drive longer than max_deadhead_km. Planning moves to a
+# process pool (workers processes, None = one per CPU) from
+# parallel_min_drivers drivers.
+TRIP_PLANNER = {
+    "pickup_slack_minutes": 10,
+    "max_deadhead_km": 15,
+    "two_opt": True,
+    "workers": None,
+    "parallel_min_drivers": 200,
+    "chunk_size": 100,
+}
+
+# Pickup/dropoff locations (services/locations.py). Typed locations are
+# normalized and matched against the gazetteer (relative paths are from
+# the project root); a location that is just another spelling of a place
+# is stored under the gazetteer name, anything more detailed as typed.
+# Lookups are cached in cache_path (None to cache in memory only). With
+# both ends known, trip distance is the straight-line distance times
+# road_factor instead of the zone table.
+LOCATIONS = {
+    "gazetteer_path": "config/gazetteer.csv",
+    "cache_path": "~/.taxi_booking/geocode_cache.sqlite",
+    "road_factor": 1.3,
+    "fuzzy_cutoff": 0.85,
+    "abbreviations": {
+        "rd": "road",
+        "st": "street",
+        "chk": "chowk",
+        "sq": "square",
+        "intl": "international",
+        "apt": "airport",
+        "mkt": "market",
+        "hosp": "hospital",
+        "univ": "university",
+        "ktm": "kathmandu",
+        "opp": "opposite",
+    },
+    "ignore_words": ["kathmandu", "lalitpur", "nepal", "near", "opposite"],
+    "suggestions": 8,
+    # lookups kept in memory, and places kept in cache_path
+    "cache_size": 10000,
+}
@@ -0,0 +1,158 @@
+# app/dataaccesslayer/async_dal.py
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Optional, Type
+
+from .db_connector import Database
+from .base_dal import BaseDAL
+from .booking_dal import BookingDAL
+from .customer_dal import CustomerDAL
+from .driver_dal import DriverDAL
+from .user_dal import UserDAL
+
+
+# Set while inside AsyncDatabase.transaction(): every DAL call made by the
+# same task is routed to the transaction's dedicated thread/connection.
+_current_lane: contextvars.ContextVar[Optional[ThreadPoolExecutor]] = contextvars.ContextVar(
+    "async_dal_lane", default=None
+)
+
+
+class AsyncDatabase:
+    """
+    asyncio front-end for Database.
+
+    mysql-connector is blocking, so calls are offloaded to a thread pool.
+    The Database is pooled and every worker thread keeps its own
+    connection, which lets many coroutines run DAL calls at once while the
+    event loop stays free. Transactions get a dedicated single-thread
+    "lane" so all their statements share one connection.
+    """
+
+    def __init__(self, db: Database, workers: int = 8, transaction_lanes: int = 4):
+        if not db.pool_size or db.pool_size < workers + transaction_lanes:
+            raise ValueError(
+                "AsyncDatabase needs a pooled Database with at least "
+                "workers + transaction_lanes connections."
+            )
+        self.db = db
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="async-dal")
+        self._lanes = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"async-dal-tx{i}")
+            for i in range(transaction_lanes)
+        ]
+        self._free_lanes: Optional[asyncio.Queue] = None
+
+    @classmethod
+    async def connect(cls, workers: int = 8, transaction_lanes: int = 4) -> "AsyncDatabase":
+        """
+        Create the pooled Database without blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        db = await loop.run_in_executor(
+            None, functools.partial(Database, pool_size=workers + transaction_lanes + 1)
+        )
+        return cls(db, workers=workers, transaction_lanes=transaction_lanes)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the pool (or the current transaction's lane).
+        """
+        executor = _current_lane.get() or self._executor
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+    async def init_schema(self) -> None:
+        await self.run(self.db.init_schema)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        async with adb.transaction():
+            booking_id = await bookings.create_booking(...)
+            await bookings.assign_driver(booking_id, driver_id)
+
+        Commits once at the end, rolls back on any exception. Nested
+        blocks in the same task join the outer transaction.
+        """
+        if _current_lane.get() is not None:
+            yield self
+            return
+
+        if self._free_lanes is None:
+            self._free_lanes = asyncio.Queue()
+            for lane in self._lanes:
+                self._free_lanes.put_nowait(lane)
+
+        lane = await self._free_lanes.get()
+        token = _current_lane.set(lane)
+        try:
+            await self.run(self.db.begin)
+            try:
+                yield self
+            except BaseException:
+                await self.run(self.db.end, False)
+                raise
+            await self.run(self.db.end, True)
+        finally:
+            _current_lane.reset(token)
+            self._free_lanes.put_nowait(lane)
+
+    async def close(self) -> None:
+        """
+        Wait for queued calls to finish and stop the worker threads.
+        """
+        loop = asyncio.get_running_loop()
+        executors = [self._executor] + self._lanes
+        await loop.run_in_executor(
+            None, lambda: [executor.shutdown(wait=True) for executor in executors]
+        )
+
+
+class AsyncBaseDAL:
+    """
+    Async mirror of a synchronous DAL: every public method of `dal_class`
+    is available as a coroutine with the same name and arguments, so the
+    sync and async families cannot drift apart.
+    """
+
+    dal_class: Type[BaseDAL] = BaseDAL
+
+    def __init__(self, adb: AsyncDatabase):
+        self.adb = adb
+        self.dal = self.dal_class(adb.db)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        target = getattr(self.dal, name)
+        if not callable(target):
+            return target
+
+        @functools.wraps(target)
+        async def method(*args, **kwargs):
+            return await self.adb.run(target, *args, **kwargs)
+
+        # cache so later lookups skip __getattr__
+        setattr(self, name, method)
+        return method
+
+
+class AsyncBookingDAL(AsyncBaseDAL):
+    dal_class = BookingDAL
+
+
+class AsyncCustomerDAL(AsyncBaseDAL):
+    dal_class = CustomerDAL
+
+
+class AsyncDriverDAL(AsyncBaseDAL):
+    dal_class = DriverDAL
+
+
+class AsyncUserDAL(AsyncBaseDAL):
+    dal_class = UserDAL
@@ -1,10 +1,33 @@
+import re
+import sys
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Sequence
+
+from mysql.connector import IntegrityError, errorcode
+
 from .db_connector import Database
+from .instrumentation import InstrumentedCursor, instrumentation
+
+
+class DuplicateKeyError(ValueError):
+    """
+    An INSERT/UPDATE hit a UNIQUE constraint. `key` is the index name
+    reported by MySQL (e.g. 'username' or 'users.username').
+    """
+
+    def __init__(self, key: str, message: str):
+        super().__init__(message)
+        self.key = key
+
+
+_DUP_KEY_RE = re.compile(r"for key '([^']+)'")
 
 
 class BaseDAL:
     """
     Base Data Access Layer class to be inherited by all DALs.
-    Holds the shared Database instance and provides a helper for cursors.
+    Holds the shared Database instance and provides helpers for cursors
+    and commits.
     """
 
     def __init__(self, db: Database):
@@ -12,4 +35,77 @@ class BaseDAL:
 
     def _get_cursor(self, dictionary: bool = True):
         conn = self.db.get_connection()
-        return conn.cursor(dictionary=dictionary)
+        cursor = conn.cursor(dictionary=dictionary)
+        if not instrumentation.enabled:
+            return cursor
+        return InstrumentedCursor(cursor, self._caller_name(), instrumentation)
+
+    def _caller_name(self) -> str:
+        """
+        "<DAL class>.<public method>" that asked for the cursor, skipping
+        private helpers such as _insert_many().
+        """
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_name.startswith("_"):
+            frame = frame.f_back
+        name = frame.f_code.co_name if frame is not None else "?"
+        return f"{type(self).__name__}.{name}"
+
+    def _commit(self):
+        """
+        Commit the current statement, unless it is part of a
+        Database.transaction() block (which commits once at the end).
+        """
+        self.db.commit()
+
+    @contextmanager
+    def _unique_violations(self):
+        """
+        Turn MySQL duplicate-entry errors raised inside the block into
+        DuplicateKeyError, so services can rely on UNIQUE constraints
+        instead of checking first.
+        """
+        try:
+            yield
+        except IntegrityError as e:
+            if e.errno != errorcode.ER_DUP_ENTRY:
+                raise
+            match = _DUP_KEY_RE.search(str(e))
+            raise DuplicateKeyError(match.group(1) if match else "", str(e)) from e
+
+    def _insert_many(self, table: str, columns: Sequence[str], rows: List[Sequence[Any]]) -> None:
+        """
+        Insert `rows` (tuples in `columns` order) with one multi-row
+        INSERT statement. Duplicate keys raise DuplicateKeyError.
+        """
+        if not rows:
+            return
+        placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        query = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+            + ", ".join([placeholders] * len(rows))
+        )
+        params = [value for row in rows for value in row]
+
+        cursor = self._get_cursor()
+        with self._unique_violations():
+            cursor.execute(query, params)
+        self._commit()
+        cursor.close()
+
+    def _ids_by(self, table: str, column: str, values: Iterable[str]) -> Dict[str, int]:
+        """
+        Map casefolded `column` value -> id for the rows whose `column`
+        is one of `values` (a UNIQUE column, so one id per value).
+        """
+        values = list(values)
+        if not values:
+            return {}
+        placeholders = ", ".join(["%s"] * len(values))
+        query = f"SELECT id, {column} FROM {table} WHERE {column} IN ({placeholders})"
+
+        cursor = self._get_cursor(dictionary=False)
+        cursor.execute(query, values)
+        rows = cursor.fetchall()
+        cursor.close()
+        return {value.casefold(): row_id for row_id, value in rows}
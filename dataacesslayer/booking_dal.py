@@ -1,5 +1,6 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from datetime import datetime
+from decimal import Decimal
 from .base_dal import BaseDAL
 
 
@@ -15,6 +16,7 @@ class BookingDAL(BaseDAL):
         dropoff_location: str,
         pickup_datetime: datetime,
         notes: Optional[str] = None,
+        surge_multiplier: float = 1.0,
     ) -> int:
         """
         Insert a new booking with status 'pending'.
@@ -26,21 +28,23 @@ class BookingDAL(BaseDAL):
                 dropoff_location,
                 pickup_datetime,
                 status,
+                surge_multiplier,
                 notes
             )
-            VALUES (%s, %s, %s, %s, 'pending', %s)
+            VALUES (%s, %s, %s, %s, 'pending', %s, %s)
         """
         params = (
             customer_id,
             pickup_location,
             dropoff_location,
             pickup_datetime,
+            surge_multiplier,
             notes,
         )
 
         cursor = self._get_cursor()
         cursor.execute(query, params)
-        self.db.get_connection().commit()
+        self._commit()
         booking_id = cursor.lastrowid
         cursor.close()
         return booking_id
@@ -65,6 +69,7 @@ class BookingDAL(BaseDAL):
                 DATE(pickup_datetime) AS pickup_date,
                 TIME(pickup_datetime) AS pickup_time,
                 status,
+                fare,
                 notes
             FROM bookings
             WHERE customer_id = %s
@@ -88,6 +93,7 @@ class BookingDAL(BaseDAL):
                 DATE(pickup_datetime) AS pickup_date,
                 TIME(pickup_datetime) AS pickup_time,
                 status,
+                fare,
                 notes
             FROM bookings
             WHERE driver_id = %s
@@ -111,6 +117,7 @@ class BookingDAL(BaseDAL):
                 DATE(pickup_datetime) AS pickup_date,
                 TIME(pickup_datetime) AS pickup_time,
                 status,
+                fare,
                 notes
             FROM bookings
             ORDER BY pickup_datetime DESC
@@ -128,7 +135,7 @@ class BookingDAL(BaseDAL):
         query = "UPDATE bookings SET status = 'cancelled' WHERE id = %s"
         cursor = self._get_cursor()
         cursor.execute(query, (booking_id,))
-        self.db.get_connection().commit()
+        self._commit()
         cursor.close()
 
     def update_booking(
@@ -160,7 +167,7 @@ class BookingDAL(BaseDAL):
 
         cursor = self._get_cursor()
         cursor.execute(query, params)
-        self.db.get_connection().commit()
+        self._commit()
         cursor.close()
 
     def assign_driver(self, booking_id: int, driver_id: int) -> None:
@@ -174,7 +181,7 @@ class BookingDAL(BaseDAL):
         """
         cursor = self._get_cursor()
         cursor.execute(query, (driver_id, booking_id))
-        self.db.get_connection().commit()
+        self._commit()
         cursor.close()
 
     def update_status(self, booking_id: int, status: str) -> None:
@@ -184,22 +191,124 @@ class BookingDAL(BaseDAL):
         query = "UPDATE bookings SET status = %s WHERE id = %s"
         cursor = self._get_cursor()
         cursor.execute(query, (status, booking_id))
-        self.db.get_connection().commit()
+        self._commit()
         cursor.close()
 
-    def has_active_booking_for_driver(self, driver_id: int) -> bool:
+    def apply_transition(
+        self,
+        booking_id: int,
+        allowed_from: Iterable[str],
+        changes: Dict[str, Any],
+        owner_column: Optional[str] = None,
+        owner_id: Optional[int] = None,
+    ) -> int:
+        """
+        Apply `changes` (column -> value) only if the booking's status is
+        one of `allowed_from` and, when given, `owner_column` equals
+        `owner_id`. Check and write are one statement, so two callers
+        cannot both win. Returns the number of matched rows (0 or 1).
+        """
+        allowed_from = list(allowed_from)
+        conditions = ["id = %s", f"status IN ({', '.join(['%s'] * len(allowed_from))})"]
+        params = [*changes.values(), booking_id, *allowed_from]
+        if owner_column:
+            conditions.append(f"{owner_column} = %s")
+            params.append(owner_id)
+
+        assignments = ", ".join(f"{column} = %s" for column in changes)
+        query = f"""
+            UPDATE bookings
+            SET {assignments}
+            WHERE {' AND '.join(conditions)}
+        """
+
+        cursor = self._get_cursor()
+        cursor.execute(query, params)
+        self._commit()
+        matched = cursor.rowcount
+        cursor.close()
+        return matched
+
+    def list_commitments(self, driver_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Check if the driver already has any active booking
-        (pending/assigned/ongoing). Used to prevent overlapping rides.
+        Active bookings with a driver (all drivers, or just `driver_id`),
+        with what is needed to work out when each keeps its driver busy.
         """
         query = """
-            SELECT COUNT(*) AS cnt
+            SELECT id, driver_id, pickup_location, dropoff_location, pickup_datetime, status
             FROM bookings
-            WHERE driver_id = %s
+            WHERE driver_id IS NOT NULL
               AND status IN ('pending', 'assigned', 'ongoing')
         """
+        params: Tuple[Any, ...] = ()
+        if driver_id is not None:
+            query += " AND driver_id = %s"
+            params = (driver_id,)
         cursor = self._get_cursor()
-        cursor.execute(query, (driver_id,))
-        row = cursor.fetchone()
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def list_for_pricing(self, statuses: List[str]) -> List[Dict[str, Any]]:
+        """
+        The columns the fare engine needs, for every booking in `statuses`.
+        distance_km/duration_minutes are set for rides measured on completion.
+        """
+        placeholders = ", ".join(["%s"] * len(statuses))
+        query = f"""
+            SELECT
+                id, pickup_location, dropoff_location, pickup_datetime,
+                surge_multiplier, distance_km, duration_minutes, fare
+            FROM bookings
+            WHERE status IN ({placeholders})
+        """
+        cursor = self._get_cursor()
+        cursor.execute(query, list(statuses))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def set_fares(self, fares: List[Tuple[int, Decimal]]) -> None:
+        """
+        Store (booking id, fare) pairs.
+        """
+        query = "UPDATE bookings SET fare = %s WHERE id = %s"
+        cursor = self._get_cursor()
+        cursor.executemany(query, [(fare, booking_id) for booking_id, fare in fares])
+        self._commit()
+        cursor.close()
+
+    def list_pending_after(self, after: datetime) -> List[Tuple[int, datetime]]:
+        """
+        (booking id, pickup time) of pending bookings picked up after `after`.
+        """
+        query = """
+            SELECT id, pickup_datetime
+            FROM bookings
+            WHERE status = 'pending'
+              AND pickup_datetime > %s
+        """
+        cursor = self._get_cursor(dictionary=False)
+        cursor.execute(query, (after,))
+        rows = cursor.fetchall()
         cursor.close()
-        return row["cnt"] > 0 if row else False
+        return [(booking_id, pickup_datetime) for booking_id, pickup_datetime in rows]
+
+    def list_unassigned_after(self, after: datetime) -> List[Dict[str, Any]]:
+        """
+        Pending bookings without a driver, picked up after `after`.
+        """
+        query = """
+            SELECT id, pickup_location, dropoff_location, pickup_datetime
+            FROM bookings
+            WHERE status = 'pending'
+              AND driver_id IS NULL
+              AND pickup_datetime > %s
+            ORDER BY pickup_datetime
+        """
+        cursor = self._get_cursor()
+        cursor.execute(query, (after,))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
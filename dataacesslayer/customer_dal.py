@@ -1,6 +1,6 @@
 # app/dataaccesslayer/customer_dal.py
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from .base_dal import BaseDAL
 
 
@@ -26,12 +26,28 @@ class CustomerDAL(BaseDAL):
         params = (full_name, address, phone, email)
 
         cursor = self._get_cursor()
-        cursor.execute(query, params)
-        self.db.get_connection().commit()
+        with self._unique_violations():
+            cursor.execute(query, params)
+        self._commit()
         customer_id = cursor.lastrowid
         cursor.close()
         return customer_id
 
+    def create_customers(self, customers: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insert several customers with one statement.
+        Returns casefolded email -> new customer ID.
+        """
+        columns = ("full_name", "address", "phone", "email")
+        self._insert_many("customers", columns, [tuple(c[col] for col in columns) for c in customers])
+        return self.ids_by_email(c["email"] for c in customers)
+
+    def ids_by_email(self, emails: Iterable[str]) -> Dict[str, int]:
+        """
+        Casefolded email -> customer ID for the emails that exist.
+        """
+        return self._ids_by("customers", "email", emails)
+
     def get_by_id(self, customer_id: int) -> Optional[Dict[str, Any]]:
         """
         Get a customer by ID.
@@ -54,6 +70,17 @@ class CustomerDAL(BaseDAL):
         cursor.close()
         return row
 
+    def list_emails(self) -> List[str]:
+        """
+        Every customer email (for the in-memory uniqueness index).
+        """
+        query = "SELECT email FROM customers WHERE email IS NOT NULL"
+        cursor = self._get_cursor(dictionary=False)
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        cursor.close()
+        return [row[0] for row in rows]
+
     def list_all(self) -> List[Dict[str, Any]]:
         """
         Get all customers.
@@ -85,7 +112,7 @@ class CustomerDAL(BaseDAL):
 
         cursor = self._get_cursor()
         cursor.execute(query, params)
-        self.db.get_connection().commit()
+        self._commit()
         cursor.close()
 
     def delete_customer(self, customer_id: int) -> None:
@@ -95,5 +122,5 @@ class CustomerDAL(BaseDAL):
         query = "DELETE FROM customers WHERE id = %s"
         cursor = self._get_cursor()
         cursor.execute(query, (customer_id,))
-        self.db.get_connection().commit()
+        self._commit()
         cursor.close()
@@ -1,25 +1,195 @@
 # app/dataaccesslayer/db_connector.py
 
+import threading
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode, pooling
+from mysql.connector.constants import ClientFlag
 from config.settings import DB_CONFIG
 
 
+# Bump SCHEMA_VERSION and append to SCHEMA_MIGRATIONS whenever the schema
+# changes. init_schema() only runs the DDL newer than the version stored in
+# the schema_version table, so a normal start costs a single SELECT.
+SCHEMA_VERSION = 5
+
+SCHEMA_MIGRATIONS: List[Tuple[int, List[str]]] = [
+    (
+        1,
+        [
+            # 1. customers table (full customer details)
+            """
+            CREATE TABLE IF NOT EXISTS customers (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                full_name VARCHAR(100) NOT NULL,
+                address VARCHAR(255),
+                phone VARCHAR(20),
+                email VARCHAR(100) UNIQUE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP 
+                    ON UPDATE CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB;
+            """,
+            # 2. drivers table (full driver details)
+            """
+            CREATE TABLE IF NOT EXISTS drivers (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                full_name VARCHAR(100) NOT NULL,
+                address VARCHAR(255),
+                phone VARCHAR(20),
+                email VARCHAR(100) UNIQUE,
+                license_number VARCHAR(50),
+                vehicle_number VARCHAR(50),
+                status ENUM('available', 'busy', 'inactive') DEFAULT 'available',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP 
+                    ON UPDATE CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB;
+            """,
+            # 3. users table (auth + role; references customers/drivers)
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                username VARCHAR(50) NOT NULL UNIQUE,
+                password_hash VARCHAR(255) NOT NULL,
+                role ENUM('customer', 'driver', 'admin') NOT NULL,
+                customer_id INT NULL,
+                driver_id INT NULL,
+                is_active TINYINT(1) DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP 
+                    ON UPDATE CURRENT_TIMESTAMP,
+                CONSTRAINT fk_users_customer
+                    FOREIGN KEY (customer_id) REFERENCES customers(id)
+                    ON DELETE SET NULL,
+                CONSTRAINT fk_users_driver
+                    FOREIGN KEY (driver_id) REFERENCES drivers(id)
+                    ON DELETE SET NULL
+            ) ENGINE=InnoDB;
+            """,
+            # 4. bookings table
+            """
+            CREATE TABLE IF NOT EXISTS bookings (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                customer_id INT NOT NULL,
+                pickup_location VARCHAR(255) NOT NULL,
+                dropoff_location VARCHAR(255) NOT NULL,
+                pickup_datetime DATETIME NOT NULL,
+                status ENUM('pending', 'assigned', 'ongoing', 'completed', 'cancelled')
+                    DEFAULT 'pending',
+                driver_id INT NULL,
+                fare DECIMAL(10, 2) NULL,
+                notes TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP 
+                    ON UPDATE CURRENT_TIMESTAMP,
+                FOREIGN KEY (customer_id) REFERENCES customers(id)
+                    ON DELETE CASCADE,
+                FOREIGN KEY (driver_id) REFERENCES drivers(id)
+                    ON DELETE SET NULL,
+                INDEX idx_booking_driver_datetime (driver_id, pickup_datetime)
+            ) ENGINE=InnoDB;
+            """,
+        ],
+    ),
+    (
+        2,
+        [
+            # list_commitments(driver_id), run before every assignment: finds
+            # the driver's active rows by (driver_id, status), then reads
+            # the pickup/dropoff columns from those rows only
+            """
+            ALTER TABLE bookings
+                ADD INDEX idx_booking_driver_status (driver_id, status);
+            """,
+        ],
+    ),
+    (
+        3,
+        [
+            # list_by_customer(): filter and ORDER BY pickup_datetime from the index
+            """
+            ALTER TABLE bookings
+                ADD INDEX idx_booking_customer_datetime (customer_id, pickup_datetime);
+            """,
+            # list_all(): newest-first scan without a filesort
+            """
+            ALTER TABLE bookings
+                ADD INDEX idx_booking_datetime (pickup_datetime);
+            """,
+            # list_available()
+            """
+            ALTER TABLE drivers
+                ADD INDEX idx_driver_status (status);
+            """,
+        ],
+    ),
+    (
+        4,
+        [
+            # surge multiplier quoted when the booking was made
+            """
+            ALTER TABLE bookings
+                ADD COLUMN surge_multiplier DECIMAL(4, 2) NOT NULL DEFAULT 1.00 AFTER fare;
+            """,
+        ],
+    ),
+    (
+        5,
+        [
+            # trip as measured on completion; NULL when the fare was estimated
+            """
+            ALTER TABLE bookings
+                ADD COLUMN distance_km DECIMAL(7, 2) NULL AFTER surge_multiplier;
+            """,
+            """
+            ALTER TABLE bookings
+                ADD COLUMN duration_minutes DECIMAL(7, 1) NULL AFTER distance_km;
+            """,
+        ],
+    ),
+]
+
+# Errors that mean a migration step was already applied (re-running an
+# ALTER TABLE ... ADD INDEX/COLUMN after a partial upgrade).
+_ALREADY_APPLIED = (errorcode.ER_DUP_KEYNAME, errorcode.ER_DUP_FIELDNAME)
+
+# Report matched rather than changed rows from UPDATE, so a conditional
+# UPDATE that rewrites identical values still counts as applied.
+_CLIENT_FLAGS = [ClientFlag.FOUND_ROWS]
+
+
 class Database:
     """
     Handles MySQL connection and database/schema initialization.
+
+    By default a single connection is shared (the Tk app is single-threaded).
+    With `pool_size` set, connections come from a MySQLConnectionPool and
+    each thread keeps its own checked-out connection, so DALs can be used
+    concurrently from a worker pool (e.g. the API server).
     """
 
-    def __init__(self):
+    def __init__(self, pool_size: Optional[int] = None):
         self.host = DB_CONFIG["host"]
         self.user = DB_CONFIG["user"]
         self.password = DB_CONFIG["password"]
         self.database_name = DB_CONFIG["database"]
         self.connection = None
+        self.pool_size = pool_size
+        self._pool = None
+        self._local = threading.local()
 
-        # Ensure DB exists, then connect to it
-        self._ensure_database()
-        self._connect_to_database()
+        # Connect straight to the database; only the very first run pays
+        # for the extra server connection that creates it.
+        try:
+            self._connect_to_database()
+        except Error as e:
+            if e.errno != errorcode.ER_BAD_DB_ERROR:
+                raise
+            self._ensure_database()
+            self._connect_to_database()
 
     def _get_server_connection(self):
         """
@@ -57,120 +227,186 @@ class Database:
         """
         Connect directly to the specific database.
         """
+        if self.pool_size:
+            self._checkout_pooled_connection()
+            return
+
         try:
             self.connection = mysql.connector.connect(
                 host=self.host,
                 user=self.user,
                 password=self.password,
-                database=self.database_name
+                database=self.database_name,
+                client_flags=_CLIENT_FLAGS,
             )
             if self.connection.is_connected():
                 print(f"Connected to database '{self.database_name}'.")
         except Error as e:
-            print(f"Error connecting to database: {e}")
+            if e.errno != errorcode.ER_BAD_DB_ERROR:
+                print(f"Error connecting to database: {e}")
+            raise
+
+    def _checkout_pooled_connection(self):
+        """
+        Take a connection from the pool for the calling thread.
+        """
+        try:
+            if self._pool is None:
+                self._pool = pooling.MySQLConnectionPool(
+                    pool_name=f"{self.database_name}_pool",
+                    pool_size=self.pool_size,
+                    host=self.host,
+                    user=self.user,
+                    password=self.password,
+                    database=self.database_name,
+                    client_flags=_CLIENT_FLAGS,
+                )
+                print(
+                    f"Connection pool of {self.pool_size} ready for "
+                    f"database '{self.database_name}'."
+                )
+            self._local.connection = self._pool.get_connection()
+        except Error as e:
+            if e.errno != errorcode.ER_BAD_DB_ERROR:
+                print(f"Error getting pooled connection: {e}")
             raise
 
     def get_connection(self):
         """
         Public method to get the active connection.
         """
+        if self.pool_size:
+            conn = getattr(self._local, "connection", None)
+            if conn is None or not conn.is_connected():
+                self._connect_to_database()
+            return self._local.connection
+
         if not self.connection or not self.connection.is_connected():
             self._connect_to_database()
         return self.connection
 
-    def init_schema(self):
+    def release_connection(self):
+        """
+        Return the calling thread's pooled connection to the pool.
+        No-op for the single shared connection.
+        """
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            conn.close()
+            self._local.connection = None
+
+    def commit(self):
+        """
+        Commit on the calling thread's connection. Inside transaction()
+        this is deferred to the end of the outermost block.
+        """
+        if getattr(self._local, "tx_depth", 0):
+            return
+        self.get_connection().commit()
+
+    def begin(self):
         """
-        Create all necessary tables if they do not exist.
+        Enter a (possibly nested) transaction on the calling thread.
         """
+        depth = getattr(self._local, "tx_depth", 0)
+        if depth == 0:
+            conn = self.get_connection()
+            # end any implicit read snapshot before the unit of work starts
+            conn.commit()
+        self._local.tx_depth = depth + 1
+
+    def end(self, success: bool = True):
+        """
+        Leave a transaction; the outermost level commits or rolls back.
+        """
+        depth = getattr(self._local, "tx_depth", 0)
+        if depth == 0:
+            raise RuntimeError("end() called without a matching begin().")
+        self._local.tx_depth = depth - 1
+        if depth > 1:
+            if not success:
+                # make the outer level roll back as well
+                self._local.tx_failed = True
+            return
+
+        nested_failed = getattr(self._local, "tx_failed", False)
+        self._local.tx_failed = False
         conn = self.get_connection()
-        cursor = conn.cursor()
+        if success and not nested_failed:
+            conn.commit()
+            return
+        conn.rollback()
+        if success:
+            raise RuntimeError("Transaction rolled back because a nested block failed.")
 
-        # 1. customers table (full customer details)
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS customers (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                full_name VARCHAR(100) NOT NULL,
-                address VARCHAR(255),
-                phone VARCHAR(20),
-                email VARCHAR(100) UNIQUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP 
-                    ON UPDATE CURRENT_TIMESTAMP
-            ) ENGINE=InnoDB;
-            """
-        )
+    @contextmanager
+    def transaction(self):
+        """
+        Group several DAL calls into one commit:
 
-        # 2. drivers table (full driver details)
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS drivers (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                full_name VARCHAR(100) NOT NULL,
-                address VARCHAR(255),
-                phone VARCHAR(20),
-                email VARCHAR(100) UNIQUE,
-                license_number VARCHAR(50),
-                vehicle_number VARCHAR(50),
-                status ENUM('available', 'busy', 'inactive') DEFAULT 'available',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP 
-                    ON UPDATE CURRENT_TIMESTAMP
-            ) ENGINE=InnoDB;
-            """
-        )
+            with db.transaction():
+                customer_id = customer_dal.create_customer(...)
+                user_dal.create_user(..., customer_id=customer_id)
 
-        # 3. users table (auth + role; references customers/drivers)
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                username VARCHAR(50) NOT NULL UNIQUE,
-                password_hash VARCHAR(255) NOT NULL,
-                role ENUM('customer', 'driver', 'admin') NOT NULL,
-                customer_id INT NULL,
-                driver_id INT NULL,
-                is_active TINYINT(1) DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP 
-                    ON UPDATE CURRENT_TIMESTAMP,
-                CONSTRAINT fk_users_customer
-                    FOREIGN KEY (customer_id) REFERENCES customers(id)
-                    ON DELETE SET NULL,
-                CONSTRAINT fk_users_driver
-                    FOREIGN KEY (driver_id) REFERENCES drivers(id)
-                    ON DELETE SET NULL
-            ) ENGINE=InnoDB;
-            """
-        )
+        Any exception rolls the whole block back.
+        """
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.end(success=False)
+            raise
+        self.end(success=True)
+
+    def get_schema_version(self) -> int:
+        """
+        Version recorded in schema_version, or 0 for a fresh/legacy database.
+        """
+        cursor = self.get_connection().cursor()
+        try:
+            cursor.execute("SELECT version FROM schema_version")
+            row = cursor.fetchone()
+        except Error as e:
+            if e.errno != errorcode.ER_NO_SUCH_TABLE:
+                raise
+            row = None
+        finally:
+            cursor.close()
+        return row[0] if row else 0
+
+    def init_schema(self):
+        """
+        Bring the schema up to SCHEMA_VERSION.
+        DDL only runs when the stored version is older.
+        """
+        current = self.get_schema_version()
+        if current >= SCHEMA_VERSION:
+            print(f"Database schema is up to date (version {current}).")
+            return
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        for version, statements in SCHEMA_MIGRATIONS:
+            if version <= current:
+                continue
+            for statement in statements:
+                try:
+                    cursor.execute(statement)
+                except Error as e:
+                    if e.errno not in _ALREADY_APPLIED:
+                        raise
 
-        # 4. bookings table
         cursor.execute(
             """
-            CREATE TABLE IF NOT EXISTS bookings (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                customer_id INT NOT NULL,
-                pickup_location VARCHAR(255) NOT NULL,
-                dropoff_location VARCHAR(255) NOT NULL,
-                pickup_datetime DATETIME NOT NULL,
-                status ENUM('pending', 'assigned', 'ongoing', 'completed', 'cancelled')
-                    DEFAULT 'pending',
-                driver_id INT NULL,
-                fare DECIMAL(10, 2) NULL,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP 
-                    ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (customer_id) REFERENCES customers(id)
-                    ON DELETE CASCADE,
-                FOREIGN KEY (driver_id) REFERENCES drivers(id)
-                    ON DELETE SET NULL,
-                INDEX idx_booking_driver_datetime (driver_id, pickup_datetime)
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT NOT NULL
             ) ENGINE=InnoDB;
             """
         )
+        cursor.execute("DELETE FROM schema_version")
+        cursor.execute("INSERT INTO schema_version (version) VALUES (%s)", (SCHEMA_VERSION,))
 
         conn.commit()
         cursor.close()
-        print("Database schema initialised successfully.")
-
+        print(f"Database schema initialised successfully (version {SCHEMA_VERSION}).")
@@ -1,6 +1,6 @@
 # app/dataaccesslayer/driver_dal.py
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from .base_dal import BaseDAL
 
 
@@ -40,12 +40,35 @@ class DriverDAL(BaseDAL):
         )
 
         cursor = self._get_cursor()
-        cursor.execute(query, params)
-        self.db.get_connection().commit()
+        with self._unique_violations():
+            cursor.execute(query, params)
+        self._commit()
         driver_id = cursor.lastrowid
         cursor.close()
         return driver_id
 
+    def create_drivers(self, drivers: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insert several drivers with one statement.
+        Returns casefolded email -> new driver ID.
+        """
+        columns = (
+            "full_name", "address", "phone", "email",
+            "license_number", "vehicle_number", "status",
+        )
+        rows = [
+            tuple(d.get(col, "available") if col == "status" else d[col] for col in columns)
+            for d in drivers
+        ]
+        self._insert_many("drivers", columns, rows)
+        return self.ids_by_email(d["email"] for d in drivers)
+
+    def ids_by_email(self, emails: Iterable[str]) -> Dict[str, int]:
+        """
+        Casefolded email -> driver ID for the emails that exist.
+        """
+        return self._ids_by("drivers", "email", emails)
+
     def get_by_id(self, driver_id: int) -> Optional[Dict[str, Any]]:
         query = "SELECT * FROM drivers WHERE id = %s"
         cursor = self._get_cursor()
@@ -62,6 +85,17 @@ class DriverDAL(BaseDAL):
         cursor.close()
         return row
 
+    def list_emails(self) -> List[str]:
+        """
+        Every driver email (for the in-memory uniqueness index).
+        """
+        query = "SELECT email FROM drivers WHERE email IS NOT NULL"
+        cursor = self._get_cursor(dictionary=False)
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        cursor.close()
+        return [row[0] for row in rows]
+
     def list_all(self) -> List[Dict[str, Any]]:
         query = "SELECT * FROM drivers"
         cursor = self._get_cursor()
@@ -81,6 +115,32 @@ class DriverDAL(BaseDAL):
         cursor.close()
         return rows
 
+    def list_positions(self) -> List[Dict[str, Any]]:
+        """
+        id, status and address of every driver, plus the dropoff location
+        of their latest completed ride (NULL if none).
+        """
+        query = """
+            SELECT
+                d.id,
+                d.status,
+                d.address,
+                (
+                    SELECT b.dropoff_location
+                    FROM bookings b
+                    WHERE b.driver_id = d.id
+                      AND b.status = 'completed'
+                    ORDER BY b.pickup_datetime DESC
+                    LIMIT 1
+                ) AS last_dropoff
+            FROM drivers d
+        """
+        cursor = self._get_cursor()
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
     def update_status(self, driver_id: int, status: str) -> None:
         """
         Update driver status to 'available', 'busy', or 'inactive'.
@@ -88,7 +148,7 @@ class DriverDAL(BaseDAL):
         query = "UPDATE drivers SET status = %s WHERE id = %s"
         cursor = self._get_cursor()
         cursor.execute(query, (status, driver_id))
-        self.db.get_connection().commit()
+        self._commit()
         cursor.close()
 
     def update_driver(
@@ -119,5 +179,5 @@ class DriverDAL(BaseDAL):
 
         cursor = self._get_cursor()
         cursor.execute(query, params)
-        self.db.get_connection().commit()
+        self._commit()
         cursor.close()
@@ -0,0 +1,282 @@
+# app/dataaccesslayer/index_advisor.py
+#
+# Runs EXPLAIN on every query the DALs issue and flags full table scans
+# and filesorts:
+#
+#   python -m dataacesslayer.index_advisor
+#   python -m dataacesslayer.index_advisor --json
+#
+# Exits with status 1 when something is flagged. Run it against a
+# database with realistic row counts: on near-empty tables MySQL picks a
+# full scan whatever indexes exist.
+
+import argparse
+import collections.abc
+import inspect
+import json
+import sys
+import typing
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from .db_connector import Database
+from .booking_dal import BookingDAL
+from .customer_dal import CustomerDAL
+from .driver_dal import DriverDAL
+from .user_dal import UserDAL
+
+
+DAL_CLASSES = (BookingDAL, CustomerDAL, DriverDAL, UserDAL)
+
+# Arguments for methods whose parameters cannot be guessed from the type
+# annotations (column names, row dicts).
+_SAMPLE_ARGS: Dict[Tuple[str, str], Dict[str, Any]] = {
+    ("BookingDAL", "apply_transition"): {
+        "booking_id": 1,
+        "allowed_from": ["pending"],
+        "changes": {"status": "assigned", "driver_id": 1},
+        "owner_column": "customer_id",
+        "owner_id": 1,
+    },
+    ("BookingDAL", "set_fares"): {"fares": [(1, Decimal("100.00"))]},
+    ("CustomerDAL", "create_customers"): {
+        "customers": [
+            {"full_name": "Sample", "address": "Sample", "phone": "1", "email": "sample@example.com"},
+        ],
+    },
+    ("DriverDAL", "create_drivers"): {
+        "drivers": [
+            {
+                "full_name": "Sample", "address": "Sample", "phone": "1",
+                "email": "sample@example.com", "license_number": "L1", "vehicle_number": "V1",
+            },
+        ],
+    },
+    ("UserDAL", "create_users"): {
+        "users": [
+            {"username": "sample", "password_hash": "x", "role": "customer", "customer_id": 1},
+        ],
+    },
+}
+
+# EXPLAIN output that is worth a look, keyed by what it means.
+_FULL_SCAN = "full table scan"
+_FULL_INDEX_SCAN = "full index scan"
+_FILESORT = "filesort"
+_TEMPORARY = "temporary table"
+
+
+class CapturedQuery:
+    def __init__(self, dal: str, method: str, sql: str, params: Any):
+        self.dal = dal
+        self.method = method
+        self.sql = " ".join(sql.split())
+        self.params = params
+        self.plan: List[Dict[str, Any]] = []
+        self.issues: List[str] = []
+        self.error: Optional[str] = None
+
+    @property
+    def explainable(self) -> bool:
+        return self.sql.split(" ", 1)[0].upper() in ("SELECT", "UPDATE", "DELETE")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "dal": self.dal,
+            "method": self.method,
+            "sql": self.sql,
+            "issues": self.issues,
+            "error": self.error,
+            "plan": self.plan,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Capturing the SQL without touching MySQL
+# ---------------------------------------------------------------------------
+
+class _CapturingCursor:
+    lastrowid = 0
+    rowcount = 0
+
+    def __init__(self, sink: List[Tuple[str, Any]]):
+        self._sink = sink
+
+    def execute(self, query, params=None):
+        self._sink.append((query, params))
+
+    def executemany(self, query, seq_params):
+        # EXPLAIN the statement once, bound to the first row
+        params = next(iter(seq_params), None)
+        if params is not None:
+            self._sink.append((query, params))
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class _CapturingDatabase:
+    """
+    Stands in for Database: records statements instead of running them.
+    """
+
+    def __init__(self):
+        self.statements: List[Tuple[str, Any]] = []
+
+    def get_connection(self):
+        return self
+
+    def cursor(self, dictionary: bool = False):
+        return _CapturingCursor(self.statements)
+
+    def commit(self):
+        pass
+
+
+def _sample_value(annotation: Any) -> Any:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Union:
+        # Optional[X]
+        return _sample_value(next(a for a in args if a is not type(None)))
+    if annotation is int:
+        return 1
+    if annotation is str:
+        return "sample"
+    if annotation is datetime:
+        return datetime(2025, 1, 1, 12, 0)
+    if origin in (list, tuple, set, collections.abc.Iterable, collections.abc.Sequence):
+        if args and args[0] in (int, str):
+            return [_sample_value(args[0])]
+    raise TypeError(f"no sample value for {annotation!r}")
+
+
+def _sample_kwargs(dal_cls: type, name: str, method: Any) -> Dict[str, Any]:
+    override = _SAMPLE_ARGS.get((dal_cls.__name__, name))
+    if override is not None:
+        return override
+    hints = typing.get_type_hints(method)
+    kwargs = {}
+    for param in list(inspect.signature(method).parameters.values())[1:]:
+        if param.default is not inspect.Parameter.empty:
+            continue
+        kwargs[param.name] = _sample_value(hints[param.name])
+    return kwargs
+
+
+def capture_queries() -> List[CapturedQuery]:
+    """
+    Call every public DAL method with sample arguments against a fake
+    connection and collect the SQL it would run.
+    """
+    captured = []
+    for dal_cls in DAL_CLASSES:
+        for name, method in inspect.getmembers(dal_cls, inspect.isfunction):
+            if name.startswith("_") or method.__qualname__.split(".")[0] != dal_cls.__name__:
+                continue
+            fake_db = _CapturingDatabase()
+            try:
+                getattr(dal_cls(fake_db), name)(**_sample_kwargs(dal_cls, name, method))
+            except Exception as e:
+                query = CapturedQuery(dal_cls.__name__, name, "", None)
+                query.error = f"could not capture: {e}"
+                captured.append(query)
+                continue
+            for sql, params in fake_db.statements:
+                captured.append(CapturedQuery(dal_cls.__name__, name, sql, params))
+    return captured
+
+
+# ---------------------------------------------------------------------------
+# EXPLAIN
+# ---------------------------------------------------------------------------
+
+def _issues_for(plan: List[Dict[str, Any]], filtered: bool = True) -> List[str]:
+    """
+    Problems in an EXPLAIN plan. Full scans are expected (and not
+    flagged) for statements without a WHERE clause, e.g. list_all().
+    """
+    issues = []
+    for row in plan:
+        table = row.get("table")
+        access = (row.get("type") or "").upper()
+        extra = row.get("Extra") or ""
+        if access == "ALL" and filtered:
+            issues.append(f"{_FULL_SCAN} on {table} (~{row.get('rows')} rows)")
+        elif access == "INDEX" and "Using where" in extra:
+            issues.append(f"{_FULL_INDEX_SCAN} on {table} via {row.get('key')}")
+        if "Using filesort" in extra:
+            issues.append(f"{_FILESORT} on {table}")
+        if "Using temporary" in extra:
+            issues.append(f"{_TEMPORARY} for {table}")
+    return issues
+
+
+def explain(db: Database, queries: List[CapturedQuery]) -> None:
+    """
+    Fill in plan/issues for every SELECT/UPDATE/DELETE. EXPLAIN does not
+    execute the statement.
+    """
+    conn = db.get_connection()
+    for query in queries:
+        if query.error or not query.explainable:
+            continue
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("EXPLAIN " + query.sql, query.params)
+            query.plan = cursor.fetchall()
+            query.issues = _issues_for(query.plan, " WHERE " in query.sql.upper())
+        except Exception as e:
+            query.error = str(e)
+        finally:
+            cursor.close()
+
+
+def _print_report(queries: List[CapturedQuery]) -> None:
+    for query in queries:
+        if query.error:
+            status = "ERROR"
+        elif not query.explainable:
+            continue
+        else:
+            status = "FLAG " if query.issues else "ok   "
+        print(f"{status} {query.dal}.{query.method}")
+        if query.issues or query.error:
+            print(f"      {query.sql}")
+            for issue in query.issues:
+                print(f"      - {issue}")
+            if query.error:
+                print(f"      - {query.error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="EXPLAIN every DAL query and flag scans/filesorts.")
+    parser.add_argument("--json", action="store_true", help="print the full plans as JSON")
+    args = parser.parse_args()
+
+    db = Database()
+    db.init_schema()
+
+    queries = capture_queries()
+    explain(db, queries)
+
+    if args.json:
+        print(json.dumps([q.as_dict() for q in queries], indent=2, default=str))
+    else:
+        _print_report(queries)
+
+    flagged = [q for q in queries if q.issues or q.error]
+    if not args.json:
+        print(f"\n{len(flagged)} of {sum(q.explainable for q in queries)} statements need attention.")
+    sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# app/dataaccesslayer/instrumentation.py
+
+import bisect
+import contextvars
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from config.settings import SQL_INSTRUMENTATION
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open.
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(VALUES\s*\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize(sql: str) -> str:
+    """
+    Statement text with literals and placeholders replaced by '?' and
+    IN/VALUES lists collapsed, so the same query groups together
+    whatever its parameters or batch size.
+    """
+    text = _WHITESPACE.sub(" ", sql).strip()
+    text = text.replace("%s", "?")
+    text = _STRING_LITERAL.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _PLACEHOLDER_LIST.sub("(...)", text)
+    text = _VALUES_LIST.sub(r"\1", text)
+    return text
+
+
+class StatementStats:
+    """
+    Aggregates for one normalized statement.
+    """
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.callers: Counter = Counter()
+
+    def add(self, seconds: float, rows: int, caller: str) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.rows += rows
+        self.histogram[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, seconds * 1000)] += 1
+        self.callers[caller] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": self.total_seconds * 1000,
+            "mean_ms": self.total_seconds / self.count * 1000 if self.count else 0.0,
+            "max_ms": self.max_seconds * 1000,
+            "rows": self.rows,
+            "histogram_ms": {
+                (f"<={bound}" if i < len(HISTOGRAM_BOUNDS_MS) else f">{HISTOGRAM_BOUNDS_MS[-1]}"): n
+                for i, (bound, n) in enumerate(zip(HISTOGRAM_BOUNDS_MS + (None,), self.histogram))
+                if n
+            },
+            "callers": dict(self.callers),
+        }
+
+
+class _ServiceCall:
+    def __init__(self, name: str):
+        self.name = name
+        self.statements: Counter = Counter()
+
+
+_current_call: contextvars.ContextVar[Optional[_ServiceCall]] = contextvars.ContextVar(
+    "sql_service_call", default=None
+)
+
+
+class QueryInstrumentation:
+    """
+    Collects per-statement SQL statistics from BaseDAL cursors.
+
+    While `enabled` is False, BaseDAL hands out plain cursors and nothing
+    here runs. When enabled:
+    - every execute is timed (including fetching its rows) and grouped
+      by normalize(sql), with a latency histogram, row counts and the
+      DAL method that issued it;
+    - statements slower than `slow_query_ms` are logged as warnings;
+    - inside service_call(), a statement run `n_plus_one_threshold`
+      times or more is reported as a probable N+1 query.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        slow_query_ms: float = 100.0,
+        n_plus_one_threshold: int = 10,
+        max_events: int = 200,
+    ):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._stats: Dict[str, StatementStats] = {}
+        self._slow_queries: deque = deque(maxlen=max_events)
+        self._n_plus_one: deque = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    # ---- recording -------------------------------------------------------
+
+    def record(self, sql: str, seconds: float, rows: int, caller: str) -> None:
+        statement = normalize(sql)
+        with self._lock:
+            stats = self._stats.get(statement)
+            if stats is None:
+                stats = self._stats[statement] = StatementStats(statement)
+            stats.add(seconds, rows, caller)
+
+        call = _current_call.get()
+        if call is not None:
+            call.statements[statement] += 1
+
+        if seconds * 1000 >= self.slow_query_ms:
+            event = {
+                "statement": statement,
+                "ms": round(seconds * 1000, 3),
+                "rows": rows,
+                "caller": caller,
+                "service_call": call.name if call else None,
+                "at": time.time(),
+            }
+            self._slow_queries.append(event)
+            logger.warning("Slow query (%.1f ms) from %s: %s", event["ms"], caller, statement)
+
+    @contextmanager
+    def service_call(self, name: str):
+        """
+        Group the statements run inside the block for N+1 detection.
+        Nested blocks count towards the outermost one.
+        """
+        if not self.enabled or _current_call.get() is not None:
+            yield
+            return
+
+        call = _ServiceCall(name)
+        token = _current_call.set(call)
+        try:
+            yield
+        finally:
+            _current_call.reset(token)
+            self._check_n_plus_one(call)
+
+    def _check_n_plus_one(self, call: _ServiceCall) -> None:
+        for statement, count in call.statements.items():
+            if count >= self.n_plus_one_threshold:
+                self._n_plus_one.append(
+                    {"service_call": call.name, "statement": statement, "count": count, "at": time.time()}
+                )
+                logger.warning(
+                    "Possible N+1: %s ran the same statement %d times: %s", call.name, count, statement
+                )
+
+    # ---- export ----------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Everything collected so far, slowest total time first.
+        """
+        with self._lock:
+            statements = sorted(self._stats.values(), key=lambda s: s.total_seconds, reverse=True)
+            return {
+                "enabled": self.enabled,
+                "slow_query_ms": self.slow_query_ms,
+                "n_plus_one_threshold": self.n_plus_one_threshold,
+                "statements": [s.as_dict() for s in statements],
+                "slow_queries": list(self._slow_queries),
+                "n_plus_one": list(self._n_plus_one),
+            }
+
+    def export_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def report(self, limit: int = 20) -> str:
+        """
+        Plain-text summary of the top statements by total time.
+        """
+        lines = [f"{'count':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'rows':>8}  statement"]
+        for s in self.snapshot()["statements"][:limit]:
+            lines.append(
+                f"{s['count']:>8} {s['total_ms']:>10.1f} {s['mean_ms']:>9.2f} "
+                f"{s['max_ms']:>9.2f} {s['rows']:>8}  {s['statement'][:120]}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._slow_queries.clear()
+            self._n_plus_one.clear()
+
+
+class InstrumentedCursor:
+    """
+    Wraps a DB-API cursor. A statement's time runs from execute() until
+    the next execute() or close(), so fetching rows is included.
+    """
+
+    def __init__(self, cursor, caller: str, sink: QueryInstrumentation):
+        self._cursor = cursor
+        self._caller = caller
+        self._sink = sink
+        self._sql: Optional[str] = None
+        self._started = 0.0
+        self._rows = 0
+
+    def _finish(self) -> None:
+        if self._sql is not None:
+            self._sink.record(self._sql, time.perf_counter() - self._started, self._rows, self._caller)
+            self._sql = None
+
+    def execute(self, query, params=None):
+        self._finish()
+        self._sql, self._rows, self._started = query, 0, time.perf_counter()
+        return self._cursor.execute(query, params)
+
+    def executemany(self, query, seq_params):
+        self._finish()
+        self._sql, self._rows, self._started = query, 0, time.perf_counter()
+        return self._cursor.executemany(query, seq_params)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._rows += 1
+        return row
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._rows += len(rows)
+        return rows
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _enabled_from_env(default: bool) -> bool:
+    value = os.environ.get("TAXI_SQL_INSTRUMENTATION")
+    if value is None:
+        return default
+    return value.strip().lower() not in ("", "0", "false", "no", "off")
+
+
+# Process-wide collector used by BaseDAL. Configure it in
+# config.settings.SQL_INSTRUMENTATION or with TAXI_SQL_INSTRUMENTATION=1.
+instrumentation = QueryInstrumentation(
+    enabled=_enabled_from_env(SQL_INSTRUMENTATION["enabled"]),
+    slow_query_ms=SQL_INSTRUMENTATION["slow_query_ms"],
+    n_plus_one_threshold=SQL_INSTRUMENTATION["n_plus_one_threshold"],
+)
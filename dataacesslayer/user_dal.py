@@ -1,6 +1,6 @@
 # app/dataaccesslayer/user_dal.py
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from .base_dal import BaseDAL
 
 
@@ -27,12 +27,28 @@ class UserDAL(BaseDAL):
         params = (username, password_hash, role, customer_id, driver_id)
 
         cursor = self._get_cursor()
-        cursor.execute(query, params)
-        self.db.get_connection().commit()
+        with self._unique_violations():
+            cursor.execute(query, params)
+        self._commit()
         user_id = cursor.lastrowid
         cursor.close()
         return user_id
 
+    def create_users(self, users: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insert several users with one statement.
+        Returns casefolded username -> new user ID.
+        """
+        columns = ("username", "password_hash", "role", "customer_id", "driver_id")
+        self._insert_many("users", columns, [tuple(u.get(col) for col in columns) for u in users])
+        return self.ids_by_username(u["username"] for u in users)
+
+    def ids_by_username(self, usernames: Iterable[str]) -> Dict[str, int]:
+        """
+        Casefolded username -> user ID for the usernames that exist.
+        """
+        return self._ids_by("users", "username", usernames)
+
     def get_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
         """
         Get a user by ID.
@@ -55,6 +71,17 @@ class UserDAL(BaseDAL):
         cursor.close()
         return row
 
+    def list_usernames(self) -> List[str]:
+        """
+        Every username (for the in-memory uniqueness index).
+        """
+        query = "SELECT username FROM users"
+        cursor = self._get_cursor(dictionary=False)
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        cursor.close()
+        return [row[0] for row in rows]
+
     def list_all(self) -> List[Dict[str, Any]]:
         """
         Return all users.
@@ -73,7 +100,7 @@ class UserDAL(BaseDAL):
         query = "UPDATE users SET is_active = 0 WHERE id = %s"
         cursor = self._get_cursor()
         cursor.execute(query, (user_id,))
-        self.db.get_connection().commit()
+        self._commit()
         cursor.close()
 
     def update_password(self, user_id: int, new_password_hash: str) -> None:
@@ -83,5 +110,5 @@ class UserDAL(BaseDAL):
         query = "UPDATE users SET password_hash = %s WHERE id = %s"
         cursor = self._get_cursor()
         cursor.execute(query, (new_password_hash, user_id))
-        self.db.get_connection().commit()
+        self._commit()
         cursor.close()
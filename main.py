@@ -1,10 +1,27 @@
+import argparse
+import time
+
 from ui.app_context import AppContext
 from ui.main_app import MainApp
+from ui.profiler import ui_profiler
 
 
 def main():
-    context = AppContext()
-    app = MainApp(context)
+    parser = argparse.ArgumentParser(description="Taxi Booking System")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="taxi-ui-trace.json",
+        metavar="TRACE",
+        help="profile screen builds and main-loop stalls; write a Chrome trace to TRACE on exit",
+    )
+    args = parser.parse_args()
+    if args.profile:
+        ui_profiler.enable(args.profile)
+
+    started_at = time.perf_counter()
+    context = AppContext(background_init=True)
+    app = MainApp(context, started_at=started_at)
     app.mainloop()
 
 
@@ -0,0 +1,17 @@
+# run_api.py
+
+import argparse
+
+from api.server import run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Taxi Booking REST/JSON API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve Prometheus metrics on this port")
+    args = parser.parse_args()
+
+    run(host=args.host, port=args.port, workers=args.workers, metrics_port=args.metrics_port)
@@ -5,6 +5,6 @@ from ui.main_app import MainApp
 
 
 if __name__ == "__main__":
-    context = AppContext()
+    context = AppContext(background_init=True)
     app = MainApp(context)
     app.mainloop()
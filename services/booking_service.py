@@ -1,22 +1,102 @@
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from decimal import Decimal
 
 from dataacesslayer.db_connector import Database
 from dataacesslayer.booking_dal import BookingDAL
 from dataacesslayer.driver_dal import DriverDAL
-
-
+from services.booking_state import TRANSITIONS
+from services.driver_schedule import DriverSchedule
+from services.fare_engine import FareEngine, FareQuote
+from services.locations import LocationService
+from services.surge_pricing import SurgePricing
+from services.event_bus import (
+    EventBus,
+    BookingCreated,
+    BookingUpdated,
+    BookingCancelled,
+    DriverAssigned,
+    RideStarted,
+    RideCompleted,
+    DriverStatusChanged,
+)
+from services.metrics import profiled
+
+
+@profiled
 class BookingService:
     """
     Handles booking-related business logic:
     - customers: create/update/cancel/view bookings
-    - admin: view all bookings, assign drivers (with overlap check)
+    - admin: view all bookings, assign drivers; a driver can take any
+      booking whose time window does not overlap one of their rides
+    - fares: quotes before booking, the final fare on completion; with
+      `surge_pricing`, the pickup zone's surge at booking time is stored
+      with the booking and charged on completion
+    - locations: with `locations`, a pickup/dropoff that is only another
+      spelling of a gazetteer place is stored under its gazetteer name;
+      anything with more detail is stored as typed
+
+    Every state change is published on the event bus once it is stored.
     """
 
-    def __init__(self, db: Database):
+    def __init__(
+        self,
+        db: Database,
+        event_bus: Optional[EventBus] = None,
+        fare_engine: Optional[FareEngine] = None,
+        surge_pricing: Optional[SurgePricing] = None,
+        locations: Optional[LocationService] = None,
+    ):
         self.db = db
         self.booking_dal = BookingDAL(db)
         self.driver_dal = DriverDAL(db)
+        self.event_bus = event_bus or EventBus()
+        self.fare_engine = fare_engine or FareEngine()
+        self.surge_pricing = surge_pricing
+        self.locations = locations
+        # driver -> time windows of their rides; updated below on
+        # assign/start/complete/cancel
+        self.driver_schedule = DriverSchedule.from_settings(
+            self.booking_dal.list_commitments, self.fare_engine
+        )
+
+    def _transition(
+        self,
+        action: str,
+        booking_id: int,
+        owner_id: Optional[int] = None,
+        changes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Validate and apply `action` with a single conditional UPDATE.
+        The booking is only read back when the UPDATE matched nothing,
+        to report why.
+        """
+        transition = TRANSITIONS[action]
+        changes = dict(changes or {})
+        if transition.target:
+            changes["status"] = transition.target
+
+        matched = self.booking_dal.apply_transition(
+            booking_id,
+            transition.allowed_from,
+            changes,
+            owner_column=transition.owner_column,
+            owner_id=owner_id,
+        )
+        if not matched:
+            raise transition.rejection(self.booking_dal.get_by_id(booking_id), owner_id)
+
+    def _surge_for(self, pickup_location: str) -> float:
+        if self.surge_pricing is None:
+            return 1.0
+        return self.surge_pricing.multiplier_for(pickup_location)
+
+    def _canonical(self, location: str) -> str:
+        if self.locations is None:
+            return location
+        return self.locations.canonical(location)
 
     def _parse_datetime(self, dt_str: str) -> datetime:
         """
@@ -40,6 +120,8 @@ class BookingService:
         Customer books a taxi.
         """
         pickup_dt = self._parse_datetime(pickup_datetime_str)
+        pickup_location = self._canonical(pickup_location)
+        dropoff_location = self._canonical(dropoff_location)
 
         booking_id = self.booking_dal.create_booking(
             customer_id=customer_id,
@@ -47,9 +129,42 @@ class BookingService:
             dropoff_location=dropoff_location,
             pickup_datetime=pickup_dt,
             notes=notes,
+            surge_multiplier=self._surge_for(pickup_location),
+        )
+        self.event_bus.publish(
+            BookingCreated(
+                booking_id=booking_id,
+                customer_id=customer_id,
+                pickup_location=pickup_location,
+                dropoff_location=dropoff_location,
+                pickup_datetime=pickup_dt,
+            )
         )
         return booking_id
 
+    def quote_fare(
+        self,
+        pickup_location: str,
+        dropoff_location: str,
+        pickup_datetime_str: Optional[str] = None,
+        distance_km: Optional[float] = None,
+        duration_minutes: Optional[float] = None,
+    ) -> FareQuote:
+        """
+        Price a trip before it is booked (pickup defaults to now).
+        """
+        pickup_dt = self._parse_datetime(pickup_datetime_str) if pickup_datetime_str else None
+        pickup_location = self._canonical(pickup_location)
+        dropoff_location = self._canonical(dropoff_location)
+        return self.fare_engine.quote(
+            pickup_location,
+            dropoff_location,
+            pickup_dt,
+            distance_km,
+            duration_minutes,
+            surge=self._surge_for(pickup_location),
+        )
+
     def get_customer_bookings(self, customer_id: int) -> List[Dict[str, Any]]:
         """
         Return all bookings for a given customer.
@@ -60,17 +175,9 @@ class BookingService:
         """
         Customer cancels their own booking.
         """
-        booking = self.booking_dal.get_by_id(booking_id)
-        if not booking:
-            raise ValueError("Booking not found.")
-
-        if booking["customer_id"] != customer_id:
-            raise PermissionError("You can only cancel your own bookings.")
-
-        if booking["status"] in ("completed", "cancelled"):
-            raise ValueError(f"Cannot cancel a booking with status '{booking['status']}'.")
-
-        self.booking_dal.cancel_booking(booking_id)
+        self._transition("cancel", booking_id, owner_id=customer_id)
+        self.driver_schedule.release(booking_id)
+        self.event_bus.publish(BookingCancelled(booking_id=booking_id, customer_id=customer_id))
 
     def update_booking(
         self,
@@ -84,24 +191,29 @@ class BookingService:
         """
         Customer updates a booking.
         """
-        booking = self.booking_dal.get_by_id(booking_id)
-        if not booking:
-            raise ValueError("Booking not found.")
-
-        if booking["customer_id"] != customer_id:
-            raise PermissionError("You can only update your own bookings.")
-
-        if booking["status"] != "pending":
-            raise ValueError("Only 'pending' bookings can be updated.")
-
         pickup_dt = self._parse_datetime(pickup_datetime_str)
-
-        self.booking_dal.update_booking(
-            booking_id=booking_id,
-            pickup_location=pickup_location,
-            dropoff_location=dropoff_location,
-            pickup_datetime=pickup_dt,
-            notes=notes,
+        pickup_location = self._canonical(pickup_location)
+        dropoff_location = self._canonical(dropoff_location)
+
+        self._transition(
+            "update",
+            booking_id,
+            owner_id=customer_id,
+            changes={
+                "pickup_location": pickup_location,
+                "dropoff_location": dropoff_location,
+                "pickup_datetime": pickup_dt,
+                "notes": notes,
+            },
+        )
+        self.event_bus.publish(
+            BookingUpdated(
+                booking_id=booking_id,
+                customer_id=customer_id,
+                pickup_location=pickup_location,
+                dropoff_location=dropoff_location,
+                pickup_datetime=pickup_dt,
+            )
         )
 
     def get_all_bookings(self) -> List[Dict[str, Any]]:
@@ -124,55 +236,127 @@ class BookingService:
         """
         Admin assigns a driver to a booking.
         """
-        booking = self.booking_dal.get_by_id(booking_id)
-        if not booking:
-            raise ValueError("Booking not found.")
-
-        if booking["status"] in ("cancelled", "completed"):
-            raise ValueError(f"Cannot assign driver to a booking with status '{booking['status']}'.")
-
         driver = self.driver_dal.get_by_id(driver_id)
         if not driver:
             raise ValueError("Driver not found.")
 
-        if self.booking_dal.has_active_booking_for_driver(driver_id):
+        booking = self.booking_dal.get_by_id(booking_id)
+        if booking is None:
+            raise TRANSITIONS["assign"].rejection(booking, None)
+        window = self.driver_schedule.window(booking)
+        with self.driver_schedule.lock:
+            self._check_schedule(driver_id, booking_id, window)
+            self._transition("assign", booking_id, changes={"driver_id": driver_id})
+            self.driver_schedule.commit(booking_id, driver_id, window)
+        self.event_bus.publish(DriverAssigned(booking_id=booking_id, driver_id=driver_id))
+
+    def _check_schedule(self, driver_id: int, booking_id: int, window) -> None:
+        """
+        Raise ValueError if the driver has a ride overlapping `window`.
+        The driver's rides are re-read first (one idx_booking_driver_status
+        lookup), since another process may have assigned, finished or
+        cancelled one. Call with driver_schedule.lock held.
+        """
+        start, end = window
+        self.driver_schedule.reload_driver(driver_id)
+        clash = self.driver_schedule.conflict(driver_id, start, end, ignore=booking_id)
+        if clash is not None:
             raise ValueError(
-                "This driver already has an active booking. "
-                "They must complete the current ride before a new one can be assigned."
+                f"This driver already has booking #{clash} at that time. "
+                "Pick another driver or wait until that ride is finished."
             )
 
-        self.booking_dal.assign_driver(booking_id, driver_id)
+    def dispatch_booking(self, booking_id: int) -> Optional[int]:
+        """
+        Assign a driver with no ride overlapping a pending booking,
+        preferring available drivers based in the pickup zone. Returns the
+        driver id, or None when nobody is free. Raises ValueError if the booking is no longer
+        pending. Used by the ride scheduler.
+        """
+        booking = self.booking_dal.get_by_id(booking_id)
+        if booking is None or booking["status"] != "pending":
+            raise TRANSITIONS["dispatch"].rejection(booking, None)
+
+        tariff = self.fare_engine.tariff
+        pickup_zone = tariff.zone_index(booking["pickup_location"])
+        window = self.driver_schedule.window(booking)
+        schedule = self.driver_schedule
+        with schedule.lock:
+            candidates = [
+                driver for driver in self.driver_dal.list_all()
+                if driver["status"] != "inactive"
+                and schedule.conflict(driver["id"], *window) is None
+            ]
+            # a busy driver qualifies when the current ride ends in time
+            candidates.sort(
+                key=lambda d: (
+                    d["status"] != "available",
+                    tariff.zone_index(d.get("address")) != pickup_zone,
+                    d["id"],
+                )
+            )
+            # memory says free; confirm against the database, best first
+            for driver in candidates:
+                schedule.reload_driver(driver["id"])
+                if schedule.conflict(driver["id"], *window) is None:
+                    driver_id = driver["id"]
+                    break
+            else:
+                return None
+
+            self._transition("dispatch", booking_id, changes={"driver_id": driver_id})
+            schedule.commit(booking_id, driver_id, window)
+        self.event_bus.publish(DriverAssigned(booking_id=booking_id, driver_id=driver_id))
+        return driver_id
 
     def assign_driver(self, booking_id: int, driver_id: int) -> None:
         self.assign_driver_to_booking(booking_id, driver_id)
 
     def start_ride(self, booking_id: int, driver_id: int) -> None:
-        booking = self.booking_dal.get_by_id(booking_id)
-        if not booking:
-            raise ValueError("Booking not found.")
-
-        if booking.get("driver_id") != driver_id:
-            raise PermissionError("You can only start rides assigned to you.")
-
-        if booking.get("status") != "assigned":
-            raise ValueError("Only 'assigned' bookings can be started.")
-
-        self.booking_dal.update_status(booking_id, "ongoing")
-        self.driver_dal.update_status(driver_id, "busy")
-
-    def complete_ride(self, booking_id: int, driver_id: int) -> None:
+        with self.db.transaction():
+            self._transition("start", booking_id, owner_id=driver_id)
+            self.driver_dal.update_status(driver_id, "busy")
+        self.driver_schedule.mark_started(booking_id)
+        self.event_bus.publish(RideStarted(booking_id=booking_id, driver_id=driver_id))
+        self.event_bus.publish(DriverStatusChanged(driver_id=driver_id, status="busy"))
+
+    def complete_ride(
+        self,
+        booking_id: int,
+        driver_id: int,
+        distance_km: Optional[float] = None,
+        duration_minutes: Optional[float] = None,
+    ) -> Optional[Decimal]:
         """
-        Driver completes a ride
+        Driver completes a ride; the fare is computed and stored with the
+        status change. Pass the measured distance/duration when known,
+        otherwise the trip is priced from the zone table. Measured values
+        are stored too, so a later recompute prices from them.
+        Returns the fare.
         """
-        booking = self.booking_dal.get_by_id(booking_id)
-        if not booking:
-            raise ValueError("Booking not found.")
-
-        if booking.get("driver_id") != driver_id:
-            raise PermissionError("You can only complete rides assigned to you.")
-
-        if booking.get("status") != "ongoing":
-            raise ValueError("Only 'ongoing' bookings can be completed.")
-
-        self.booking_dal.update_status(booking_id, "completed")
-        self.driver_dal.update_status(driver_id, "available")
+        with self.db.transaction():
+            booking = self.booking_dal.get_by_id(booking_id)
+            changes = {"distance_km": distance_km, "duration_minutes": duration_minutes}
+            if booking is not None:
+                changes["fare"] = self.fare_engine.fare(
+                    booking["pickup_location"],
+                    booking["dropoff_location"],
+                    booking["pickup_datetime"],
+                    distance_km,
+                    duration_minutes,
+                    surge=float(booking.get("surge_multiplier") or 1),
+                )
+            self._transition("complete", booking_id, owner_id=driver_id, changes=changes)
+            self.driver_dal.update_status(driver_id, "available")
+        self.driver_schedule.release(booking_id)
+        fare = changes.get("fare")
+        self.event_bus.publish(
+            RideCompleted(
+                booking_id=booking_id,
+                driver_id=driver_id,
+                fare=fare,
+                dropoff_location=booking["dropoff_location"],
+            )
+        )
+        self.event_bus.publish(DriverStatusChanged(driver_id=driver_id, status="available"))
+        return fare
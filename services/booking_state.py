@@ -0,0 +1,107 @@
+from typing import Any, Dict, FrozenSet, Optional
+
+
+BOOKING_STATUSES = ("pending", "assigned", "ongoing", "completed", "cancelled")
+
+
+class Transition:
+    """
+    One booking action: the statuses it may start from, the status it
+    leads to (None keeps the current one) and, for customer/driver
+    actions, the column that must match the caller.
+    """
+
+    def __init__(
+        self,
+        action: str,
+        allowed_from: FrozenSet[str],
+        target: Optional[str],
+        owner_column: Optional[str] = None,
+        owner_error: str = "",
+        status_error: str = "",
+    ):
+        self.action = action
+        self.allowed_from = allowed_from
+        self.target = target
+        self.owner_column = owner_column
+        self.owner_error = owner_error
+        self.status_error = status_error
+
+    def allows(self, status: str) -> bool:
+        return status in self.allowed_from
+
+    def rejection(self, booking: Optional[Dict[str, Any]], owner_id: Optional[int]) -> Exception:
+        """
+        The error to raise for `booking` (as it is now) when the
+        conditional UPDATE matched no row.
+        """
+        if booking is None:
+            return ValueError("Booking not found.")
+        if self.owner_column and booking.get(self.owner_column) != owner_id:
+            return PermissionError(self.owner_error)
+        return ValueError(self.status_error.format(status=booking.get("status")))
+
+
+# Booking lifecycle:
+#   pending -> assigned -> ongoing -> completed
+#   pending/assigned/ongoing -> cancelled (by the customer)
+# update keeps the status; assign may also re-assign an assigned or
+# ongoing booking, as the admin dashboard has always allowed. dispatch is
+# the scheduler's automatic assignment and never overrides a person's.
+TRANSITIONS: Dict[str, Transition] = {
+    t.action: t
+    for t in (
+        Transition(
+            "update",
+            frozenset({"pending"}),
+            None,
+            owner_column="customer_id",
+            owner_error="You can only update your own bookings.",
+            status_error="Only 'pending' bookings can be updated.",
+        ),
+        Transition(
+            "cancel",
+            frozenset({"pending", "assigned", "ongoing"}),
+            "cancelled",
+            owner_column="customer_id",
+            owner_error="You can only cancel your own bookings.",
+            status_error="Cannot cancel a booking with status '{status}'.",
+        ),
+        Transition(
+            "assign",
+            frozenset({"pending", "assigned", "ongoing"}),
+            "assigned",
+            status_error="Cannot assign driver to a booking with status '{status}'.",
+        ),
+        Transition(
+            "dispatch",
+            frozenset({"pending"}),
+            "assigned",
+            status_error="Booking is no longer pending (status '{status}').",
+        ),
+        Transition(
+            "start",
+            frozenset({"assigned"}),
+            "ongoing",
+            owner_column="driver_id",
+            owner_error="You can only start rides assigned to you.",
+            status_error="Only 'assigned' bookings can be started.",
+        ),
+        Transition(
+            "complete",
+            frozenset({"ongoing"}),
+            "completed",
+            owner_column="driver_id",
+            owner_error="You can only complete rides assigned to you.",
+            status_error="Only 'ongoing' bookings can be completed.",
+        ),
+    )
+}
+
+
+def can_transition(action: str, status: str) -> bool:
+    """
+    True if `action` is allowed on a booking in `status`.
+    """
+    transition = TRANSITIONS.get(action)
+    return transition is not None and transition.allows(status)
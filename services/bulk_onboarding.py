@@ -0,0 +1,333 @@
+import argparse
+import csv
+import json
+import os
+import re
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mysql.connector import Error
+
+from dataacesslayer.base_dal import DuplicateKeyError
+from services.membership import MembershipIndex
+from services.user_services import UserService
+
+
+CUSTOMER_FIELDS = ("full_name", "address", "phone", "email", "username", "password")
+DRIVER_FIELDS = CUSTOMER_FIELDS + ("license_number", "vehicle_number")
+
+REPORT_COLUMNS = ("row", "username", "email", "status", "user_id", "message")
+
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+class RowResult:
+    """
+    Outcome of one input record: status is 'created' or 'error'.
+    `row` is the 1-based record number in the input file.
+    """
+
+    def __init__(self, row: int, data: Dict[str, str]):
+        self.row = row
+        self.data = data
+        self.status = "pending"
+        self.user_id: Optional[int] = None
+        self.message = ""
+        self.password_hash: Optional[str] = None
+
+    @property
+    def username(self) -> str:
+        return self.data.get("username", "")
+
+    @property
+    def email(self) -> str:
+        return self.data.get("email", "")
+
+    def fail(self, message: str) -> None:
+        self.status = "error"
+        self.message = message
+
+    def as_report_row(self) -> Dict[str, Any]:
+        return {
+            "row": self.row,
+            "username": self.username,
+            "email": self.email,
+            "status": self.status,
+            "user_id": self.user_id if self.user_id is not None else "",
+            "message": self.message,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Input / output
+# ---------------------------------------------------------------------------
+
+def read_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream records from a .csv (header row), .jsonl/.ndjson (one object
+    per line) or .json (array of objects) file.
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+    elif ext in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif ext == ".json":
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError("A .json import file must contain an array of objects.")
+        yield from records
+    else:
+        raise ValueError(f"Unsupported import file type '{ext}' (use .csv, .json or .jsonl).")
+
+
+def write_report(results: Iterable[RowResult], path: str) -> Tuple[int, int]:
+    """
+    Write one CSV line per input record; returns (created, failed).
+    """
+    created = failed = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result.as_report_row())
+            if result.status == "created":
+                created += 1
+            else:
+                failed += 1
+    return created, failed
+
+
+# ---------------------------------------------------------------------------
+# Importer
+# ---------------------------------------------------------------------------
+
+class _Kind:
+    """
+    What differs between importing customers and drivers.
+    """
+
+    def __init__(
+        self,
+        role: str,
+        fields: Tuple[str, ...],
+        email_index: MembershipIndex,
+        existing_emails: Callable[[Iterable[str]], Dict[str, int]],
+        create_profiles: Callable[[List[Dict[str, Any]]], Dict[str, int]],
+        email_taken: str,
+    ):
+        self.role = role
+        self.fields = fields
+        self.email_index = email_index
+        self.existing_emails = existing_emails
+        self.create_profiles = create_profiles
+        self.email_taken = email_taken
+
+
+class BulkOnboarding:
+    """
+    Registers many customers or drivers from a stream of records.
+
+    Records are read `batch_size` at a time. Each batch is validated
+    (required fields, email format, duplicates within the batch and
+    against existing rows with one IN query per column), its passwords
+    are hashed in parallel on the hasher pool, and valid records are
+    inserted `chunk_size` at a time: one multi-row INSERT into
+    customers/drivers and one into users, in a single transaction per
+    chunk. If a chunk fails (e.g. a row inserted concurrently), it is
+    rolled back and retried row by row so only the offending records are
+    reported as errors.
+    """
+
+    def __init__(self, user_service: UserService, batch_size: int = 500, chunk_size: int = 100):
+        self.user_service = user_service
+        self.db = user_service.db
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+
+        self._customers = _Kind(
+            role="customer",
+            fields=CUSTOMER_FIELDS,
+            email_index=user_service.customer_emails,
+            existing_emails=user_service.customer_dal.ids_by_email,
+            create_profiles=user_service.customer_dal.create_customers,
+            email_taken="A customer with this email already exists.",
+        )
+        self._drivers = _Kind(
+            role="driver",
+            fields=DRIVER_FIELDS,
+            email_index=user_service.driver_emails,
+            existing_emails=user_service.driver_dal.ids_by_email,
+            create_profiles=user_service.driver_dal.create_drivers,
+            email_taken="A driver with this email already exists.",
+        )
+
+    def import_customers(self, records: Iterable[Dict[str, Any]]) -> Iterator[RowResult]:
+        """
+        Yields one RowResult per record, batch by batch.
+        """
+        return self._import(self._customers, records)
+
+    def import_drivers(self, records: Iterable[Dict[str, Any]]) -> Iterator[RowResult]:
+        """
+        Yields one RowResult per record, batch by batch.
+        """
+        return self._import(self._drivers, records)
+
+    def _import(self, kind: _Kind, records: Iterable[Dict[str, Any]]) -> Iterator[RowResult]:
+        numbered = enumerate(records, start=1)
+        while True:
+            batch = [RowResult(n, self._clean(record)) for n, record in islice(numbered, self.batch_size)]
+            if not batch:
+                return
+            self._process_batch(kind, batch)
+            yield from batch
+
+    @staticmethod
+    def _clean(record: Any) -> Dict[str, str]:
+        if not isinstance(record, dict):
+            return {}
+        return {
+            str(key).strip(): ("" if value is None else str(value).strip())
+            for key, value in record.items()
+            if key is not None
+        }
+
+    # ---- one batch -------------------------------------------------------
+
+    def _process_batch(self, kind: _Kind, batch: List[RowResult]) -> None:
+        valid = self._validate(kind, batch)
+        valid = self._reject_existing(kind, valid)
+        if not valid:
+            return
+
+        hashes = self.user_service.hasher.hash_many(r.data["password"] for r in valid)
+        for result, password_hash in zip(valid, hashes):
+            result.password_hash = password_hash
+
+        for start in range(0, len(valid), self.chunk_size):
+            chunk = valid[start:start + self.chunk_size]
+            try:
+                self._insert(kind, chunk)
+            except (DuplicateKeyError, Error):
+                # rolled back; find the bad rows one at a time
+                for result in chunk:
+                    self._insert_one(kind, result)
+
+    def _validate(self, kind: _Kind, batch: List[RowResult]) -> List[RowResult]:
+        valid = []
+        seen_usernames = set()
+        seen_emails = set()
+        for result in batch:
+            data = result.data
+            missing = [f for f in kind.fields if not data.get(f)]
+            if missing:
+                result.fail(f"Missing field(s): {', '.join(missing)}.")
+                continue
+            if not _EMAIL_RE.match(data["email"]):
+                result.fail("Invalid email address.")
+                continue
+
+            username_key = data["username"].casefold()
+            email_key = data["email"].casefold()
+            if username_key in seen_usernames:
+                result.fail("Username appears more than once in this batch.")
+                continue
+            if email_key in seen_emails:
+                result.fail("Email appears more than once in this batch.")
+                continue
+            seen_usernames.add(username_key)
+            seen_emails.add(email_key)
+            valid.append(result)
+        return valid
+
+    def _reject_existing(self, kind: _Kind, results: List[RowResult]) -> List[RowResult]:
+        """
+        Drop records whose email/username is already registered. Only the
+        values the in-memory indexes report as taken are checked in MySQL.
+        """
+        usernames = self.user_service.usernames
+        email_hits = [r.email for r in results if kind.email_index.might_contain(r.email)]
+        username_hits = [r.username for r in results if usernames.might_contain(r.username)]
+        taken_emails = kind.existing_emails(email_hits)
+        taken_usernames = self.user_service.user_dal.ids_by_username(username_hits)
+
+        remaining = []
+        for result in results:
+            if result.email.casefold() in taken_emails:
+                result.fail(kind.email_taken)
+            elif result.username.casefold() in taken_usernames:
+                result.fail("Username is already taken.")
+            else:
+                remaining.append(result)
+        return remaining
+
+    def _insert(self, kind: _Kind, chunk: List[RowResult]) -> None:
+        with self.db.transaction():
+            profile_ids = kind.create_profiles([r.data for r in chunk])
+            users = []
+            for result in chunk:
+                profile_id = profile_ids[result.email.casefold()]
+                users.append({
+                    "username": result.username,
+                    "password_hash": result.password_hash,
+                    "role": kind.role,
+                    "customer_id": profile_id if kind.role == "customer" else None,
+                    "driver_id": profile_id if kind.role == "driver" else None,
+                })
+            user_ids = self.user_service.user_dal.create_users(users)
+
+        for result in chunk:
+            result.status = "created"
+            result.user_id = user_ids.get(result.username.casefold())
+            kind.email_index.add(result.email)
+            self.user_service.usernames.add(result.username)
+            self.user_service.unknown_usernames.discard(result.username.casefold())
+
+    def _insert_one(self, kind: _Kind, result: RowResult) -> None:
+        try:
+            self._insert(kind, [result])
+        except DuplicateKeyError as e:
+            result.fail(self.user_service.duplicate_message(e, kind.email_taken))
+        except Error as e:
+            result.fail(f"Database error: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Command line: python -m services.bulk_onboarding drivers fleet.csv
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    from dataacesslayer.db_connector import Database
+
+    parser = argparse.ArgumentParser(description="Bulk-register customers or drivers from CSV/JSON.")
+    parser.add_argument("kind", choices=("customers", "drivers"))
+    parser.add_argument("path", help=".csv, .json or .jsonl file")
+    parser.add_argument("--report", help="per-row result CSV (default: <path>.report.csv)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    args = parser.parse_args()
+
+    db = Database()
+    db.init_schema()
+    onboarding = BulkOnboarding(UserService(db), batch_size=args.batch_size, chunk_size=args.chunk_size)
+
+    records = read_rows(args.path)
+    if args.kind == "customers":
+        results = onboarding.import_customers(records)
+    else:
+        results = onboarding.import_drivers(records)
+
+    report_path = args.report or f"{args.path}.report.csv"
+    created, failed = write_report(results, report_path)
+    print(f"{created} created, {failed} failed. Report written to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
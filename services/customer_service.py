@@ -2,8 +2,10 @@ from typing import List, Dict, Any, Optional
 
 from dataacesslayer.db_connector import Database
 from dataacesslayer.customer_dal import CustomerDAL
+from services.metrics import profiled
 
 
+@profiled
 class CustomerService:
 
     def __init__(self, db: Database):
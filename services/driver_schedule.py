@@ -0,0 +1,311 @@
+import random
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import DRIVER_SCHEDULE
+from services.fare_engine import FareEngine
+
+
+Window = Tuple[datetime, datetime]
+
+
+class _Node:
+    __slots__ = ("start", "end", "key", "priority", "max_end", "left", "right")
+
+    def __init__(self, start: datetime, end: datetime, key: int, priority: float):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.priority = priority
+        self.max_end = end
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+    def update(self) -> None:
+        self.max_end = self.end
+        if self.left is not None and self.left.max_end > self.max_end:
+            self.max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > self.max_end:
+            self.max_end = self.right.max_end
+
+
+def _rotate_right(node: _Node) -> _Node:
+    top = node.left
+    node.left, top.right = top.right, node
+    node.update()
+    top.update()
+    return top
+
+
+def _rotate_left(node: _Node) -> _Node:
+    top = node.right
+    node.right, top.left = top.left, node
+    node.update()
+    top.update()
+    return top
+
+
+class IntervalTree:
+    """
+    Half-open [start, end) intervals, each with an integer key (a booking
+    id), in a treap ordered by (start, key) where every node also knows
+    the latest end in its subtree. Insert and remove are O(log n)
+    expected; overlapping() is O(log n + k) for k matches.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._root: Optional[_Node] = None
+        self._size = 0
+        self._rng = rng or random.Random()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, start: datetime, end: datetime, key: int) -> None:
+        if not start < end:
+            raise ValueError("An interval must end after it starts.")
+        self._root = self._insert(self._root, _Node(start, end, key, self._rng.random()))
+        self._size += 1
+
+    def _insert(self, node: Optional[_Node], new: _Node) -> _Node:
+        if node is None:
+            return new
+        if (new.start, new.key) < (node.start, node.key):
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:
+                node = _rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:
+                node = _rotate_left(node)
+        node.update()
+        return node
+
+    def remove(self, start: datetime, key: int) -> bool:
+        """
+        Remove the interval inserted with (`start`, `key`); False if absent.
+        """
+        size = self._size
+        self._root = self._remove(self._root, (start, key))
+        return self._size < size
+
+    def _remove(self, node: Optional[_Node], target: Tuple[datetime, int]) -> Optional[_Node]:
+        if node is None:
+            return None
+        here = (node.start, node.key)
+        if target < here:
+            node.left = self._remove(node.left, target)
+        elif target > here:
+            node.right = self._remove(node.right, target)
+        else:
+            # rotate the node down until it has at most one child
+            if node.left is None:
+                self._size -= 1
+                return node.right
+            if node.right is None:
+                self._size -= 1
+                return node.left
+            if node.left.priority > node.right.priority:
+                node = _rotate_right(node)
+                node.right = self._remove(node.right, target)
+            else:
+                node = _rotate_left(node)
+                node.left = self._remove(node.left, target)
+        node.update()
+        return node
+
+    def __iter__(self) -> Iterator[Tuple[datetime, datetime, int]]:
+        stack, node = [], self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.start, node.end, node.key
+            node = node.right
+
+    def overlapping(self, start: datetime, end: datetime) -> Iterator[Tuple[datetime, datetime, int]]:
+        """
+        Every stored (start, end, key) that overlaps [start, end).
+        """
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            # nothing in this subtree ends after `start`
+            if node is None or node.max_end <= start:
+                continue
+            stack.append(node.left)
+            if node.start < end:
+                if node.end > start:
+                    yield node.start, node.end, node.key
+                # right subtree starts at or after node.start, so only
+                # worth visiting while node.start < end
+                stack.append(node.right)
+
+
+class DriverSchedule:
+    """
+    Per-driver interval trees of committed rides (assigned or ongoing),
+    so an assignment can be checked against the driver's actual time
+    windows instead of "any active booking".
+
+    A ride occupies [pickup, pickup + estimated duration + turnaround),
+    with the duration taken from the fare engine's trip estimate. An
+    ongoing ride is also treated as lasting at least until now +
+    turnaround, in case it runs late.
+
+    Loaded from `loader` on first use and kept current by BookingService.
+    Other processes (the GUI, the API) change bookings behind our back,
+    so callers reload_driver() before trusting an answer.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Optional[int]], List[Dict[str, Any]]],
+        fare_engine: Optional[FareEngine] = None,
+        turnaround_minutes: float = 10,
+    ):
+        self._loader = loader
+        self.fare_engine = fare_engine or FareEngine()
+        self.turnaround = timedelta(minutes=turnaround_minutes)
+        self._trees: Optional[Dict[int, IntervalTree]] = None
+        # booking id -> (driver id, window start, window end)
+        self._rides: Dict[int, Tuple[int, datetime, datetime]] = {}
+        self._ongoing: Dict[int, int] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_settings(
+        cls,
+        loader: Callable[[Optional[int]], List[Dict[str, Any]]],
+        fare_engine: Optional[FareEngine] = None,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> "DriverSchedule":
+        settings = settings if settings is not None else DRIVER_SCHEDULE
+        return cls(loader, fare_engine, **settings)
+
+    @property
+    def lock(self) -> "threading.RLock":
+        """
+        Hold from a conflict() check through the commit() it allows, so
+        two threads cannot both take the same free window.
+        """
+        return self._lock
+
+    def window(self, booking: Dict[str, Any]) -> Window:
+        """
+        The time `booking` keeps its driver busy.
+        """
+        quote = self.fare_engine.quote(
+            booking["pickup_location"], booking["dropoff_location"], booking["pickup_datetime"]
+        )
+        start = booking["pickup_datetime"]
+        return start, start + timedelta(minutes=quote.duration_minutes) + self.turnaround
+
+    # ---- loading -------------------------------------------------------------
+
+    def load(self) -> None:
+        with self._lock:
+            self._trees, self._rides, self._ongoing = {}, {}, {}
+            for row in self._loader(None):
+                self._add_row(row)
+
+    def reload_driver(self, driver_id: int) -> None:
+        """
+        Replace what we know about `driver_id` with the database's view.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            for booking_id in [b for b, ride in self._rides.items() if ride[0] == driver_id]:
+                self._drop(booking_id)
+            for row in self._loader(driver_id):
+                self._add_row(row)
+
+    def _ensure_loaded(self) -> Dict[int, IntervalTree]:
+        if self._trees is None:
+            self.load()
+        return self._trees
+
+    def _add_row(self, row: Dict[str, Any]) -> None:
+        start, end = self.window(row)
+        self._add(row["id"], row["driver_id"], start, end)
+        if row["status"] == "ongoing":
+            self._ongoing[row["driver_id"]] = row["id"]
+
+    def _add(self, booking_id: int, driver_id: int, start: datetime, end: datetime) -> None:
+        self._drop(booking_id)
+        self._trees.setdefault(driver_id, IntervalTree()).insert(start, end, booking_id)
+        self._rides[booking_id] = (driver_id, start, end)
+
+    def _drop(self, booking_id: int) -> None:
+        ride = self._rides.pop(booking_id, None)
+        if ride is None:
+            return
+        driver_id, start, _ = ride
+        tree = self._trees.get(driver_id)
+        if tree is not None:
+            tree.remove(start, booking_id)
+            if not len(tree):
+                del self._trees[driver_id]
+        if self._ongoing.get(driver_id) == booking_id:
+            del self._ongoing[driver_id]
+
+    # ---- queries -------------------------------------------------------------
+
+    def conflict(
+        self,
+        driver_id: int,
+        start: datetime,
+        end: datetime,
+        ignore: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        A booking of `driver_id` whose window overlaps [start, end), or
+        None. `ignore` skips one booking (the one being re-assigned).
+        """
+        with self._lock:
+            tree = self._ensure_loaded().get(driver_id)
+            if tree is not None:
+                for _, _, booking_id in tree.overlapping(start, end):
+                    if booking_id != ignore:
+                        return booking_id
+            ongoing = self._ongoing.get(driver_id)
+            if ongoing is not None and ongoing != ignore:
+                ride_start, ride_end = self._rides[ongoing][1:]
+                if ride_start < end and start < max(ride_end, datetime.now() + self.turnaround):
+                    return ongoing
+        return None
+
+    def rides_for(self, driver_id: int) -> List[Tuple[datetime, datetime, int]]:
+        """
+        (start, end, booking id) of the driver's committed rides, in order.
+        """
+        with self._lock:
+            return list(self._ensure_loaded().get(driver_id, ()))
+
+    # ---- updates -------------------------------------------------------------
+
+    def commit(self, booking_id: int, driver_id: int, window: Window) -> None:
+        """
+        `booking_id` now holds `driver_id` for `window` (replacing any
+        earlier commitment of that booking).
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self._add(booking_id, driver_id, *window)
+
+    def mark_started(self, booking_id: int) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            ride = self._rides.get(booking_id)
+            if ride is not None:
+                self._ongoing[ride[0]] = booking_id
+
+    def release(self, booking_id: int) -> None:
+        """
+        The booking was completed or cancelled.
+        """
+        with self._lock:
+            if self._trees is not None:
+                self._drop(booking_id)
@@ -2,14 +2,18 @@ from typing import List, Dict, Any, Optional
 
 from dataacesslayer.db_connector import Database
 from dataacesslayer.driver_dal import DriverDAL
+from services.event_bus import EventBus, DriverStatusChanged
+from services.metrics import profiled
 
 
+@profiled
 class DriverService:
 
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, event_bus: Optional[EventBus] = None):
         self.db = db
         self.driver_dal = DriverDAL(db)
+        self.event_bus = event_bus or EventBus()
 
     def list_all(self) -> List[Dict[str, Any]]:
         """Return all drivers."""
@@ -26,5 +30,6 @@ class DriverService:
     def update_status(self, driver_id: int, status: str) -> None:
         """Update driver status ('available', 'busy', 'inactive')."""
         self.driver_dal.update_status(driver_id, status)
+        self.event_bus.publish(DriverStatusChanged(driver_id=driver_id, status=status))
 
 
@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import queue
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Type
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True, kw_only=True)
+class Event:
+    """
+    Base class for every event published on the bus.
+    Subscribing to Event receives all events.
+    """
+
+    occurred_at: datetime = field(default_factory=datetime.now, compare=False)
+
+
+@dataclass(frozen=True)
+class BookingCreated(Event):
+    booking_id: int
+    customer_id: int
+    pickup_location: str
+    dropoff_location: str
+    pickup_datetime: datetime
+
+
+@dataclass(frozen=True)
+class BookingUpdated(Event):
+    booking_id: int
+    customer_id: int
+    pickup_location: str
+    dropoff_location: str
+    pickup_datetime: datetime
+
+
+@dataclass(frozen=True)
+class BookingCancelled(Event):
+    booking_id: int
+    customer_id: int
+
+
+@dataclass(frozen=True)
+class BookingEscalated(Event):
+    """
+    A pending booking is close to its pickup time without a driver.
+    """
+
+    booking_id: int
+    pickup_datetime: datetime
+
+
+@dataclass(frozen=True)
+class DriverAssigned(Event):
+    booking_id: int
+    driver_id: int
+
+
+@dataclass(frozen=True)
+class RideStarted(Event):
+    booking_id: int
+    driver_id: int
+
+
+@dataclass(frozen=True)
+class RideCompleted(Event):
+    booking_id: int
+    driver_id: int
+    fare: Optional[Decimal] = None
+    dropoff_location: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DriverStatusChanged(Event):
+    driver_id: int
+    status: str
+
+
+Handler = Callable[[Any], Any]
+
+
+# ---------------------------------------------------------------------------
+# Subscriptions
+# ---------------------------------------------------------------------------
+
+class Subscription:
+    """
+    Handle returned by EventBus.subscribe(); call unsubscribe() to detach.
+    """
+
+    def __init__(self, bus: "EventBus", event_type: Type[Event], handler: Handler):
+        self.bus = bus
+        self.event_type = event_type
+        self.handler = handler
+
+    def deliver(self, event: Event) -> None:
+        try:
+            self.handler(event)
+        except Exception:
+            logger.exception("Event handler %r failed for %r", self.handler, event)
+
+    def unsubscribe(self) -> None:
+        self.bus._remove(self)
+
+
+class AsyncSubscription(Subscription):
+    """
+    Subscriber served from its own bounded queue by a worker thread, so a
+    slow handler never blocks the service call that published the event.
+
+    Coroutine handlers are run on `loop` (e.g. the API server's loop);
+    plain callables run on the worker thread. When the queue is full the
+    event is dropped for this subscriber and counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        event_type: Type[Event],
+        handler: Handler,
+        max_queue_size: int,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        super().__init__(bus, event_type, handler)
+        self.loop = loop
+        self.dropped = 0
+        self._is_coroutine = asyncio.iscoroutinefunction(handler)
+        if self._is_coroutine and loop is None:
+            raise ValueError("A coroutine handler needs the event loop to run on.")
+
+        self._queue: "queue.Queue[Optional[Event]]" = queue.Queue(maxsize=max_queue_size)
+        self._worker = threading.Thread(
+            target=self._run,
+            name=f"event-bus-{getattr(handler, '__name__', 'handler')}",
+            daemon=True,
+        )
+        self._worker.start()
+
+    def deliver(self, event: Event) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            try:
+                if self._is_coroutine:
+                    future = asyncio.run_coroutine_threadsafe(self.handler(event), self.loop)
+                    future.result()
+                else:
+                    self.handler(event)
+            except Exception:
+                logger.exception("Async event handler %r failed for %r", self.handler, event)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the worker once the already-queued events are handled.
+        """
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+
+# ---------------------------------------------------------------------------
+# Bus
+# ---------------------------------------------------------------------------
+
+class EventBus:
+    """
+    In-process publish/subscribe bus for booking and driver state changes.
+
+    Services publish after the database write succeeds; caches and UIs
+    subscribe to the event classes they care about (or to Event for all).
+    Synchronous subscribers run inline on the publishing thread, so they
+    must be cheap; anything slow should use subscribe_async().
+    """
+
+    def __init__(self, default_queue_size: int = 1000):
+        self.default_queue_size = default_queue_size
+        self._subscriptions: Dict[Type[Event], List[Subscription]] = {}
+        self._dispatch_cache: Dict[Type[Event], List[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_type: Type[Event], handler: Handler) -> Subscription:
+        """
+        Call `handler(event)` inline for every published `event_type`.
+        """
+        return self._add(Subscription(self, event_type, handler))
+
+    def subscribe_async(
+        self,
+        event_type: Type[Event],
+        handler: Handler,
+        max_queue_size: Optional[int] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> AsyncSubscription:
+        """
+        Deliver `event_type` to `handler` through a bounded queue.
+        """
+        subscription = AsyncSubscription(
+            self,
+            event_type,
+            handler,
+            max_queue_size or self.default_queue_size,
+            loop,
+        )
+        return self._add(subscription)
+
+    def publish(self, event: Event) -> None:
+        """
+        Deliver an event to every subscriber of its class or a base class.
+        """
+        subscriptions = self._dispatch_cache.get(type(event))
+        if subscriptions is None:
+            subscriptions = self._resolve(type(event))
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Drain and stop all async subscribers.
+        """
+        with self._lock:
+            subscriptions = [s for subs in self._subscriptions.values() for s in subs]
+            self._subscriptions.clear()
+            self._dispatch_cache.clear()
+        for subscription in subscriptions:
+            if isinstance(subscription, AsyncSubscription):
+                subscription.close(timeout)
+
+    def _add(self, subscription: Subscription) -> Subscription:
+        with self._lock:
+            self._subscriptions.setdefault(subscription.event_type, []).append(subscription)
+            self._dispatch_cache.clear()
+        return subscription
+
+    def _remove(self, subscription: Subscription) -> None:
+        with self._lock:
+            subs = self._subscriptions.get(subscription.event_type, [])
+            if subscription in subs:
+                subs.remove(subscription)
+            self._dispatch_cache.clear()
+        if isinstance(subscription, AsyncSubscription):
+            subscription.close()
+
+    def _resolve(self, event_type: Type[Event]) -> List[Subscription]:
+        with self._lock:
+            resolved: List[Subscription] = []
+            for klass in event_type.__mro__:
+                resolved.extend(self._subscriptions.get(klass, ()))
+            self._dispatch_cache[event_type] = resolved
+        return resolved
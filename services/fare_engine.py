@@ -0,0 +1,424 @@
+import argparse
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config.settings import TARIFF
+from services.locations import LocationService
+
+try:
+    import numpy as np
+except ImportError:  # batch pricing falls back to plain Python
+    np = None
+
+
+_CENT = Decimal("0.01")
+
+
+def to_money(value: float) -> Decimal:
+    """
+    Round a computed fare to paisa, half up.
+    """
+    return Decimal(str(float(value))).quantize(_CENT, rounding=ROUND_HALF_UP)
+
+
+def _hours(start: int, end: int) -> Iterable[int]:
+    if start < end:
+        return range(start, end)
+    # wraps past midnight, e.g. (22, 6)
+    return list(range(start, 24)) + list(range(0, end))
+
+
+class Tariff:
+    """
+    Fare rates plus the zone tables they are applied with; see TARIFF in
+    config.settings for the meaning of each setting.
+
+    Zones are numbered so that trips can be priced from index arrays:
+    index len(zone_names) is the "unknown place" zone, whose distances
+    are default_distance_km and which has no fee.
+    """
+
+    def __init__(
+        self,
+        base_fare: float,
+        per_km: float,
+        per_minute: float,
+        minimum_fare: float,
+        average_speed_kmh: float,
+        time_surcharges: Sequence[Tuple[int, int, float]] = (),
+        zones: Optional[Dict[str, str]] = None,
+        zone_distances_km: Optional[Dict[str, Dict[str, float]]] = None,
+        zone_fees: Optional[Dict[str, float]] = None,
+        default_distance_km: float = 8.0,
+    ):
+        if average_speed_kmh <= 0:
+            raise ValueError("average_speed_kmh must be positive.")
+        self.settings = {
+            "base_fare": base_fare,
+            "per_km": per_km,
+            "per_minute": per_minute,
+            "minimum_fare": minimum_fare,
+            "average_speed_kmh": average_speed_kmh,
+            "time_surcharges": list(time_surcharges),
+            "zones": dict(zones or {}),
+            "zone_distances_km": {k: dict(v) for k, v in (zone_distances_km or {}).items()},
+            "zone_fees": dict(zone_fees or {}),
+            "default_distance_km": default_distance_km,
+        }
+        self.base_fare = float(base_fare)
+        self.per_km = float(per_km)
+        self.per_minute = float(per_minute)
+        self.minimum_fare = float(minimum_fare)
+        self.average_speed_kmh = float(average_speed_kmh)
+
+        # surcharge multiplier per pickup hour
+        self.hourly_multiplier = [1.0] * 24
+        for start, end, multiplier in time_surcharges:
+            for hour in _hours(start, end):
+                self.hourly_multiplier[hour] = max(self.hourly_multiplier[hour], float(multiplier))
+
+        distances = self.settings["zone_distances_km"]
+        names = set(self.settings["zones"].values()) | set(distances) | set(self.settings["zone_fees"])
+        for row in distances.values():
+            names |= set(row)
+        self.zone_names: List[str] = sorted(names)
+        self._zone_index = {zone: i for i, zone in enumerate(self.zone_names)}
+        self._place_index = {
+            place.strip().casefold(): self._zone_index[zone] for place, zone in self.settings["zones"].items()
+        }
+        self.unknown_zone = len(self.zone_names)
+
+        size = self.unknown_zone + 1
+        self.distance_matrix = [[float(default_distance_km)] * size for _ in range(size)]
+        for a, row in distances.items():
+            for b, km in row.items():
+                i, j = self._zone_index[a], self._zone_index[b]
+                self.distance_matrix[i][j] = self.distance_matrix[j][i] = float(km)
+        self.zone_fee = [0.0] * size
+        for zone, fee in self.settings["zone_fees"].items():
+            self.zone_fee[self._zone_index[zone]] = float(fee)
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict[str, Any]] = None) -> "Tariff":
+        return cls(**(settings if settings is not None else TARIFF))
+
+    def replace(self, **changes: Any) -> "Tariff":
+        """
+        A copy with some settings changed, for what-if comparisons.
+        """
+        return Tariff(**dict(self.settings, **changes))
+
+    def zone_index(self, location: str) -> int:
+        return self._place_index.get((location or "").strip().casefold(), self.unknown_zone)
+
+    def zone_name(self, index: int) -> Optional[str]:
+        return self.zone_names[index] if index < self.unknown_zone else None
+
+    def price(self, distance_km: float, minutes: float, multiplier: float, fees: float) -> float:
+        """
+        Unrounded fare. _price_arrays() is the same formula over arrays;
+        keep the two in step.
+        """
+        metered = (self.base_fare + self.per_km * distance_km + self.per_minute * minutes) * multiplier
+        return max(self.minimum_fare, metered) + fees
+
+
+class FareQuote:
+    """
+    A priced trip and how the price was reached.
+    `estimated` is True when the distance was not measured (coordinates
+    or the zone table).
+    """
+
+    def __init__(
+        self,
+        fare: Decimal,
+        distance_km: float,
+        duration_minutes: float,
+        surcharge: float,
+        zone_fees: float,
+        pickup_zone: Optional[str],
+        dropoff_zone: Optional[str],
+        estimated: bool,
+        surge: float = 1.0,
+    ):
+        self.fare = fare
+        self.distance_km = distance_km
+        self.duration_minutes = duration_minutes
+        self.surcharge = surcharge
+        self.surge = surge
+        self.zone_fees = zone_fees
+        self.pickup_zone = pickup_zone
+        self.dropoff_zone = dropoff_zone
+        self.estimated = estimated
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "fare": self.fare,
+            "distance_km": round(self.distance_km, 2),
+            "duration_minutes": round(self.duration_minutes, 1),
+            "surcharge": self.surcharge,
+            "surge": self.surge,
+            "zone_fees": self.zone_fees,
+            "pickup_zone": self.pickup_zone,
+            "dropoff_zone": self.dropoff_zone,
+            "estimated": self.estimated,
+        }
+
+
+class TripBatch:
+    """
+    Bookings reduced to the columns the tariff needs, so one batch can be
+    priced under several tariffs that share the same zone table.
+
+    Each booking is a dict with pickup_location, dropoff_location and
+    pickup_datetime, and optionally distance_km / duration_minutes and
+    the surge_multiplier it was booked with. With `locations`, missing
+    distances between two known places are filled in from coordinates.
+    """
+
+    def __init__(
+        self,
+        tariff: Tariff,
+        bookings: Sequence[Dict[str, Any]],
+        locations: Optional[LocationService] = None,
+    ):
+        self.zones = tariff.settings["zones"]
+        self.pickup_zone = [tariff.zone_index(b["pickup_location"]) for b in bookings]
+        self.dropoff_zone = [tariff.zone_index(b["dropoff_location"]) for b in bookings]
+        self.hour = [b["pickup_datetime"].hour for b in bookings]
+        # measured values come back from the database as Decimal
+        self.distance_km = [_optional_float(b.get("distance_km")) for b in bookings]
+        if locations is not None:
+            self.distance_km = [
+                locations.distance_km(b["pickup_location"], b["dropoff_location"]) if km is None else km
+                for b, km in zip(bookings, self.distance_km)
+            ]
+        self.duration_minutes = [_optional_float(b.get("duration_minutes")) for b in bookings]
+        self.surge = [float(b.get("surge_multiplier") or 1) for b in bookings]
+
+    def __len__(self) -> int:
+        return len(self.hour)
+
+
+class FareEngine:
+    """
+    Prices trips with a Tariff: single quotes for booking and completion,
+    and whole batches for recomputing stored fares or comparing tariffs.
+    Batches are evaluated with NumPy when it is installed.
+
+    With `locations`, trips between two places in the gazetteer are
+    measured from their coordinates rather than the zone table.
+    """
+
+    def __init__(self, tariff: Optional[Tariff] = None, locations: Optional[LocationService] = None):
+        self.tariff = tariff or Tariff.from_settings()
+        self.locations = locations
+
+    def quote(
+        self,
+        pickup_location: str,
+        dropoff_location: str,
+        pickup_datetime: Optional[datetime] = None,
+        distance_km: Optional[float] = None,
+        duration_minutes: Optional[float] = None,
+        tariff: Optional[Tariff] = None,
+        surge: float = 1.0,
+    ) -> FareQuote:
+        """
+        Price one trip. Without a measured distance the coordinates (or
+        else the zone table) are used; without a duration it is derived
+        from average_speed_kmh.
+        `surge` multiplies the metered part like the time surcharge.
+        """
+        tariff = tariff or self.tariff
+        if distance_km is not None and distance_km < 0:
+            raise ValueError("Distance cannot be negative.")
+        if duration_minutes is not None and duration_minutes < 0:
+            raise ValueError("Duration cannot be negative.")
+
+        pickup_at = pickup_datetime or datetime.now()
+        pickup_zone = tariff.zone_index(pickup_location)
+        dropoff_zone = tariff.zone_index(dropoff_location)
+        estimated = distance_km is None
+        if estimated and self.locations is not None:
+            distance_km = self.locations.distance_km(pickup_location, dropoff_location)
+        if distance_km is None:
+            distance_km = tariff.distance_matrix[pickup_zone][dropoff_zone]
+        if duration_minutes is None:
+            duration_minutes = distance_km / tariff.average_speed_kmh * 60
+        multiplier = tariff.hourly_multiplier[pickup_at.hour]
+        fees = tariff.zone_fee[pickup_zone] + tariff.zone_fee[dropoff_zone]
+
+        return FareQuote(
+            fare=to_money(tariff.price(distance_km, duration_minutes, multiplier * surge, fees)),
+            distance_km=distance_km,
+            duration_minutes=duration_minutes,
+            surcharge=multiplier,
+            zone_fees=fees,
+            pickup_zone=tariff.zone_name(pickup_zone),
+            dropoff_zone=tariff.zone_name(dropoff_zone),
+            estimated=estimated,
+            surge=surge,
+        )
+
+    def fare(
+        self,
+        pickup_location: str,
+        dropoff_location: str,
+        pickup_datetime: Optional[datetime] = None,
+        distance_km: Optional[float] = None,
+        duration_minutes: Optional[float] = None,
+        surge: float = 1.0,
+    ) -> Decimal:
+        return self.quote(
+            pickup_location, dropoff_location, pickup_datetime, distance_km, duration_minutes, surge=surge
+        ).fare
+
+    # ---- batch pricing ---------------------------------------------------
+
+    def _batch_for(self, bookings, tariff: Tariff) -> TripBatch:
+        if isinstance(bookings, TripBatch):
+            if bookings.zones != tariff.settings["zones"]:
+                raise ValueError("Batch was prepared for a tariff with a different zone table.")
+            return bookings
+        return TripBatch(tariff, bookings, self.locations)
+
+    def price_batch(self, bookings, tariff: Optional[Tariff] = None) -> Sequence[float]:
+        """
+        Unrounded fares for a TripBatch or a list of booking dicts, in
+        input order.
+        """
+        tariff = tariff or self.tariff
+        batch = self._batch_for(bookings, tariff)
+        if not len(batch):
+            return []
+        if np is not None:
+            return _price_arrays(tariff, batch)
+        return [
+            tariff.price(*_trip_terms(tariff, batch, i))
+            for i in range(len(batch))
+        ]
+
+    def recompute(self, bookings, tariff: Optional[Tariff] = None) -> List[Decimal]:
+        """
+        Rounded fares for every booking, e.g. to write back with
+        BookingDAL.set_fares().
+        """
+        return [to_money(value) for value in self.price_batch(bookings, tariff)]
+
+    def what_if(self, bookings: Sequence[Dict[str, Any]], candidate: Tariff) -> Dict[str, Any]:
+        """
+        Revenue under the current tariff versus `candidate` for the same
+        bookings.
+        """
+        batch = TripBatch(self.tariff, bookings, self.locations)
+        current = self.price_batch(batch)
+        if candidate.settings["zones"] != self.tariff.settings["zones"]:
+            batch = TripBatch(candidate, bookings, self.locations)
+        proposed = self.price_batch(batch, candidate)
+
+        changes = [b - a for a, b in zip(current, proposed)]
+        current_total = float(sum(current))
+        proposed_total = float(sum(proposed))
+        return {
+            "bookings": len(changes),
+            "current_revenue": to_money(current_total),
+            "proposed_revenue": to_money(proposed_total),
+            "change": (proposed_total - current_total) / current_total if current_total else 0.0,
+            "mean_fare_change": to_money(sum(changes) / len(changes)) if changes else Decimal("0.00"),
+            "largest_increase": to_money(max(changes)) if changes else Decimal("0.00"),
+            "largest_decrease": to_money(min(changes)) if changes else Decimal("0.00"),
+        }
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _trip_terms(tariff: Tariff, batch: TripBatch, i: int) -> Tuple[float, float, float, float]:
+    p, d = batch.pickup_zone[i], batch.dropoff_zone[i]
+    distance = batch.distance_km[i]
+    if distance is None:
+        distance = tariff.distance_matrix[p][d]
+    minutes = batch.duration_minutes[i]
+    if minutes is None:
+        minutes = distance / tariff.average_speed_kmh * 60
+    return (
+        float(distance),
+        float(minutes),
+        tariff.hourly_multiplier[batch.hour[i]] * batch.surge[i],
+        tariff.zone_fee[p] + tariff.zone_fee[d],
+    )
+
+
+def _price_arrays(tariff: Tariff, batch: TripBatch):
+    """
+    Tariff.price() over whole columns at once.
+    """
+    pickup = np.asarray(batch.pickup_zone, dtype=np.intp)
+    dropoff = np.asarray(batch.dropoff_zone, dtype=np.intp)
+    hours = np.asarray(batch.hour, dtype=np.intp)
+
+    distance = np.asarray(tariff.distance_matrix)[pickup, dropoff]
+    measured = np.array([np.nan if v is None else v for v in batch.distance_km], dtype=float)
+    distance = np.where(np.isnan(measured), distance, measured)
+
+    minutes = distance / tariff.average_speed_kmh * 60
+    measured = np.array([np.nan if v is None else v for v in batch.duration_minutes], dtype=float)
+    minutes = np.where(np.isnan(measured), minutes, measured)
+
+    fees = np.asarray(tariff.zone_fee)
+    metered = (tariff.base_fare + tariff.per_km * distance + tariff.per_minute * minutes) \
+        * (np.asarray(tariff.hourly_multiplier)[hours] * np.asarray(batch.surge, dtype=float))
+    return np.maximum(tariff.minimum_fare, metered) + (fees[pickup] + fees[dropoff])
+
+
+# ---------------------------------------------------------------------------
+# Command line:
+#   python -m services.fare_engine what-if --per-km 50 --base-fare 120
+#   python -m services.fare_engine recompute --apply
+# ---------------------------------------------------------------------------
+
+_RATE_OPTIONS = ("base_fare", "per_km", "per_minute", "minimum_fare", "average_speed_kmh")
+
+
+def main() -> None:
+    from dataacesslayer.booking_dal import BookingDAL
+    from dataacesslayer.db_connector import Database
+
+    parser = argparse.ArgumentParser(description="Batch fare tools.")
+    parser.add_argument("command", choices=("what-if", "recompute"))
+    parser.add_argument("--status", action="append", help="booking status to include (default: completed)")
+    parser.add_argument("--apply", action="store_true", help="recompute: write the new fares")
+    for option in _RATE_OPTIONS:
+        parser.add_argument(f"--{option.replace('_', '-')}", type=float, help="what-if: proposed value")
+    args = parser.parse_args()
+
+    db = Database()
+    db.init_schema()
+    booking_dal = BookingDAL(db)
+    engine = FareEngine(locations=LocationService.from_settings())
+    bookings = booking_dal.list_for_pricing(args.status or ["completed"])
+    print(f"{len(bookings)} bookings{'' if np is not None else ' (NumPy not installed; pricing in Python)'}")
+
+    if args.command == "what-if":
+        changes = {o: getattr(args, o) for o in _RATE_OPTIONS if getattr(args, o) is not None}
+        if not changes:
+            parser.error("what-if needs at least one proposed rate, e.g. --per-km 50")
+        for key, value in engine.what_if(bookings, engine.tariff.replace(**changes)).items():
+            print(f"{key:>20}: {value:.2%}" if key == "change" else f"{key:>20}: {value}")
+        return
+
+    fares = engine.recompute(bookings)
+    changed = [(b["id"], fare) for b, fare in zip(bookings, fares) if b.get("fare") != fare]
+    print(f"{len(changed)} fares differ from the stored value")
+    if args.apply and changed:
+        with db.transaction():
+            booking_dal.set_fares(changed)
+        print("Stored.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+import csv
+import difflib
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config.settings import LOCATIONS
+
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+EARTH_RADIUS_KM = 6371.0088
+# bump when the geocode cache keys change meaning
+_CACHE_FORMAT = 2
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two points in degrees.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _clean(text: str) -> str:
+    """
+    Case-folded, punctuation turned into spaces, whitespace collapsed.
+    """
+    text = (text or "").casefold().replace("'", "").replace("’", "")
+    return " ".join(_PUNCTUATION.sub(" ", text).split())
+
+
+class Place:
+    __slots__ = ("name", "latitude", "longitude")
+
+    def __init__(self, name: str, latitude: float, longitude: float):
+        self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+
+    def distance_km(self, other: "Place") -> float:
+        return haversine_km(self.latitude, self.longitude, other.latitude, other.longitude)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "latitude": self.latitude, "longitude": self.longitude}
+
+
+class _TrieNode:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.values: List[str] = []
+
+
+class PrefixTrie:
+    """
+    Maps keys to display values for autocomplete. Every node keeps the
+    first `limit` distinct values inserted below it, so complete() costs
+    O(len(prefix)) whatever the size of the trie; insert the values in
+    the order they should be suggested.
+    """
+
+    def __init__(self, limit: int = 8):
+        self.limit = limit
+        self._root = _TrieNode()
+
+    def insert(self, key: str, value: str) -> None:
+        node = self._root
+        self._offer(node, value)
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            self._offer(node, value)
+
+    def _offer(self, node: _TrieNode, value: str) -> None:
+        if len(node.values) < self.limit and value not in node.values:
+            node.values.append(value)
+
+    def complete(self, prefix: str) -> List[str]:
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return list(node.values)
+
+
+class GeocodeCache:
+    """
+    Successful lookups (lookup key -> place) in a SQLite file, so they
+    survive restarts. Holds at most `max_rows`; the oldest writes go
+    first. Entries are dropped when `version` (the gazetteer and
+    normalization rules) changes.
+    """
+
+    def __init__(self, path: str, version: str, max_rows: int = 10000):
+        self.max_rows = max_rows
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                " query TEXT PRIMARY KEY, name TEXT, latitude REAL, longitude REAL)"
+            )
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != version:
+                self._conn.execute("DELETE FROM geocode")
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+            self._rows = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+
+    def load(self, limit: int) -> List[Tuple[str, Place]]:
+        """
+        Up to `limit` entries, oldest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query, name, latitude, longitude FROM geocode ORDER BY rowid DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [(query, Place(name, latitude, longitude)) for query, name, latitude, longitude in reversed(rows)]
+
+    def put(self, query: str, place: Place) -> None:
+        with self._lock, self._conn:
+            # REPLACE deletes and re-inserts, so the row also moves to the end
+            replaced = self._conn.execute("DELETE FROM geocode WHERE query = ?", (query,)).rowcount
+            self._conn.execute(
+                "INSERT INTO geocode VALUES (?, ?, ?, ?)",
+                (query, place.name, place.latitude, place.longitude),
+            )
+            self._rows += 1 - replaced
+            if self._rows > self.max_rows:
+                excess = self._rows - self.max_rows
+                self._conn.execute(
+                    "DELETE FROM geocode WHERE rowid IN (SELECT rowid FROM geocode ORDER BY rowid LIMIT ?)",
+                    (excess,),
+                )
+                self._rows -= excess
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class LocationService:
+    """
+    Turns free-text pickup/dropoff locations into known places.
+
+    Text is normalized (case, punctuation, whitespace, abbreviations such
+    as "rd" -> "road", filler like "kathmandu" dropped) and looked up in
+    the gazetteer CSV (name, aliases separated by "|", latitude,
+    longitude): first as a whole, then each comma-separated part, then by
+    close spelling (difflib, `fuzzy_cutoff`).
+
+    Answers, "not found" included, are kept in an LRU dict of
+    `cache_size` entries, so a repeated address costs one dict lookup.
+    With `cache_path`, places found are also kept in a SQLite file (at
+    most `cache_size` rows) and preloaded on start. complete() serves the booking form from a prefix trie over
+    the gazetteer's names and aliases, matching from the start of any
+    word.
+    """
+
+    def __init__(
+        self,
+        gazetteer_path: str,
+        cache_path: Optional[str] = None,
+        road_factor: float = 1.3,
+        fuzzy_cutoff: float = 0.85,
+        abbreviations: Optional[Dict[str, str]] = None,
+        ignore_words: Iterable[str] = (),
+        suggestions: int = 8,
+        cache_size: int = 10000,
+    ):
+        self.road_factor = road_factor
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.abbreviations = {_clean(k): _clean(v) for k, v in (abbreviations or {}).items()}
+        self.ignore_words = frozenset(_clean(w) for w in ignore_words)
+
+        if not os.path.isabs(gazetteer_path):
+            gazetteer_path = os.path.join(_PROJECT_ROOT, gazetteer_path)
+        with open(gazetteer_path, "rb") as f:
+            raw = f.read()
+        self.places: Dict[str, Place] = {}
+        self._index: Dict[str, Place] = {}
+        self._trie = PrefixTrie(limit=suggestions)
+        self._load_gazetteer(raw.decode("utf-8-sig").splitlines())
+        self._keys = list(self._index)
+
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Optional[Place]]" = OrderedDict()
+        self._store: Optional[GeocodeCache] = None
+        if cache_path:
+            rules = json.dumps(
+                [_CACHE_FORMAT, sorted(self.abbreviations.items()), sorted(self.ignore_words), fuzzy_cutoff]
+            )
+            version = hashlib.sha1(raw + rules.encode("utf-8")).hexdigest()
+            try:
+                self._store = GeocodeCache(os.path.expanduser(cache_path), version, cache_size)
+                self._cache.update(self._store.load(cache_size))
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Geocode cache %s unavailable, caching in memory only: %s", cache_path, e)
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict[str, Any]] = None) -> "LocationService":
+        return cls(**(settings if settings is not None else LOCATIONS))
+
+    def _load_gazetteer(self, lines: List[str]) -> None:
+        rows = sorted(csv.DictReader(lines), key=lambda row: row["name"].strip().casefold())
+        word_starts = []
+        for row in rows:
+            place = Place(row["name"].strip(), float(row["latitude"]), float(row["longitude"]))
+            self.places[place.name] = place
+            names = [place.name] + [a for a in (row.get("aliases") or "").split("|") if a.strip()]
+            for name in names:
+                key = self.normalize(name)
+                self._index.setdefault(key, place)
+                self._trie.insert(_clean(name), place.name)
+                words = _clean(name).split()
+                word_starts.extend((" ".join(words[i:]), place.name) for i in range(1, len(words)))
+        # whole names first, so "pa" suggests Patan before "Bus Park"
+        for key, name in word_starts:
+            self._trie.insert(key, name)
+
+    # ---- lookups -------------------------------------------------------------
+
+    def normalize(self, text: str) -> str:
+        words = [self.abbreviations.get(w, w) for w in _clean(text).split()]
+        kept = [w for w in words if w not in self.ignore_words]
+        return " ".join(kept or words)
+
+    def resolve(self, text: str) -> Optional[Place]:
+        """
+        The gazetteer place `text` refers to, or None.
+        """
+        # the comma-separated parts matter to _lookup(), so keep them apart
+        parts = [self.normalize(part) for part in (text or "").split(",")]
+        key = ",".join(parts)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        place = self._lookup(self.normalize(text), parts)
+        with self._lock:
+            self._cache[key] = place
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        # misses stay in memory only; the file itself is capped at cache_size
+        if place is not None and self._store is not None:
+            try:
+                self._store.put(key, place)
+            except sqlite3.Error as e:
+                logger.warning("Could not store geocode for %r: %s", key, e)
+        return place
+
+    def _lookup(self, key: str, parts: List[str]) -> Optional[Place]:
+        if key in self._index:
+            return self._index[key]
+        for part in parts:
+            if part in self._index:
+                return self._index[part]
+        for part in [key] + parts:
+            if part:
+                match = difflib.get_close_matches(part, self._keys, n=1, cutoff=self.fuzzy_cutoff)
+                if match:
+                    return self._index[match[0]]
+        return None
+
+    def canonical(self, text: str) -> str:
+        """
+        The gazetteer name when the whole of `text` is just another
+        spelling of it ("thamel, ktm", "TIA"); otherwise `text` with its
+        whitespace tidied. Partial and fuzzy matches are left alone, so
+        "House 12, Thamel" keeps the detail a driver needs.
+        """
+        place = self._index.get(self.normalize(text))
+        return place.name if place is not None else " ".join((text or "").split())
+
+    def distance_km(self, pickup_location: str, dropoff_location: str) -> Optional[float]:
+        """
+        Estimated road distance: straight-line distance times
+        `road_factor`. None unless both places are known.
+        """
+        pickup, dropoff = self.resolve(pickup_location), self.resolve(dropoff_location)
+        if pickup is None or dropoff is None:
+            return None
+        return pickup.distance_km(dropoff) * self.road_factor
+
+    def complete(self, prefix: str) -> List[str]:
+        """
+        Place names for a partly typed location.
+        """
+        prefix = _clean(prefix)
+        return self._trie.complete(prefix) if prefix else []
@@ -0,0 +1,54 @@
+import threading
+from typing import Callable, Iterable, Optional, Set
+
+
+class MembershipIndex:
+    """
+    In-memory set of values already taken in a UNIQUE column.
+
+    Loaded once from `loader` (on first use or via load()) and kept current
+    with add()/discard() as this process inserts rows. Lookups are
+    normalised with casefold(), matching MySQL's case-insensitive
+    collation.
+
+    might_contain() is exact for this process's view, but rows can also
+    be inserted or deleted elsewhere, so it is used like a Bloom filter:
+    - False: "definitely free" as far as we know -> skip the DB check and
+      let the UNIQUE constraint catch the rare race.
+    - True: confirm with the database before rejecting.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[Optional[str]]]):
+        self._loader = loader
+        self._values: Optional[Set[str]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(value: str) -> str:
+        return value.strip().casefold()
+
+    def load(self) -> None:
+        values = {self._key(v) for v in self._loader() if v}
+        with self._lock:
+            self._values = values
+
+    def _ensure_loaded(self) -> Set[str]:
+        if self._values is None:
+            self.load()
+        return self._values
+
+    def might_contain(self, value: str) -> bool:
+        return self._key(value) in self._ensure_loaded()
+
+    def add(self, value: str) -> None:
+        if self._values is not None:
+            with self._lock:
+                self._values.add(self._key(value))
+
+    def discard(self, value: str) -> None:
+        if self._values is not None:
+            with self._lock:
+                self._values.discard(self._key(value))
+
+    def __len__(self) -> int:
+        return len(self._ensure_loaded())
@@ -0,0 +1,292 @@
+import functools
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import METRICS
+
+
+# ---------------------------------------------------------------------------
+# Histogram
+# ---------------------------------------------------------------------------
+
+# Log-linear buckets over microseconds, HDR style: exact below 32 us, then
+# 16 linear sub-buckets per power of two (about 6% relative error).
+_SUB_BUCKETS = 32
+_HALF = _SUB_BUCKETS // 2
+_SUB_BITS = _SUB_BUCKETS.bit_length() - 1
+_MAX_SHIFT = 32  # values up to ~2**37 us (38 hours)
+_BUCKET_COUNT = _SUB_BUCKETS + _MAX_SHIFT * _HALF
+
+# Bucket bounds (seconds) of the exported Prometheus histogram.
+PROMETHEUS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _bucket_index(micros: int) -> int:
+    if micros < _SUB_BUCKETS:
+        return micros
+    shift = min(micros.bit_length() - _SUB_BITS, _MAX_SHIFT)
+    top = min(micros >> shift, _SUB_BUCKETS - 1)
+    return _SUB_BUCKETS + (shift - 1) * _HALF + (top - _HALF)
+
+
+def _bucket_range(index: int) -> Tuple[int, int]:
+    """
+    Lowest and highest microsecond value that land in `index`.
+    """
+    if index < _SUB_BUCKETS:
+        return index, index
+    shift = (index - _SUB_BUCKETS) // _HALF + 1
+    top = (index - _SUB_BUCKETS) % _HALF + _HALF
+    return top << shift, ((top + 1) << shift) - 1
+
+
+class _MethodStats:
+    __slots__ = ("count", "errors", "total_us", "max_us", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_us = 0
+        self.max_us = 0
+        self.buckets = [0] * _BUCKET_COUNT
+
+    def merge(self, other: "_MethodStats") -> None:
+        self.count += other.count
+        self.errors += other.errors
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def percentile(self, pct: float) -> float:
+        """
+        Approximate percentile in microseconds (bucket midpoint).
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                low, high = _bucket_range(index)
+                return min((low + high) / 2, self.max_us)
+        return float(self.max_us)
+
+    def count_at_or_below(self, micros: float) -> int:
+        total = 0
+        for index, n in enumerate(self.buckets):
+            if n and _bucket_range(index)[1] <= micros:
+                total += n
+        return total
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+class MetricsRegistry:
+    """
+    Call counts, error counts and latency histograms per service method.
+
+    Each thread records into its own shard, so the hot path takes no
+    lock; snapshot() merges the shards. A snapshot taken while calls
+    are running may be off by the calls in flight, which is fine for
+    monitoring.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Dict[str, _MethodStats]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Dict[str, _MethodStats]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def record(self, name: str, seconds: float, failed: bool = False) -> None:
+        shard = self._shard()
+        stats = shard.get(name)
+        if stats is None:
+            stats = shard[name] = _MethodStats()
+        micros = int(seconds * 1_000_000)
+        stats.count += 1
+        stats.total_us += micros
+        if micros > stats.max_us:
+            stats.max_us = micros
+        stats.buckets[_bucket_index(micros)] += 1
+        if failed:
+            stats.errors += 1
+
+    def _merged(self) -> Dict[str, _MethodStats]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        merged: Dict[str, _MethodStats] = {}
+        for shard in shards:
+            for name, stats in list(shard.items()):
+                merged.setdefault(name, _MethodStats()).merge(stats)
+        return merged
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        One dict per method, largest total time first.
+        """
+        rows = []
+        for name, stats in self._merged().items():
+            rows.append({
+                "method": name,
+                "calls": stats.count,
+                "errors": stats.errors,
+                "total_seconds": stats.total_us / 1_000_000,
+                "mean_ms": stats.total_us / stats.count / 1000 if stats.count else 0.0,
+                "p50_ms": stats.percentile(50) / 1000,
+                "p95_ms": stats.percentile(95) / 1000,
+                "p99_ms": stats.percentile(99) / 1000,
+                "max_ms": stats.max_us / 1000,
+            })
+        rows.sort(key=lambda row: row["total_seconds"], reverse=True)
+        return rows
+
+    def prometheus_text(self) -> str:
+        """
+        The metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            "# HELP taxi_service_call_seconds Service method latency.",
+            "# TYPE taxi_service_call_seconds histogram",
+        ]
+        merged = sorted(self._merged().items())
+        for name, stats in merged:
+            service, _, method = name.partition(".")
+            labels = f'service="{service}",method="{method}"'
+            for bound in PROMETHEUS_BUCKETS:
+                count = stats.count_at_or_below(bound * 1_000_000)
+                lines.append(f'taxi_service_call_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'taxi_service_call_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+            lines.append(f"taxi_service_call_seconds_sum{{{labels}}} {stats.total_us / 1_000_000}")
+            lines.append(f"taxi_service_call_seconds_count{{{labels}}} {stats.count}")
+
+        lines.append("# HELP taxi_service_call_errors_total Service calls that raised.")
+        lines.append("# TYPE taxi_service_call_errors_total counter")
+        for name, stats in merged:
+            service, _, method = name.partition(".")
+            lines.append(
+                f'taxi_service_call_errors_total{{service="{service}",method="{method}"}} {stats.errors}'
+            )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+metrics = MetricsRegistry()
+
+
+def profiled(cls: type) -> type:
+    """
+    Class decorator: time every public method defined on `cls` and count
+    its calls and exceptions in `metrics` as "<Class>.<method>".
+    Leaves the class untouched when METRICS["enabled"] is False.
+    """
+    if not METRICS["enabled"]:
+        return cls
+
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not callable(attr) or isinstance(attr, (staticmethod, classmethod, type)):
+            continue
+        setattr(cls, name, _timed(f"{cls.__name__}.{name}", attr))
+    return cls
+
+
+def _timed(metric_name: str, fn: Callable) -> Callable:
+    record = metrics.record
+    clock = time.perf_counter
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            record(metric_name, clock() - start, True)
+            raise
+        record(metric_name, clock() - start)
+        return result
+
+    return wrapper
+
+
+# ---------------------------------------------------------------------------
+# Prometheus exporter
+# ---------------------------------------------------------------------------
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = metrics
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # scraped every few seconds; keep stderr quiet
+        pass
+
+
+class MetricsExporter:
+    """
+    Serves GET /metrics on a daemon thread for Prometheus to scrape.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9108, registry: MetricsRegistry = metrics):
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def start(self) -> "MetricsExporter":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-exporter", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+_exporter: Optional[MetricsExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def start_exporter(port: Optional[int] = None, host: Optional[str] = None) -> Optional[MetricsExporter]:
+    """
+    Start the process-wide exporter once. Defaults come from
+    config.settings.METRICS; returns None if no port is configured.
+    """
+    global _exporter
+    port = port if port is not None else METRICS["exporter_port"]
+    if not port:
+        return None
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = MetricsExporter(host or METRICS["exporter_host"], port).start()
+            print(f"Metrics exporter listening on http://{_exporter.address[0]}:{_exporter.address[1]}/metrics")
+    return _exporter
@@ -0,0 +1,194 @@
+import argparse
+import hashlib
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from config.settings import PASSWORD_HASHING
+
+
+_LEGACY_SHA256_LENGTH = 64
+
+
+class PasswordHasher:
+    """
+    scrypt password hashing with a bounded worker pool.
+
+    Stored format: scrypt$<n>$<r>$<p>$<salt hex>$<hash hex>
+
+    scrypt is deliberately slow (tens of ms) and hashlib releases the GIL
+    while it runs, so hashes are computed on `workers` threads. Callers
+    that must not block (Tk, asyncio) use submit_*() and poll the Future;
+    blocking callers use hash()/verify(). Either way at most `workers`
+    derivations run at once, which also caps their memory (128 * n * r
+    bytes each).
+
+    Rows written by the old unsalted SHA-256 scheme still verify;
+    needs_rehash() tells the caller to upgrade them.
+    """
+
+    def __init__(
+        self,
+        n: int = 2 ** 14,
+        r: int = 8,
+        p: int = 1,
+        workers: Optional[int] = None,
+        salt_bytes: int = 16,
+        key_bytes: int = 32,
+    ):
+        if n < 2 or n & (n - 1):
+            raise ValueError("scrypt n must be a power of two greater than 1.")
+        self.n = n
+        self.r = r
+        self.p = p
+        self.salt_bytes = salt_bytes
+        self.key_bytes = key_bytes
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+
+    # ---- derivation ------------------------------------------------------
+
+    def _derive(self, password: str, salt: bytes, n: int, r: int, p: int, key_bytes: int) -> bytes:
+        return hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r + 1024 * 1024,
+            dklen=key_bytes,
+        )
+
+    def _hash_now(self, password: str) -> str:
+        salt = os.urandom(self.salt_bytes)
+        key = self._derive(password, salt, self.n, self.r, self.p, self.key_bytes)
+        return f"scrypt${self.n}${self.r}${self.p}${salt.hex()}${key.hex()}"
+
+    def _verify_now(self, password: str, stored: str) -> bool:
+        if stored.startswith("scrypt$"):
+            try:
+                _, n, r, p, salt_hex, key_hex = stored.split("$")
+                salt, expected = bytes.fromhex(salt_hex), bytes.fromhex(key_hex)
+                key = self._derive(password, salt, int(n), int(r), int(p), len(expected))
+            except ValueError:
+                return False
+            return hmac.compare_digest(key, expected)
+
+        if len(stored) == _LEGACY_SHA256_LENGTH:
+            legacy = hashlib.sha256(password.encode("utf-8")).hexdigest()
+            return hmac.compare_digest(legacy, stored)
+
+        return False
+
+    # ---- public API ------------------------------------------------------
+
+    def submit_hash(self, password: str) -> "Future[str]":
+        return self._executor.submit(self._hash_now, password)
+
+    def submit_verify(self, password: str, stored: str) -> "Future[bool]":
+        return self._executor.submit(self._verify_now, password, stored)
+
+    def hash(self, password: str) -> str:
+        return self.submit_hash(password).result()
+
+    def verify(self, password: str, stored: str) -> bool:
+        return self.submit_verify(password, stored).result()
+
+    def hash_many(self, passwords: Iterable[str]) -> List[str]:
+        """
+        Hash several passwords in parallel, preserving order.
+        """
+        return list(self._executor.map(self._hash_now, passwords))
+
+    def needs_rehash(self, stored: str) -> bool:
+        """
+        True for legacy SHA-256 rows and for scrypt rows made with other
+        cost parameters than the current ones.
+        """
+        if not stored.startswith("scrypt$"):
+            return True
+        try:
+            _, n, r, p, _, _ = stored.split("$")
+        except ValueError:
+            return True
+        return (int(n), int(r), int(p)) != (self.n, self.r, self.p)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+_default_hasher: Optional[PasswordHasher] = None
+_default_lock = threading.Lock()
+
+
+def get_default_hasher() -> PasswordHasher:
+    """
+    Process-wide hasher configured from config.settings.PASSWORD_HASHING.
+    """
+    global _default_hasher
+    if _default_hasher is None:
+        with _default_lock:
+            if _default_hasher is None:
+                _default_hasher = PasswordHasher(**PASSWORD_HASHING)
+    return _default_hasher
+
+
+# ---------------------------------------------------------------------------
+# Cost calibration: python -m services.password_hasher --target-ms 100
+# ---------------------------------------------------------------------------
+
+def time_hash(n: int, r: int = 8, p: int = 1, rounds: int = 3) -> float:
+    """
+    Median seconds for one derivation with the given parameters.
+    """
+    hasher = PasswordHasher(n=n, r=r, p=p, workers=1)
+    samples = []
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            hasher._hash_now("benchmark-password")
+            samples.append(time.perf_counter() - start)
+    finally:
+        hasher.shutdown()
+    return sorted(samples)[len(samples) // 2]
+
+
+def calibrate(target_ms: float, r: int = 8, p: int = 1, max_log2_n: int = 20) -> int:
+    """
+    Largest power-of-two n whose derivation stays within `target_ms` on
+    this machine (at least 2**12).
+    """
+    best = 2 ** 12
+    for log2_n in range(12, max_log2_n + 1):
+        n = 2 ** log2_n
+        if time_hash(n, r, p) * 1000 > target_ms:
+            break
+        best = n
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark scrypt cost parameters on this machine.")
+    parser.add_argument("--target-ms", type=float, default=100.0, help="time budget for one login hash")
+    parser.add_argument("--r", type=int, default=8)
+    parser.add_argument("--p", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'n':>8}  {'ms':>8}  {'memory':>8}")
+    for log2_n in range(12, 19):
+        n = 2 ** log2_n
+        ms = time_hash(n, args.r, args.p) * 1000
+        print(f"{n:>8}  {ms:>8.1f}  {128 * n * args.r // (1024 * 1024):>6} MB")
+
+    n = calibrate(args.target_ms, args.r, args.p)
+    print(
+        f"\nSuggested PASSWORD_HASHING for a {args.target_ms:.0f} ms budget: "
+        f"{{'n': {n}, 'r': {args.r}, 'p': {args.p}}}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class LoginRateLimited(Exception):
+    """
+    Raised when a username or client has exhausted its login attempts.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many login attempts. Try again in {int(retry_after) + 1} seconds.")
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """
+    One token bucket per key (username, client IP, ...).
+
+    Each key starts with `capacity` tokens and regains `refill_per_second`;
+    an attempt costs one token. At most `max_keys` buckets are tracked; the
+    least recently used are dropped, which only ever forgives a key.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, max_keys: int = 100_000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        # key -> (tokens, last refill time)
+        self._buckets: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: Hashable) -> Optional[float]:
+        """
+        Take a token for `key`. Returns None if allowed, otherwise the
+        number of seconds until the next token.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.refill_per_second)
+
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self._buckets.move_to_end(key)
+                return (1 - tokens) / self.refill_per_second
+
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return None
+
+    def reset(self, key: Hashable) -> None:
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+class NegativeCache:
+    """
+    Bounded LRU set of keys known NOT to exist, each remembered for
+    `ttl_seconds` (so rows created by another process are seen again).
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl_seconds
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            self.discard(key)
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,281 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.settings import RIDE_SCHEDULER
+from services.event_bus import (
+    EventBus,
+    BookingCreated,
+    BookingUpdated,
+    BookingCancelled,
+    BookingEscalated,
+    DriverAssigned,
+    Subscription,
+)
+
+
+logger = logging.getLogger(__name__)
+
+DISPATCH = "dispatch"
+ESCALATE = "escalate"
+
+
+class _Job:
+    __slots__ = ("booking_id", "pickup_at", "token")
+
+    def __init__(self, booking_id: int, pickup_at: float, token: int):
+        self.booking_id = booking_id
+        self.pickup_at = pickup_at
+        self.token = token
+
+
+class RideScheduler:
+    """
+    Acts on pending bookings as their pickup time approaches.
+
+    Every scheduled booking gets two timers on a min-heap:
+    - dispatch, `dispatch_lead_minutes` before pickup: `dispatcher` tries
+      to assign a driver; if none is free it is retried every
+      `retry_seconds` until the pickup time;
+    - escalate, `escalate_lead_minutes` before pickup: if the booking is
+      still unassigned, BookingEscalated is published and the booking is
+      listed in escalated() until someone assigns or cancels it.
+
+    Insert and reschedule are O(log n). Cancelling only drops the booking
+    from a dict; its heap entries are skipped when they come up (their
+    token no longer matches) and the heap is rebuilt once more than half
+    of it is stale.
+
+    `dispatcher(booking_id)` returns the assigned driver id or None when no
+    driver was free, and raises ValueError when the booking no longer
+    needs dispatching (cancelled, or assigned elsewhere).
+    """
+
+    def __init__(
+        self,
+        dispatcher: Callable[[int], Optional[int]],
+        loader: Callable[[datetime], Iterable[Tuple[int, datetime]]],
+        event_bus: Optional[EventBus] = None,
+        dispatch_lead_minutes: float = 30,
+        escalate_lead_minutes: float = 10,
+        retry_seconds: float = 60,
+        clock: Callable[[], float] = time.time,
+    ):
+        if escalate_lead_minutes > dispatch_lead_minutes:
+            raise ValueError("Escalation must come after the first dispatch attempt.")
+        self.dispatcher = dispatcher
+        self.event_bus = event_bus or EventBus()
+        self.dispatch_lead = dispatch_lead_minutes * 60
+        self.escalate_lead = escalate_lead_minutes * 60
+        self.retry_seconds = retry_seconds
+        self._loader = loader
+        self._clock = clock
+
+        self._heap: List[Tuple[float, int, int, str, int]] = []
+        self._jobs: Dict[int, _Job] = {}
+        self._escalated: Dict[int, float] = {}
+        self._tokens = itertools.count()
+        self._seq = itertools.count()
+        self._stale = 0
+        self._cond = threading.Condition()
+        self._subscriptions: List[Subscription] = []
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_settings(
+        cls,
+        dispatcher: Callable[[int], Optional[int]],
+        loader: Callable[[datetime], Iterable[Tuple[int, datetime]]],
+        event_bus: Optional[EventBus] = None,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> "RideScheduler":
+        settings = dict(settings if settings is not None else RIDE_SCHEDULER)
+        settings.pop("enabled", None)
+        return cls(dispatcher, loader, event_bus, **settings)
+
+    # ---- scheduling --------------------------------------------------------
+
+    def schedule(self, booking_id: int, pickup_datetime: datetime) -> None:
+        """
+        (Re)schedule `booking_id` for `pickup_datetime`.
+        """
+        pickup_at = pickup_datetime.timestamp()
+        with self._cond:
+            if booking_id in self._jobs:
+                self._stale += 2
+            job = self._jobs[booking_id] = _Job(booking_id, pickup_at, next(self._tokens))
+            self._escalated.pop(booking_id, None)
+            self._push(pickup_at - self.dispatch_lead, job, DISPATCH)
+            self._push(pickup_at - self.escalate_lead, job, ESCALATE)
+            self._cond.notify()
+
+    def cancel(self, booking_id: int) -> None:
+        """
+        Forget `booking_id`; it was cancelled or assigned.
+        """
+        with self._cond:
+            if self._jobs.pop(booking_id, None) is not None:
+                self._stale += 2
+                self._maybe_compact()
+            self._escalated.pop(booking_id, None)
+
+    def _push(self, fire_at: float, job: _Job, stage: str) -> None:
+        heapq.heappush(self._heap, (fire_at, next(self._seq), job.booking_id, stage, job.token))
+
+    def _maybe_compact(self) -> None:
+        if self._stale > 1000 and self._stale > len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _is_live(self, entry: Tuple[float, int, int, str, int]) -> bool:
+        job = self._jobs.get(entry[2])
+        return job is not None and job.token == entry[4]
+
+    def load(self) -> int:
+        """
+        Schedule every pending booking with a pickup still ahead.
+        Returns how many were scheduled.
+        """
+        count = 0
+        for booking_id, pickup_datetime in self._loader(datetime.now()):
+            self.schedule(booking_id, pickup_datetime)
+            count += 1
+        return count
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def escalated(self) -> Dict[int, datetime]:
+        """
+        Escalated booking id -> when it was escalated.
+        """
+        with self._cond:
+            return {b: datetime.fromtimestamp(at) for b, at in self._escalated.items()}
+
+    # ---- events --------------------------------------------------------------
+
+    def attach(self, event_bus: Optional[EventBus] = None) -> "RideScheduler":
+        """
+        Keep the schedule in step with bookings created, moved, cancelled
+        or assigned through the services.
+        """
+        bus = event_bus or self.event_bus
+        self._subscriptions = [
+            bus.subscribe(BookingCreated, lambda e: self.schedule(e.booking_id, e.pickup_datetime)),
+            bus.subscribe(BookingUpdated, lambda e: self.schedule(e.booking_id, e.pickup_datetime)),
+            bus.subscribe(BookingCancelled, lambda e: self.cancel(e.booking_id)),
+            bus.subscribe(DriverAssigned, lambda e: self.cancel(e.booking_id)),
+        ]
+        return self
+
+    # ---- firing ----------------------------------------------------------------
+
+    def run_due(self) -> int:
+        """
+        Handle every timer that is due now; returns how many fired.
+        """
+        fired = 0
+        while True:
+            with self._cond:
+                entry = self._pop_due(self._clock())
+            if entry is None:
+                return fired
+            fired += 1
+            self._fire(entry)
+
+    def _pop_due(self, now: float) -> Optional[Tuple[float, int, int, str, int]]:
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if self._is_live(entry):
+                return entry
+            self._stale = max(0, self._stale - 1)
+        return None
+
+    def _fire(self, entry: Tuple[float, int, int, str, int]) -> None:
+        _, _, booking_id, stage, token = entry
+        if stage == ESCALATE:
+            self._escalate(booking_id, token)
+            return
+
+        try:
+            driver_id = self.dispatcher(booking_id)
+        except ValueError:
+            self.cancel(booking_id)
+            return
+        except Exception:
+            logger.exception("Dispatch of booking %s failed", booking_id)
+            driver_id = None
+
+        # DriverAssigned normally cancels the job already; this covers
+        # dispatchers that do not publish it
+        if driver_id is not None:
+            self.cancel(booking_id)
+            return
+
+        with self._cond:
+            job = self._jobs.get(booking_id)
+            if job is None or job.token != token:
+                return
+            retry_at = self._clock() + self.retry_seconds
+            if retry_at < job.pickup_at:
+                self._push(retry_at, job, DISPATCH)
+            else:
+                # nothing more to try; stays listed if it was escalated
+                del self._jobs[booking_id]
+                self._stale += 1
+
+    def _escalate(self, booking_id: int, token: int) -> None:
+        with self._cond:
+            job = self._jobs.get(booking_id)
+            if job is None or job.token != token:
+                return
+            self._escalated[booking_id] = self._clock()
+            pickup = datetime.fromtimestamp(job.pickup_at)
+        logger.warning("Booking %s (pickup %s) is still unassigned", booking_id, pickup)
+        self.event_bus.publish(BookingEscalated(booking_id=booking_id, pickup_datetime=pickup))
+
+    # ---- background thread ---------------------------------------------------
+
+    def start(self) -> "RideScheduler":
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="ride-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        for subscription in self._subscriptions:
+            subscription.unsubscribe()
+        self._subscriptions = []
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        try:
+            self.load()
+        except Exception:
+            logger.exception("Could not load scheduled bookings")
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                entry = self._pop_due(self._clock())
+                if entry is None:
+                    # wake for the next timer, or earlier if schedule() adds one
+                    timeout = self._heap[0][0] - self._clock() if self._heap else None
+                    self._cond.wait(timeout)
+                    continue
+            try:
+                self._fire(entry)
+            except Exception:
+                logger.exception("Scheduled %s for booking %s failed", entry[3], entry[2])
@@ -0,0 +1,201 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from services.user_services import UserService
+
+
+class Session:
+    def __init__(self, session_id: str, user: Dict[str, Any], expires_at: float):
+        self.session_id = session_id
+        self.user = user
+        self.expires_at = expires_at
+
+
+class SessionStore:
+    """
+    In-memory session table keyed by signed tokens.
+
+    A token is "<session id>.<HMAC-SHA256 of the id>". validate() checks
+    the signature, does one dict lookup and compares the expiry: no
+    database round-trip. Sessions live for `ttl_seconds`; beyond
+    `max_sessions` the least recently used one is evicted.
+
+    With `persist_path` sessions are also written to a SQLite file and
+    reloaded at start-up, so API restarts do not log everybody out. User
+    values that are not JSON types (dates, decimals) come back as strings.
+    """
+
+    def __init__(
+        self,
+        secret: Optional[bytes] = None,
+        ttl_seconds: int = 3600,
+        max_sessions: int = 100_000,
+        persist_path: Optional[str] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._issued = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if persist_path:
+            self._db = sqlite3.connect(persist_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " session_id TEXT PRIMARY KEY, user_json TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE TABLE IF NOT EXISTS session_meta (key TEXT PRIMARY KEY, value BLOB)")
+            self._db.commit()
+            secret = secret or self._stored_secret()
+            self._load()
+
+        self._secret = secret or secrets.token_bytes(32)
+
+    # ---- tokens ----------------------------------------------------------
+
+    def _sign(self, session_id: str) -> str:
+        digest = hmac.new(self._secret, session_id.encode("utf-8"), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+    def issue(self, user: Dict[str, Any]) -> str:
+        """
+        Create a session for `user` and return its token.
+        """
+        session_id = secrets.token_urlsafe(24)
+        session = Session(session_id, user, time.time() + self.ttl_seconds)
+
+        with self._lock:
+            self._sessions[session_id] = session
+            evicted = []
+            while len(self._sessions) > self.max_sessions:
+                evicted.append(self._sessions.popitem(last=False)[0])
+
+            self._issued += 1
+            if self._issued % 1000 == 0:
+                evicted.extend(self._drop_expired())
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT INTO sessions (session_id, user_json, expires_at) VALUES (?, ?, ?)",
+                    (session_id, json.dumps(user, default=str), session.expires_at),
+                )
+                self._forget(evicted)
+                self._db.commit()
+
+        return f"{session_id}.{self._sign(session_id)}"
+
+    def validate(self, token: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        User dict for a valid, unexpired token; otherwise None.
+        """
+        if not token:
+            return None
+        session_id, _, signature = token.partition(".")
+        if not signature or not hmac.compare_digest(signature, self._sign(session_id)):
+            return None
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if session.expires_at < time.time():
+            self.revoke(token)
+            return None
+
+        try:
+            self._sessions.move_to_end(session_id)
+        except KeyError:
+            # evicted by another thread in the meantime
+            pass
+        return session.user
+
+    def revoke(self, token: str) -> None:
+        session_id = token.partition(".")[0]
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            if self._db is not None:
+                self._forget([session_id])
+                self._db.commit()
+
+    def purge_expired(self) -> int:
+        """
+        Drop every expired session; returns how many were removed.
+        """
+        with self._lock:
+            expired = self._drop_expired()
+            if self._db is not None:
+                self._forget(expired)
+                self._db.commit()
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # ---- internals (callers hold self._lock) -----------------------------
+
+    def _drop_expired(self):
+        now = time.time()
+        expired = [sid for sid, s in self._sessions.items() if s.expires_at < now]
+        for sid in expired:
+            del self._sessions[sid]
+        return expired
+
+    def _forget(self, session_ids) -> None:
+        if session_ids:
+            self._db.executemany("DELETE FROM sessions WHERE session_id = ?", [(sid,) for sid in session_ids])
+
+    def _stored_secret(self) -> bytes:
+        row = self._db.execute("SELECT value FROM session_meta WHERE key = 'secret'").fetchone()
+        if row:
+            return bytes(row[0])
+        secret = secrets.token_bytes(32)
+        self._db.execute("INSERT INTO session_meta (key, value) VALUES ('secret', ?)", (secret,))
+        self._db.commit()
+        return secret
+
+    def _load(self) -> None:
+        now = time.time()
+        self._db.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+        self._db.commit()
+        rows = self._db.execute(
+            "SELECT session_id, user_json, expires_at FROM sessions ORDER BY expires_at"
+        ).fetchall()
+        for session_id, user_json, expires_at in rows[-self.max_sessions:]:
+            self._sessions[session_id] = Session(session_id, json.loads(user_json), expires_at)
+
+
+class SessionService:
+    """
+    Password login once, then token checks for every later request.
+    """
+
+    def __init__(self, user_service: UserService, store: SessionStore):
+        self.user_service = user_service
+        self.store = store
+
+    def login(
+        self, username: str, password: str, client_ip: Optional[str] = None
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Returns (token, user) on success, None on bad credentials.
+        May raise LoginRateLimited.
+        """
+        user = self.user_service.login(username, password, client_ip)
+        if not user:
+            return None
+        public_user = {k: v for k, v in user.items() if k != "password_hash"}
+        return self.store.issue(public_user), public_user
+
+    def authenticate(self, token: Optional[str]) -> Optional[Dict[str, Any]]:
+        return self.store.validate(token)
+
+    def logout(self, token: str) -> None:
+        self.store.revoke(token)
@@ -0,0 +1,266 @@
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from config.settings import SURGE_PRICING
+from services.event_bus import (
+    EventBus,
+    BookingCreated,
+    DriverStatusChanged,
+    RideCompleted,
+    Subscription,
+)
+from services.fare_engine import Tariff
+
+
+logger = logging.getLogger(__name__)
+
+
+class SlidingWindowCounter:
+    """
+    Events per slot (zone) over the last `window_seconds`, kept in a ring
+    of `bucket_seconds` buckets. add() is O(1); totals() is
+    O(buckets * slots) and meant for the periodic recompute.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        window_seconds: float,
+        bucket_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if bucket_seconds <= 0 or window_seconds < bucket_seconds:
+            raise ValueError("Need 0 < bucket_seconds <= window_seconds.")
+        self.slots = slots
+        self.bucket_seconds = bucket_seconds
+        self._buckets = math.ceil(window_seconds / bucket_seconds)
+        self._counts = [[0] * slots for _ in range(self._buckets)]
+        # which bucket number (time // bucket_seconds) each ring entry holds
+        self._epochs = [-1] * self._buckets
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def add(self, slot: int, n: int = 1) -> None:
+        epoch = int(self._clock() // self.bucket_seconds)
+        i = epoch % self._buckets
+        with self._lock:
+            if self._epochs[i] != epoch:
+                self._counts[i] = [0] * self.slots
+                self._epochs[i] = epoch
+            self._counts[i][slot] += n
+
+    def totals(self) -> List[int]:
+        oldest = int(self._clock() // self.bucket_seconds) - self._buckets + 1
+        totals = [0] * self.slots
+        with self._lock:
+            for epoch, counts in zip(self._epochs, self._counts):
+                if epoch >= oldest:
+                    for slot, n in enumerate(counts):
+                        totals[slot] += n
+        return totals
+
+
+class SupplyGauge:
+    """
+    Available drivers per zone. A driver's zone is where their last
+    completed ride ended, or their address until they have one.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self._zone: Dict[int, int] = {}
+        self._available: Dict[int, bool] = {}
+        self._counts = [0] * slots
+        self._lock = threading.Lock()
+
+    def load(self, drivers: Iterable[Dict[str, Any]], zone_of: Callable[[Optional[str]], int]) -> None:
+        """
+        Replace the state with `drivers` (id, status, address, last_dropoff).
+        """
+        zone, available, counts = {}, {}, [0] * self.slots
+        for row in drivers:
+            driver_id = row["id"]
+            zone[driver_id] = zone_of(row.get("last_dropoff") or row.get("address"))
+            available[driver_id] = row["status"] == "available"
+            if available[driver_id]:
+                counts[zone[driver_id]] += 1
+        with self._lock:
+            self._zone, self._available, self._counts = zone, available, counts
+
+    def set_status(self, driver_id: int, status: str, default_zone: int) -> None:
+        with self._lock:
+            zone = self._zone.setdefault(driver_id, default_zone)
+            was = self._available.get(driver_id, False)
+            now = status == "available"
+            self._available[driver_id] = now
+            self._counts[zone] += now - was
+
+    def move(self, driver_id: int, zone: int) -> None:
+        with self._lock:
+            old = self._zone.get(driver_id)
+            self._zone[driver_id] = zone
+            if old is not None and self._available.get(driver_id):
+                self._counts[old] -= 1
+                self._counts[zone] += 1
+
+    def counts(self) -> List[int]:
+        with self._lock:
+            return list(self._counts)
+
+
+class SurgePricing:
+    """
+    Per-zone surge multipliers from live demand and supply.
+
+    Demand is the number of bookings created per pickup zone within the
+    sliding window; supply is the number of available drivers per zone.
+    Both are kept up to date from the event bus (BookingCreated,
+    DriverStatusChanged, RideCompleted). A background thread recomputes
+    every `recompute_seconds` and swaps in a new list of multipliers, so
+    multiplier_for() is one dict lookup and one list index, without a lock.
+
+    With pressure = demand / max(supply, 1), a zone surges once pressure
+    exceeds `threshold`:
+        1 + sensitivity * (pressure - threshold), capped at max_multiplier
+    and rounded down to `step` so the price does not jitter.
+    Every `resync_seconds` the driver positions are reloaded from the
+    database to pick up new drivers and changes made by other processes.
+    """
+
+    def __init__(
+        self,
+        tariff: Tariff,
+        driver_loader: Callable[[], List[Dict[str, Any]]],
+        window_seconds: float = 600,
+        bucket_seconds: float = 10,
+        recompute_seconds: float = 5,
+        resync_seconds: float = 300,
+        threshold: float = 1.0,
+        sensitivity: float = 0.5,
+        max_multiplier: float = 2.5,
+        step: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.tariff = tariff
+        self.recompute_seconds = recompute_seconds
+        self.resync_seconds = resync_seconds
+        self.threshold = threshold
+        self.sensitivity = sensitivity
+        self.max_multiplier = max_multiplier
+        self.step = step
+        self._clock = clock
+        self._loader = driver_loader
+
+        slots = tariff.unknown_zone + 1
+        self.demand = SlidingWindowCounter(slots, window_seconds, bucket_seconds, clock)
+        self.supply = SupplyGauge(slots)
+        self._multipliers: List[float] = [1.0] * slots
+        self._subscriptions: List[Subscription] = []
+        self._synced_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_settings(
+        cls,
+        tariff: Tariff,
+        driver_loader: Callable[[], List[Dict[str, Any]]],
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> "SurgePricing":
+        settings = dict(settings if settings is not None else SURGE_PRICING)
+        settings.pop("enabled", None)
+        return cls(tariff, driver_loader, **settings)
+
+    # ---- reads -------------------------------------------------------------
+
+    def multiplier_for(self, location: str) -> float:
+        return self._multipliers[self.tariff.zone_index(location)]
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Current multiplier, demand and supply per zone ("other" for places
+        outside the zone table).
+        """
+        multipliers = self._multipliers
+        demand = self.demand.totals()
+        supply = self.supply.counts()
+        return {
+            (self.tariff.zone_name(i) or "other"): {
+                "multiplier": multipliers[i],
+                "demand": demand[i],
+                "available_drivers": supply[i],
+            }
+            for i in range(len(multipliers))
+        }
+
+    # ---- updates -----------------------------------------------------------
+
+    def attach(self, event_bus: EventBus) -> "SurgePricing":
+        """
+        Follow bookings and driver status changes published on `event_bus`.
+        """
+        self._subscriptions = [
+            event_bus.subscribe(BookingCreated, self._on_booking_created),
+            event_bus.subscribe(DriverStatusChanged, self._on_driver_status),
+            event_bus.subscribe(RideCompleted, self._on_ride_completed),
+        ]
+        return self
+
+    def _on_booking_created(self, event: BookingCreated) -> None:
+        self.demand.add(self.tariff.zone_index(event.pickup_location))
+
+    def _on_driver_status(self, event: DriverStatusChanged) -> None:
+        self.supply.set_status(event.driver_id, event.status, self.tariff.unknown_zone)
+
+    def _on_ride_completed(self, event: RideCompleted) -> None:
+        if event.dropoff_location:
+            self.supply.move(event.driver_id, self.tariff.zone_index(event.dropoff_location))
+
+    def resync(self) -> None:
+        self.supply.load(self._loader(), self.tariff.zone_index)
+        self._synced_at = self._clock()
+
+    def recompute(self) -> List[float]:
+        demand = self.demand.totals()
+        supply = self.supply.counts()
+        multipliers = []
+        for wanted, available in zip(demand, supply):
+            pressure = wanted / max(available, 1)
+            multiplier = 1.0
+            if pressure > self.threshold:
+                raw = min(self.max_multiplier, 1 + self.sensitivity * (pressure - self.threshold))
+                multiplier = round(math.floor(raw / self.step + 1e-9) * self.step, 2)
+            multipliers.append(multiplier)
+        self._multipliers = multipliers
+        return multipliers
+
+    # ---- background thread -----------------------------------------------
+
+    def start(self) -> "SurgePricing":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="surge-pricing", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        for subscription in self._subscriptions:
+            subscription.unsubscribe()
+        self._subscriptions = []
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._synced_at is None or self._clock() - self._synced_at >= self.resync_seconds:
+                    self.resync()
+                self.recompute()
+            except Exception:
+                logger.exception("Surge recompute failed")
+            self._stop.wait(self.recompute_seconds)
@@ -0,0 +1,452 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.settings import DRIVER_SCHEDULE, TRIP_PLANNER
+from services.fare_engine import Tariff
+
+
+# booking id, pickup zone, dropoff zone, pickup time, trip length (both in
+# minutes since the epoch / minutes); plain tuples so they pickle cheaply
+Stop = Tuple[int, int, int, float, float]
+
+
+class _Route:
+    __slots__ = ("driver_id", "start_zone", "ready_at", "stops", "inserted")
+
+    def __init__(self, driver_id: int, start_zone: int, ready_at: float, stops: List[Stop]):
+        self.driver_id = driver_id
+        self.start_zone = start_zone
+        self.ready_at = ready_at
+        self.stops = stops
+        self.inserted: List[int] = []
+
+
+class _Costs:
+    """
+    The zone distance table plus the timing rules, shipped to the worker
+    processes with every chunk.
+    """
+
+    def __init__(
+        self,
+        tariff: Tariff,
+        turnaround_minutes: float,
+        pickup_slack_minutes: float,
+        max_deadhead_km: Optional[float],
+    ):
+        self.distance = tariff.distance_matrix
+        self.minutes_per_km = 60 / tariff.average_speed_kmh
+        self.turnaround = turnaround_minutes
+        self.slack = pickup_slack_minutes
+        self.max_deadhead = max_deadhead_km
+
+    def trip_minutes(self, pickup_zone: int, dropoff_zone: int) -> float:
+        return self.distance[pickup_zone][dropoff_zone] * self.minutes_per_km
+
+    def deadhead(self, start_zone: int, ready_at: float, stops: Sequence[Stop]) -> Optional[float]:
+        """
+        Empty kilometres driven to serve `stops` in this order, or None if
+        some pickup would be more than `slack` minutes late.
+        """
+        zone, now, total = start_zone, ready_at, 0.0
+        for _, pickup_zone, dropoff_zone, pickup_at, trip in stops:
+            km = self.distance[zone][pickup_zone]
+            now += km * self.minutes_per_km
+            if now > pickup_at + self.slack:
+                return None
+            now = max(now, pickup_at) + trip + self.turnaround
+            total += km
+            zone = dropoff_zone
+        return total
+
+
+def _two_opt(costs: _Costs, route: _Route, max_passes: int = 10) -> None:
+    """
+    Reverse segments of the route while that shortens the deadhead and
+    keeps every pickup on time. Only pays off when pickups are close
+    enough together for the slack to allow reordering.
+    """
+    stops = route.stops
+    best = costs.deadhead(route.start_zone, route.ready_at, stops)
+    if best is None:
+        return
+    for _ in range(max_passes):
+        improved = False
+        for i in range(len(stops) - 1):
+            for j in range(i + 1, len(stops)):
+                # the later pickup cannot move ahead by more than the slack
+                if stops[j][3] - stops[i][3] > costs.slack:
+                    break
+                candidate = stops[:i] + stops[i:j + 1][::-1] + stops[j + 1:]
+                km = costs.deadhead(route.start_zone, route.ready_at, candidate)
+                if km is not None and km < best - 1e-9:
+                    stops, best, improved = candidate, km, True
+        if not improved:
+            break
+    route.stops = stops
+
+
+def _order_chunk(costs: _Costs, routes: List[_Route], two_opt: bool) -> List[_Route]:
+    for route in routes:
+        route.stops.sort(key=lambda stop: (stop[3], stop[0]))
+        if two_opt:
+            _two_opt(costs, route)
+    return routes
+
+
+def _best_insertions(
+    costs: _Costs, route: _Route, candidates: Sequence[Stop]
+) -> List[Tuple[float, int, int]]:
+    """
+    (added km, candidate index, position) of the cheapest feasible place
+    in `route` for each candidate that fits at all.
+
+    For every position the time the driver is free there (going forward)
+    and the latest arrival that keeps the rest of the route on time
+    (going backward) are worked out once, so each try is O(1).
+    """
+    stops = route.stops
+    distance, per_km, turnaround, slack = costs.distance, costs.minutes_per_km, costs.turnaround, costs.slack
+
+    # free_at[p], zone_at[p]: when and where the driver is free before stops[p]
+    free_at, zone_at = [route.ready_at], [route.start_zone]
+    for _, pickup_zone, dropoff_zone, pickup_at, trip in stops:
+        arrive = free_at[-1] + distance[zone_at[-1]][pickup_zone] * per_km
+        if arrive > pickup_at + slack:
+            return []
+        free_at.append(max(arrive, pickup_at) + trip + turnaround)
+        zone_at.append(dropoff_zone)
+    # latest[p]: latest arrival at stops[p]'s pickup that keeps stops[p:] on time
+    latest = [0.0] * len(stops)
+    for p in range(len(stops) - 1, -1, -1):
+        _, _, dropoff_zone, pickup_at, trip = stops[p]
+        latest[p] = pickup_at + slack
+        if p + 1 < len(stops):
+            leave_by = latest[p + 1] - distance[dropoff_zone][stops[p + 1][1]] * per_km - trip - turnaround
+            latest[p] = min(latest[p], leave_by)
+
+    options = []
+    for c, (_, new_pickup, new_dropoff, new_at, new_trip) in enumerate(candidates):
+        best_km, best_position = None, None
+        for position in range(len(stops) + 1):
+            # stops are in pickup order (give or take the slack), so only a
+            # few positions around the new pickup time can work
+            if position > 0 and stops[position - 1][3] > new_at + slack:
+                break
+            if position < len(stops) and stops[position][3] + slack < new_at:
+                continue
+            previous = zone_at[position]
+            approach = distance[previous][new_pickup]
+            if costs.max_deadhead is not None and approach > costs.max_deadhead:
+                continue
+            arrive = free_at[position] + approach * per_km
+            if arrive > new_at + slack:
+                continue
+            added = approach
+            if position < len(stops):
+                following = stops[position][1]
+                added += distance[new_dropoff][following] - distance[previous][following]
+                done = max(arrive, new_at) + new_trip + turnaround
+                if done + distance[new_dropoff][following] * per_km > latest[position]:
+                    continue
+            if best_km is None or added < best_km:
+                best_km, best_position = added, position
+        if best_km is not None:
+            options.append((best_km, c, best_position))
+    return options
+
+
+def _insertion_chunk(
+    costs: _Costs, routes: List[_Route], candidates: Sequence[Stop]
+) -> List[List[Tuple[float, int, int]]]:
+    return [_best_insertions(costs, route, candidates) for route in routes]
+
+
+class PlannedRoute:
+    """
+    A driver's rides in the suggested order. `inserted` are the unassigned
+    bookings suggested for this driver; `feasible` is False when the
+    assigned rides alone already cannot all be reached on time.
+    """
+
+    def __init__(
+        self,
+        driver_id: int,
+        booking_ids: List[int],
+        deadhead_km: Optional[float],
+        inserted: List[int],
+    ):
+        self.driver_id = driver_id
+        self.booking_ids = booking_ids
+        self.deadhead_km = deadhead_km
+        self.inserted = inserted
+        self.feasible = deadhead_km is not None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "driver_id": self.driver_id,
+            "booking_ids": self.booking_ids,
+            "deadhead_km": None if self.deadhead_km is None else round(self.deadhead_km, 2),
+            "inserted": self.inserted,
+            "feasible": self.feasible,
+        }
+
+
+class TripPlan:
+    def __init__(self, routes: Dict[int, PlannedRoute], unplaced: List[int]):
+        self.routes = routes
+        self.unplaced = unplaced
+
+    def suggestions(self) -> List[Tuple[int, int]]:
+        """
+        (booking id, driver id) for every suggested assignment.
+        """
+        return sorted(
+            (booking_id, route.driver_id)
+            for route in self.routes.values()
+            for booking_id in route.inserted
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "routes": [self.routes[d].as_dict() for d in sorted(self.routes)],
+            "suggestions": [{"booking_id": b, "driver_id": d} for b, d in self.suggestions()],
+            "unplaced": self.unplaced,
+        }
+
+
+class TripPlanner:
+    """
+    Orders each driver's queue of assigned rides and suggests which driver
+    should take each unassigned booking.
+
+    Distances come from the tariff's zone table and driving time from its
+    average speed. A pickup may be at most `pickup_slack_minutes` late
+    and every ride is followed by `turnaround_minutes`, as in the driver
+    schedule.
+
+    Queues are sorted by pickup time and, with `two_opt`, improved by
+    segment reversals. Unassigned bookings are then placed by cheapest
+    insertion (least extra deadhead), in rounds: every driver whose route
+    changed prices all open bookings, and the cheapest (booking, driver)
+    pairs are taken, at most one per driver and round. Pricing is done in
+    a process pool once there are `parallel_min_drivers` drivers.
+    """
+
+    def __init__(
+        self,
+        tariff: Optional[Tariff] = None,
+        turnaround_minutes: float = 10,
+        pickup_slack_minutes: float = 10,
+        max_deadhead_km: Optional[float] = 15,
+        two_opt: bool = True,
+        workers: Optional[int] = None,
+        parallel_min_drivers: int = 200,
+        chunk_size: int = 100,
+    ):
+        self.tariff = tariff or Tariff.from_settings()
+        self.two_opt = two_opt
+        self.workers = workers
+        self.parallel_min_drivers = parallel_min_drivers
+        self.chunk_size = chunk_size
+        self._costs = _Costs(self.tariff, turnaround_minutes, pickup_slack_minutes, max_deadhead_km)
+
+    @classmethod
+    def from_settings(
+        cls,
+        tariff: Optional[Tariff] = None,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> "TripPlanner":
+        settings = dict(settings if settings is not None else TRIP_PLANNER)
+        settings.setdefault("turnaround_minutes", DRIVER_SCHEDULE["turnaround_minutes"])
+        return cls(tariff, **settings)
+
+    def _stop(self, booking: Dict[str, Any]) -> Stop:
+        pickup_zone = self.tariff.zone_index(booking["pickup_location"])
+        dropoff_zone = self.tariff.zone_index(booking["dropoff_location"])
+        return (
+            booking["id"],
+            pickup_zone,
+            dropoff_zone,
+            booking["pickup_datetime"].timestamp() / 60,
+            self._costs.trip_minutes(pickup_zone, dropoff_zone),
+        )
+
+    def _route(
+        self,
+        driver_id: int,
+        bookings: Sequence[Dict[str, Any]],
+        start_location: Optional[str],
+        now: datetime,
+    ) -> _Route:
+        """
+        An ongoing ride fixes where and when the driver is next free;
+        assigned rides from now on are the ones to plan.
+        """
+        start_zone = self.tariff.zone_index(start_location)
+        ready_at = now.timestamp() / 60
+        stops = []
+        for booking in bookings:
+            stop = self._stop(booking)
+            if booking["status"] == "ongoing":
+                start_zone = stop[2]
+                ready_at = max(ready_at, stop[3] + stop[4]) + self._costs.turnaround
+            elif booking["status"] == "assigned" and booking["pickup_datetime"] >= now:
+                stops.append(stop)
+        return _Route(driver_id, start_zone, ready_at, stops)
+
+    def plan_driver(
+        self,
+        driver_id: int,
+        bookings: Sequence[Dict[str, Any]],
+        start_location: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> PlannedRoute:
+        """
+        Order one driver's queue (rows as from BookingDAL.list_by_driver).
+        """
+        route = self._route(driver_id, bookings, start_location, now or datetime.now())
+        _order_chunk(self._costs, [route], self.two_opt)
+        return self._planned(route)
+
+    def plan(
+        self,
+        queues: Dict[int, Sequence[Dict[str, Any]]],
+        unassigned: Sequence[Dict[str, Any]],
+        start_locations: Optional[Dict[int, Optional[str]]] = None,
+        now: Optional[datetime] = None,
+    ) -> TripPlan:
+        """
+        Plan every driver in `queues` (driver id -> their bookings; an
+        empty list for a free driver) and place the `unassigned` bookings.
+        `start_locations` is where each driver is now.
+        """
+        now = now or datetime.now()
+        start_locations = start_locations or {}
+        routes = [
+            self._route(driver_id, bookings, start_locations.get(driver_id), now)
+            for driver_id, bookings in queues.items()
+        ]
+        candidates = [self._stop(b) for b in unassigned if b["pickup_datetime"] >= now]
+
+        pool = None
+        if self.workers != 1 and len(routes) >= self.parallel_min_drivers:
+            pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            routes = self._run(pool, _order_chunk, routes, self.two_opt)
+            by_driver = {route.driver_id: route for route in routes}
+            unplaced = self._insert(pool, by_driver, candidates)
+            changed = [route for route in routes if route.inserted]
+            if self.two_opt and changed:
+                for route in self._run(pool, _order_chunk, changed, True):
+                    by_driver[route.driver_id] = route
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return TripPlan(
+            {driver_id: self._planned(route) for driver_id, route in by_driver.items()},
+            sorted(unplaced),
+        )
+
+    def _insert(self, pool, routes: Dict[int, _Route], candidates: List[Stop]) -> List[int]:
+        open_ = {stop[0]: stop for stop in candidates}
+        dirty = list(routes)
+        while open_ and dirty:
+            pending = list(open_.values())
+            priced = self._run(pool, _insertion_chunk, [routes[d] for d in dirty], pending)
+            # a driver that takes nothing in a round has lost every option
+            # to cheaper pairs, so only re-priced drivers can take more
+            pairs = sorted(
+                (km, pending[c][0], driver_id, position)
+                for driver_id, found in zip(dirty, priced)
+                for km, c, position in found
+            )
+            taken = set()
+            for km, booking_id, driver_id, position in pairs:
+                if booking_id not in open_ or driver_id in taken:
+                    continue
+                route = routes[driver_id]
+                route.stops.insert(position, open_.pop(booking_id))
+                route.inserted.append(booking_id)
+                taken.add(driver_id)
+            dirty = list(taken)
+        return list(open_)
+
+    def _run(self, pool, func: Callable, routes: List[_Route], arg: Any) -> List[Any]:
+        """
+        func(costs, chunk, arg) over chunks of `routes`, results flattened
+        back into route order.
+        """
+        if pool is None:
+            return func(self._costs, routes, arg)
+        size = self.chunk_size
+        chunks = [routes[i:i + size] for i in range(0, len(routes), size)]
+        futures = [pool.submit(func, self._costs, chunk, arg) for chunk in chunks]
+        return [item for future in futures for item in future.result()]
+
+    def _planned(self, route: _Route) -> PlannedRoute:
+        return PlannedRoute(
+            route.driver_id,
+            [stop[0] for stop in route.stops],
+            self._costs.deadhead(route.start_zone, route.ready_at, route.stops),
+            list(route.inserted),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Command line:
+#   python -m services.trip_planner                  # whole fleet
+#   python -m services.trip_planner --driver 12      # one driver's queue
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    from dataacesslayer.booking_dal import BookingDAL
+    from dataacesslayer.db_connector import Database
+    from dataacesslayer.driver_dal import DriverDAL
+
+    parser = argparse.ArgumentParser(description="Order driver queues and suggest assignments.")
+    parser.add_argument("--driver", type=int, help="only order this driver's queue")
+    parser.add_argument("--no-two-opt", action="store_true", help="keep queues in pickup order")
+    parser.add_argument("--workers", type=int, help="worker processes (1 to plan in-process)")
+    args = parser.parse_args()
+
+    db = Database()
+    db.init_schema()
+    booking_dal = BookingDAL(db)
+    settings = dict(TRIP_PLANNER, two_opt=not args.no_two_opt)
+    if args.workers:
+        settings["workers"] = args.workers
+    planner = TripPlanner.from_settings(settings=settings)
+    positions = {
+        row["id"]: row for row in DriverDAL(db).list_positions() if row["status"] != "inactive"
+    }
+
+    def start_of(row: Dict[str, Any]) -> Optional[str]:
+        return row.get("last_dropoff") or row.get("address")
+
+    if args.driver is not None:
+        row = positions.get(args.driver, {})
+        route = planner.plan_driver(args.driver, booking_dal.list_by_driver(args.driver), start_of(row))
+        print(route.as_dict())
+        return
+
+    queues: Dict[int, List[Dict[str, Any]]] = {driver_id: [] for driver_id in positions}
+    for booking in booking_dal.list_commitments():
+        if booking["driver_id"] in queues:
+            queues[booking["driver_id"]].append(booking)
+    plan = planner.plan(
+        queues,
+        booking_dal.list_unassigned_after(datetime.now()),
+        {driver_id: start_of(row) for driver_id, row in positions.items()},
+    )
+    for booking_id, driver_id in plan.suggestions():
+        print(f"booking {booking_id} -> driver {driver_id}")
+    print(f"{len(plan.suggestions())} suggested, {len(plan.unplaced)} left unassigned")
+
+
+if __name__ == "__main__":
+    main()
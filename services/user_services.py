@@ -1,25 +1,93 @@
+import logging
+import secrets
+import threading
+from concurrent.futures import Future
 from typing import Optional, Dict, Any
-import hashlib
 
 from dataacesslayer.db_connector import Database
 from dataacesslayer.user_dal import UserDAL
 from dataacesslayer.customer_dal import CustomerDAL
 from dataacesslayer.driver_dal import DriverDAL
+from dataacesslayer.base_dal import DuplicateKeyError
+from services.membership import MembershipIndex
+from services.password_hasher import PasswordHasher, get_default_hasher
+from services.rate_limiter import LoginRateLimited, NegativeCache, TokenBucketLimiter
+from config.settings import LOGIN_PROTECTION
+from services.metrics import profiled
 
 
+logger = logging.getLogger(__name__)
+
+
+class PendingLogin:
+    """
+    A login whose password check is running on the hasher pool.
+    Returned by UserService.begin_login(); pass it to finish_login().
+    `user` is None when the login cannot succeed (unknown or inactive).
+    """
+
+    def __init__(self, user: Optional[Dict[str, Any]], password: str, verification: "Future[bool]"):
+        self.user = user
+        self.password = password
+        self.verification = verification
+
+    def done(self) -> bool:
+        return self.verification.done()
+
+
+@profiled
 class UserService:
     """
     Uses DAL classes to communicate to the database.
     """
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, hasher: Optional[PasswordHasher] = None):
         self.db = db
         self.user_dal = UserDAL(db)
         self.customer_dal = CustomerDAL(db)
         self.driver_dal = DriverDAL(db)
+        self.hasher = hasher or get_default_hasher()
+
+        # credential-stuffing protection for login()
+        max_keys = LOGIN_PROTECTION["max_tracked_keys"]
+        self.username_limiter = TokenBucketLimiter(
+            LOGIN_PROTECTION["username_attempts"],
+            LOGIN_PROTECTION["username_refill_per_second"],
+            max_keys,
+        )
+        self.ip_limiter = TokenBucketLimiter(
+            LOGIN_PROTECTION["ip_attempts"],
+            LOGIN_PROTECTION["ip_refill_per_second"],
+            max_keys,
+        )
+        # keyed by username.casefold(), like the username column's collation
+        self.unknown_usernames = NegativeCache(
+            max_keys, LOGIN_PROTECTION["unknown_username_ttl_seconds"]
+        )
+        # checked against on misses, so they cost as much as a wrong password;
+        # made on the hasher pool so start-up does not wait for it
+        self._dummy_hash: "Future[str]" = self.hasher.submit_hash(secrets.token_urlsafe(16))
+        # one upgraded hash written at a time, so the hasher threads need
+        # a single pooled connection between them
+        self._rehash_lock = threading.Lock()
+
+        # "definitely free" prechecks for registration; loaded on first use
+        self.usernames = MembershipIndex(self.user_dal.list_usernames)
+        self.customer_emails = MembershipIndex(self.customer_dal.list_emails)
+        self.driver_emails = MembershipIndex(self.driver_dal.list_emails)
 
     def _hash_password(self, plain_password: str) -> str:
-        return hashlib.sha256(plain_password.encode("utf-8")).hexdigest()
+        return self.hasher.hash(plain_password)
+
+    def duplicate_message(self, error: DuplicateKeyError, email_message: str) -> str:
+        """
+        The usual registration message for a UNIQUE violation.
+        """
+        if error.key.endswith("username"):
+            return "Username is already taken."
+        if error.key.endswith("email"):
+            return email_message
+        return str(error)
 
     def register_customer(
         self,
@@ -30,30 +98,37 @@ class UserService:
         username: str,
         password: str,
     ) -> int:
-        existing_customer = self.customer_dal.get_by_email(email)
-        if existing_customer:
-            raise ValueError("A customer with this email already exists.")
+        email_taken = "A customer with this email already exists."
+        if self.customer_emails.might_contain(email) and self.customer_dal.get_by_email(email):
+            raise ValueError(email_taken)
 
-        existing_user = self.user_dal.get_by_username(username)
-        if existing_user:
+        if self.usernames.might_contain(username) and self.user_dal.get_by_username(username):
             raise ValueError("Username is already taken.")
 
-        customer_id = self.customer_dal.create_customer(
-            full_name=full_name,
-            address=address,
-            phone=phone,
-            email=email,
-        )
-
         password_hash = self._hash_password(password)
 
-        user_id = self.user_dal.create_user(
-            username=username,
-            password_hash=password_hash,
-            role="customer",
-            customer_id=customer_id,
-            driver_id=None,
-        )
+        try:
+            with self.db.transaction():
+                customer_id = self.customer_dal.create_customer(
+                    full_name=full_name,
+                    address=address,
+                    phone=phone,
+                    email=email,
+                )
+
+                user_id = self.user_dal.create_user(
+                    username=username,
+                    password_hash=password_hash,
+                    role="customer",
+                    customer_id=customer_id,
+                    driver_id=None,
+                )
+        except DuplicateKeyError as e:
+            raise ValueError(self.duplicate_message(e, email_taken)) from e
+
+        self.customer_emails.add(email)
+        self.usernames.add(username)
+        self.unknown_usernames.discard(username.casefold())
 
         return user_id
 
@@ -71,51 +146,111 @@ class UserService:
         """
         Register a new driver.
         """
-        existing_driver = self.driver_dal.get_by_email(email)
-        if existing_driver:
-            raise ValueError("A driver with this email already exists.")
+        email_taken = "A driver with this email already exists."
+        if self.driver_emails.might_contain(email) and self.driver_dal.get_by_email(email):
+            raise ValueError(email_taken)
 
-        existing_user = self.user_dal.get_by_username(username)
-        if existing_user:
+        if self.usernames.might_contain(username) and self.user_dal.get_by_username(username):
             raise ValueError("Username is already taken.")
 
-        driver_id = self.driver_dal.create_driver(
-            full_name=full_name,
-            address=address,
-            phone=phone,
-            email=email,
-            license_number=license_number,
-            vehicle_number=vehicle_number,
-            status="available",
-        )
-
         password_hash = self._hash_password(password)
 
-        user_id = self.user_dal.create_user(
-            username=username,
-            password_hash=password_hash,
-            role="driver",
-            customer_id=None,
-            driver_id=driver_id,
-        )
+        try:
+            with self.db.transaction():
+                driver_id = self.driver_dal.create_driver(
+                    full_name=full_name,
+                    address=address,
+                    phone=phone,
+                    email=email,
+                    license_number=license_number,
+                    vehicle_number=vehicle_number,
+                    status="available",
+                )
+
+                user_id = self.user_dal.create_user(
+                    username=username,
+                    password_hash=password_hash,
+                    role="driver",
+                    customer_id=None,
+                    driver_id=driver_id,
+                )
+        except DuplicateKeyError as e:
+            raise ValueError(self.duplicate_message(e, email_taken)) from e
+
+        self.driver_emails.add(email)
+        self.usernames.add(username)
+        self.unknown_usernames.discard(username.casefold())
 
         return user_id
 
-    def login(self, username: str, password: str) -> Optional[Dict[str, Any]]:
+    def login(
+        self, username: str, password: str, client_ip: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Validate user credentials.
+        Blocks until the password check is done; see begin_login().
         """
-        user = self.user_dal.get_by_username(username)
-        if not user:
-            return None
+        return self.finish_login(self.begin_login(username, password, client_ip))
 
-        if not user.get("is_active", 1):
-            return None
+    def begin_login(
+        self, username: str, password: str, client_ip: Optional[str] = None
+    ) -> PendingLogin:
+        """
+        Look the user up and start the password check on the hasher pool.
+        Unknown and inactive users get a check against a dummy hash, so a
+        miss takes as long as a wrong password; finish_login() then
+        returns None.
+
+        The Tk UI polls PendingLogin.done() with after() and then calls
+        finish_login(), so the window never freezes during the KDF.
+
+        Raises LoginRateLimited when the username (or client_ip) is out of
+        attempts. Usernames that recently did not exist are rejected from
+        memory without a DB round-trip.
+        """
+        self._check_rate_limits(username, client_ip)
+
+        key = username.casefold()
+        user = None
+        if key not in self.unknown_usernames:
+            user = self.user_dal.get_by_username(username)
+            if not user:
+                self.unknown_usernames.add(key)
+
+        if not user or not user.get("is_active", 1):
+            verification = self.hasher.submit_verify(password, self._dummy_hash.result())
+            return PendingLogin(None, password, verification)
+
+        verification = self.hasher.submit_verify(password, user["password_hash"])
+        return PendingLogin(user, password, verification)
+
+    def _check_rate_limits(self, username: str, client_ip: Optional[str]) -> None:
+        if client_ip is not None:
+            retry_after = self.ip_limiter.acquire(client_ip)
+            if retry_after is not None:
+                raise LoginRateLimited(retry_after)
+        retry_after = self.username_limiter.acquire(username.casefold())
+        if retry_after is not None:
+            raise LoginRateLimited(retry_after)
 
-        input_hash = self._hash_password(password)
-        if input_hash != user["password_hash"]:
+    def finish_login(self, pending: PendingLogin) -> Optional[Dict[str, Any]]:
+        """
+        Complete a login started by begin_login(): upgrade an outdated
+        password hash and merge in the customer/driver profile.
+
+        The upgrade is hashed and stored on the hasher pool; the user is
+        returned without waiting for it.
+        """
+        if not pending.verification.result() or pending.user is None:
             return None
 
+        user = pending.user
+        if self.hasher.needs_rehash(user["password_hash"]):
+            user_id = user["id"]
+            self.hasher.submit_hash(pending.password).add_done_callback(
+                lambda future: self._store_rehash(user_id, future)
+            )
+
         role = user.get("role")
         
         if role == "customer" and user.get("customer_id"):
@@ -134,3 +269,14 @@ class UserService:
                 user["user_id"] = original_user_id
 
         return user
+
+    def _store_rehash(self, user_id: int, future: "Future[str]") -> None:
+        try:
+            new_hash = future.result()
+            with self._rehash_lock:
+                try:
+                    self.user_dal.update_password(user_id, new_hash)
+                finally:
+                    self.db.release_connection()
+        except Exception:
+            logger.exception("Could not store the upgraded password hash for user %s", user_id)
@@ -4,6 +4,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
+from services.metrics import metrics
+from ui.profiler import profiled_view, ui_profiler
+
 
 class AdminDashboard(tk.Frame):
 
@@ -77,6 +80,7 @@ class AdminDashboard(tk.Frame):
             ("🚗 Assign Drivers", self._show_assign_driver),
             ("👥 Manage Drivers", self._show_manage_drivers),
             ("👤 Manage Customers", self._show_manage_customers),
+            ("📈 Service Metrics", self._show_service_metrics),
         ]
 
         for text, command in menu_items:
@@ -201,6 +205,7 @@ class AdminDashboard(tk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load overview: {e}")
 
+    @profiled_view
     def _show_all_bookings(self):
         """Show all bookings"""
         for widget in self.content_area.winfo_children():
@@ -219,7 +224,8 @@ class AdminDashboard(tk.Frame):
 
         try:
             booking_service = self.controller.context.booking_service
-            bookings = booking_service.list_all()
+            with ui_profiler.phase("fetch"):
+                bookings = booking_service.list_all()
 
             if not bookings:
                 tk.Label(
@@ -245,21 +251,27 @@ class AdminDashboard(tk.Frame):
                 tree.heading(col, text=col)
                 tree.column(col, width=90)
 
-            for booking in bookings:
-                values = (
-                    booking['id'],
-                    booking.get('customer_name', 'N/A'),
-                    booking['pickup_location'],
-                    booking['dropoff_location'],
-                    booking['pickup_date'],
-                    booking['pickup_time'],
-                    booking.get('driver_name', 'Unassigned'),
-                    booking['status']
-                )
-                tree.insert("", "end", values=values)
-
-            tree.pack(side="left", fill="both", expand=True)
-            scrollbar.pack(side="right", fill="y")
+            with ui_profiler.phase("transform"):
+                rows = [
+                    (
+                        booking['id'],
+                        booking.get('customer_name', 'N/A'),
+                        booking['pickup_location'],
+                        booking['dropoff_location'],
+                        booking['pickup_date'],
+                        booking['pickup_time'],
+                        booking.get('driver_name', 'Unassigned'),
+                        booking['status']
+                    )
+                    for booking in bookings
+                ]
+
+            with ui_profiler.phase("render"):
+                for values in rows:
+                    tree.insert("", "end", values=values)
+
+                tree.pack(side="left", fill="both", expand=True)
+                scrollbar.pack(side="right", fill="y")
 
             # Action button
             tk.Button(
@@ -513,6 +525,68 @@ class AdminDashboard(tk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load customers: {e}")
 
+    def _show_service_metrics(self):
+        """Live per-method call counts and latencies for this process"""
+        for widget in self.content_area.winfo_children():
+            widget.destroy()
+
+        metrics_frame = tk.Frame(self.content_area, bg="white")
+        metrics_frame.pack(fill="both", expand=True, padx=40, pady=30)
+
+        tk.Label(
+            metrics_frame,
+            text="Service Metrics",
+            font=("Segoe UI", 18, "bold"),
+            bg="white",
+            fg="#1f2937"
+        ).pack(anchor="w", pady=(0, 5))
+
+        tk.Label(
+            metrics_frame,
+            text="Slowest total time first. Refreshes every 2 seconds.",
+            font=("Segoe UI", 10),
+            bg="white",
+            fg="#6b7280"
+        ).pack(anchor="w", pady=(0, 15))
+
+        table_frame = tk.Frame(metrics_frame, bg="white")
+        table_frame.pack(fill="both", expand=True)
+
+        columns = ("Method", "Calls", "Errors", "Total s", "p50 ms", "p95 ms", "p99 ms", "Max ms")
+        tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=18)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=260 if col == "Method" else 80, anchor="w" if col == "Method" else "e")
+
+        tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        self._refresh_service_metrics(tree)
+
+    def _refresh_service_metrics(self, tree):
+        # stop once another panel has replaced the table
+        if not tree.winfo_exists():
+            return
+
+        tree.delete(*tree.get_children())
+        for row in metrics.snapshot():
+            tree.insert("", "end", values=(
+                row["method"],
+                row["calls"],
+                row["errors"],
+                f"{row['total_seconds']:.2f}",
+                f"{row['p50_ms']:.2f}",
+                f"{row['p95_ms']:.2f}",
+                f"{row['p99_ms']:.2f}",
+                f"{row['max_ms']:.2f}",
+            ))
+
+        self.after(2000, lambda: self._refresh_service_metrics(tree))
+
     def _logout(self):
         """Logout user"""
         if messagebox.askyesno("Confirm Logout", "Are you sure you want to logout?"):
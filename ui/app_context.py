@@ -1,8 +1,24 @@
+import threading
+from functools import cached_property
+from typing import Callable, Optional, TypeVar
+
 from dataacesslayer.db_connector import Database
 from services.user_services import UserService
 from services.booking_service import BookingService
 from services.driver_service import DriverService
 from services.customer_service import CustomerService
+from services.event_bus import EventBus
+from services.session_service import SessionService, SessionStore
+from services.fare_engine import FareEngine
+from services.locations import LocationService
+from services.surge_pricing import SurgePricing
+from services.ride_scheduler import RideScheduler
+from dataacesslayer.booking_dal import BookingDAL
+from dataacesslayer.driver_dal import DriverDAL
+from config.settings import SESSION_SETTINGS, SURGE_PRICING, RIDE_SCHEDULER
+
+
+T = TypeVar("T")
 
 
 class AppContext:
@@ -10,13 +26,157 @@ class AppContext:
     Holds shared objects for the whole application:
     - Database
     - Services (UserService, BookingService, etc.)
+    - EventBus the services publish booking/driver state changes on
+
+    Imports no Tk, so headless entry points (run_api.py) share it.
+    Pass `pool_size` when services are called from several threads.
+
+    Nothing touches MySQL until it is needed: the Database (and the schema
+    check) is created on first use of `db`, and each service on first
+    access. start_background_init() does that work on a thread so the
+    first window can appear immediately.
+
+    start_background_services() starts the daemon threads (surge pricing,
+    ride scheduler), and UserService stores upgraded password hashes from
+    the hasher pool. None of these may share a connection with the
+    caller's threads, so the Database is always pooled, with one extra
+    connection for each of them, and each hands its connection back
+    after every pass.
     """
 
-    def __init__(self):
-        self.db = Database()
-        self.db.init_schema()
+    def __init__(self, pool_size: Optional[int] = None, background_init: bool = False):
+        self.pool_size = pool_size
+        self.event_bus = EventBus()
+
+        self._db: Optional[Database] = None
+        self._db_lock = threading.Lock()
+        self.ready = threading.Event()
+        self.init_error: Optional[Exception] = None
+
+        if background_init:
+            self.start_background_init()
+
+    @property
+    def db(self) -> Database:
+        """
+        The shared Database; connects and checks the schema on first use.
+        Blocks while a background initialisation is still running.
+        """
+        if self._db is None:
+            with self._db_lock:
+                if self._db is None:
+                    db = Database(pool_size=self._pool_size())
+                    db.init_schema()
+                    self._db = db
+                    self.init_error = None
+                    self.ready.set()
+        return self._db
+
+    def _pool_size(self) -> Optional[int]:
+        """
+        `pool_size` plus a connection per enabled background thread and
+        one for password-hash upgrades.
+        """
+        background = int(SURGE_PRICING["enabled"]) + int(RIDE_SCHEDULER["enabled"]) + 1
+        return (self.pool_size or 1) + background
+
+    def _releasing(self, func: Callable[..., T]) -> Callable[..., T]:
+        """
+        `func`, handing the calling thread's pooled connection back when
+        it returns; for the background threads, so they do not hold a
+        connection between passes.
+        """
+        def call(*args, **kwargs) -> T:
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.db.release_connection()
+        return call
+
+    def start_background_init(self) -> threading.Thread:
+        """
+        Connect and run the schema check on a daemon thread.
+        A failure is kept in `init_error`; the next access to `db`
+        retries and raises it to the caller.
+        """
+        def _init():
+            try:
+                self.db.release_connection()
+                self.start_background_services()
+            except Exception as e:
+                self.init_error = e
+                print(f"Background database initialisation failed: {e}")
+
+        thread = threading.Thread(target=_init, name="app-context-init", daemon=True)
+        thread.start()
+        return thread
+
+    def start_background_services(self) -> None:
+        """
+        Build the booking service (which starts surge pricing) and the
+        ride scheduler, when enabled in config.settings.
+        """
+        self.booking_service
+        self.ride_scheduler
+
+    @cached_property
+    def user_service(self) -> UserService:
+        return UserService(self.db)
+
+    @cached_property
+    def locations(self) -> LocationService:
+        return LocationService.from_settings()
+
+    @cached_property
+    def fare_engine(self) -> FareEngine:
+        return FareEngine(locations=self.locations)
+
+    @cached_property
+    def surge_pricing(self) -> Optional[SurgePricing]:
+        """
+        Live surge multipliers, recomputed on a daemon thread; None when
+        SURGE_PRICING is disabled.
+        """
+        if not SURGE_PRICING["enabled"]:
+            return None
+        surge = SurgePricing.from_settings(
+            self.fare_engine.tariff, self._releasing(DriverDAL(self.db).list_positions)
+        )
+        return surge.attach(self.event_bus).start()
+
+    @cached_property
+    def booking_service(self) -> BookingService:
+        return BookingService(
+            self.db, self.event_bus, self.fare_engine, self.surge_pricing, self.locations
+        )
+
+    @cached_property
+    def ride_scheduler(self) -> Optional[RideScheduler]:
+        """
+        Dispatches and escalates upcoming pending bookings on a daemon
+        thread; None when RIDE_SCHEDULER is disabled.
+        """
+        if not RIDE_SCHEDULER["enabled"]:
+            return None
+        scheduler = RideScheduler.from_settings(
+            self._releasing(self.booking_service.dispatch_booking),
+            self._releasing(BookingDAL(self.db).list_pending_after),
+            self.event_bus,
+        )
+        return scheduler.attach().start()
+
+    @cached_property
+    def driver_service(self) -> DriverService:
+        return DriverService(self.db, self.event_bus)
+
+    @cached_property
+    def customer_service(self) -> CustomerService:
+        return CustomerService(self.db)
 
-        self.user_service = UserService(self.db)
-        self.booking_service = BookingService(self.db)
-        self.driver_service = DriverService(self.db)
-        self.customer_service = CustomerService(self.db)
+    @cached_property
+    def session_service(self) -> SessionService:
+        settings = dict(SESSION_SETTINGS)
+        secret = settings.pop("secret", None)
+        if isinstance(secret, str):
+            secret = secret.encode("utf-8")
+        return SessionService(self.user_service, SessionStore(secret=secret, **settings))
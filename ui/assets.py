@@ -0,0 +1,112 @@
+# ui/assets.py
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from PIL import Image, ImageTk
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+
+LOGIN_IMAGE = ASSETS_DIR / "login_image.jpg"
+REGISTER_IMAGE = ASSETS_DIR / "register_image.jpg"
+
+# (image, size) pairs the login/register side panels ask for
+STARTUP_VARIANTS = (
+    (LOGIN_IMAGE, (350, 500)),
+    (REGISTER_IMAGE, (320, 550)),
+)
+
+Size = Tuple[int, int]
+
+
+class ImageAssetCache:
+    """
+    Decodes each image file once and memoizes resized variants.
+
+    - Sources are kept decoded for the life of the process; a file that is
+      missing or unreadable is remembered as None and not retried.
+    - Resized PIL variants are LRU-bounded by `max_variants`. They can be
+      produced on a background thread (precompute()).
+    - PhotoImages are Tk objects, so get_photo() must be called on the Tk
+      thread; they are cached the same way.
+    """
+
+    def __init__(self, max_variants: int = 32):
+        self.max_variants = max_variants
+        self._sources: Dict[Path, Optional[Image.Image]] = {}
+        self._variants: "OrderedDict[Tuple[Path, Size], Image.Image]" = OrderedDict()
+        self._photos: "OrderedDict[Tuple[Path, Size], ImageTk.PhotoImage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _source(self, path: Path) -> Optional[Image.Image]:
+        if path in self._sources:
+            return self._sources[path]
+        try:
+            with Image.open(path) as img:
+                img.load()
+                source = img.copy()
+        except FileNotFoundError:
+            source = None
+        except (OSError, ValueError) as e:
+            print(f"Could not load image asset '{path}': {e}")
+            source = None
+        self._sources[path] = source
+        return source
+
+    def get_resized(self, path: Path, size: Size) -> Optional[Image.Image]:
+        """
+        PIL image of `path` resized to `size` (LANCZOS), or None if unavailable.
+        """
+        key = (Path(path), size)
+        with self._lock:
+            variant = self._variants.get(key)
+            if variant is not None:
+                self._variants.move_to_end(key)
+                return variant
+
+            source = self._source(key[0])
+            if source is None:
+                return None
+            variant = source.resize(size, Image.LANCZOS)
+            self._variants[key] = variant
+            if len(self._variants) > self.max_variants:
+                self._variants.popitem(last=False)
+            return variant
+
+    def get_photo(self, path: Path, size: Size) -> Optional[ImageTk.PhotoImage]:
+        """
+        Tk PhotoImage of the resized variant. Tk thread only.
+        """
+        key = (Path(path), size)
+        photo = self._photos.get(key)
+        if photo is not None:
+            self._photos.move_to_end(key)
+            return photo
+
+        variant = self.get_resized(path, size)
+        if variant is None:
+            return None
+        photo = ImageTk.PhotoImage(variant)
+        self._photos[key] = photo
+        if len(self._photos) > self.max_variants:
+            self._photos.popitem(last=False)
+        return photo
+
+    def precompute(self, variants: Iterable[Tuple[Path, Size]]) -> threading.Thread:
+        """
+        Decode and resize `variants` on a daemon thread.
+        """
+        variants = list(variants)
+
+        def _run():
+            for path, size in variants:
+                self.get_resized(path, size)
+
+        thread = threading.Thread(target=_run, name="asset-precompute", daemon=True)
+        thread.start()
+        return thread
+
+
+asset_cache = ImageAssetCache()
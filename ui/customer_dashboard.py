@@ -4,6 +4,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
+from ui.profiler import profiled_view, ui_profiler
+
 
 class CustomerDashboard(tk.Frame):
     """
@@ -267,6 +269,64 @@ class CustomerDashboard(tk.Frame):
             bd=0
         ).pack(side="left", padx=10)
 
+    def _attach_autocomplete(self, entry):
+        """Suggest known places below a location entry while typing"""
+        suggestions = tk.Listbox(
+            entry.master,
+            font=("Segoe UI", 10),
+            height=5,
+            relief="solid",
+            bd=1,
+            activestyle="none",
+            selectbackground="#667eea",
+            selectforeground="white"
+        )
+
+        def hide(event=None):
+            suggestions.pack_forget()
+
+        def choose(event=None):
+            selection = suggestions.curselection()
+            if selection:
+                entry.delete(0, tk.END)
+                entry.insert(0, suggestions.get(selection[0]))
+            hide()
+            entry.focus_set()
+            entry.icursor(tk.END)
+            return "break"
+
+        def update(event):
+            if event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+                return
+            try:
+                names = self.controller.context.locations.complete(entry.get())
+            except Exception:
+                names = []
+            suggestions.delete(0, tk.END)
+            for name in names:
+                suggestions.insert(tk.END, name)
+            if names and names != [entry.get().strip()]:
+                suggestions.configure(height=len(names))
+                suggestions.pack(fill="x", after=entry)
+            else:
+                hide()
+
+        def move_down(event):
+            if suggestions.winfo_ismapped():
+                suggestions.focus_set()
+                suggestions.selection_clear(0, tk.END)
+                suggestions.selection_set(0)
+                suggestions.activate(0)
+                return "break"
+
+        entry.bind("<KeyRelease>", update, add="+")
+        entry.bind("<Down>", move_down, add="+")
+        entry.bind("<Escape>", hide, add="+")
+        suggestions.bind("<Return>", choose)
+        suggestions.bind("<Double-Button-1>", choose)
+        suggestions.bind("<ButtonRelease-1>", choose)
+        suggestions.bind("<Escape>", lambda e: (hide(), entry.focus_set()))
+
     def _show_book_taxi(self):
         """Show book taxi form"""
         self._clear_content()
@@ -310,6 +370,7 @@ class CustomerDashboard(tk.Frame):
             highlightbackground="#e5e7eb"
         )
         pickup_entry.pack(fill="x", ipady=10)
+        self._attach_autocomplete(pickup_entry)
 
         # Drop-off Location
         tk.Label(
@@ -331,6 +392,7 @@ class CustomerDashboard(tk.Frame):
             highlightbackground="#e5e7eb"
         )
         dropoff_entry.pack(fill="x", ipady=10)
+        self._attach_autocomplete(dropoff_entry)
 
         # Date and Time in one row
         datetime_frame = tk.Frame(form_frame, bg="white")
@@ -461,6 +523,7 @@ class CustomerDashboard(tk.Frame):
     # ------------------------------------------------------------------ #
     #  MY BOOKINGS
     # ------------------------------------------------------------------ #
+    @profiled_view
     def _show_my_bookings(self):
         """Show customer's bookings"""
         self._clear_content()
@@ -502,7 +565,8 @@ class CustomerDashboard(tk.Frame):
 
         try:
             booking_service = self.controller.context.booking_service
-            bookings = booking_service.get_customer_bookings(self.user['id'])
+            with ui_profiler.phase("fetch"):
+                bookings = booking_service.get_customer_bookings(self.user['id'])
 
             if not bookings:
                 empty_frame = tk.Frame(bookings_frame, bg="white")
@@ -579,19 +643,25 @@ class CustomerDashboard(tk.Frame):
             scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
             tree.configure(yscrollcommand=scrollbar.set)
 
-            for booking in bookings:
-                values = (
-                    booking['id'],
-                    booking['pickup_location'],
-                    booking['dropoff_location'],
-                    booking['pickup_date'],
-                    booking['pickup_time'],
-                    booking['status'].upper()
-                )
-                tree.insert("", "end", values=values, tags=(booking['id'],))
-
-            tree.pack(side="left", fill="both", expand=True)
-            scrollbar.pack(side="right", fill="y")
+            with ui_profiler.phase("transform"):
+                rows = [
+                    (
+                        booking['id'],
+                        booking['pickup_location'],
+                        booking['dropoff_location'],
+                        booking['pickup_date'],
+                        booking['pickup_time'],
+                        booking['status'].upper()
+                    )
+                    for booking in bookings
+                ]
+
+            with ui_profiler.phase("render"):
+                for values in rows:
+                    tree.insert("", "end", values=values, tags=(values[0],))
+
+                tree.pack(side="left", fill="both", expand=True)
+                scrollbar.pack(side="right", fill="y")
 
             btn_frame = tk.Frame(bookings_frame, bg="white")
             btn_frame.pack(fill="x", pady=(15, 0))
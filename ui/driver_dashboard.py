@@ -3,6 +3,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from ui.profiler import profiled_view, ui_profiler
+
 
 class DriverDashboard(tk.Frame):
     """
@@ -123,6 +125,7 @@ class DriverDashboard(tk.Frame):
 
         self._show_assigned_trips()
 
+    @profiled_view
     def _show_assigned_trips(self):
         """Show driver's assigned trips"""
         for widget in self.content_area.winfo_children():
@@ -141,7 +144,8 @@ class DriverDashboard(tk.Frame):
 
         try:
             booking_service = self.controller.context.booking_service
-            trips = booking_service.get_driver_bookings(self.user['id'])
+            with ui_profiler.phase("fetch"):
+                trips = booking_service.get_driver_bookings(self.user['id'])
 
             if not trips:
                 tk.Label(
@@ -165,137 +169,145 @@ class DriverDashboard(tk.Frame):
             canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
             canvas.configure(yscrollcommand=scrollbar.set)
 
-            for trip in trips:
-                card = tk.Frame(
-                    scrollable_frame,
-                    bg="#f9fafb",
-                    relief="solid",
-                    bd=1,
-                    highlightbackground="#e5e7eb",
-                    highlightthickness=1
-                )
-                card.pack(fill="x", pady=10, padx=5)
-
-                card_inner = tk.Frame(card, bg="#f9fafb")
-                card_inner.pack(fill="both", expand=True, padx=20, pady=15)
-
-                header_row = tk.Frame(card_inner, bg="#f9fafb")
-                header_row.pack(fill="x", pady=(0, 10))
+            def make_start_handler(booking_id: int):
+                def _handler():
+                    try:
+                        booking_service.start_ride(booking_id, self.user["id"])
+                        messagebox.showinfo("Ride started", "Ride has been started successfully.")
+                        self._show_assigned_trips()
+                    except Exception as e:
+                        messagebox.showerror("Error", f"Could not start ride: {e}")
+                return _handler
+
+            def make_complete_handler(booking_id: int):
+                def _handler():
+                    try:
+                        booking_service.complete_ride(booking_id, self.user["id"])
+                        messagebox.showinfo("Ride completed", "Ride has been completed successfully.")
+                        self.user["status"] = "available"
+                        self._build_dashboard()
+                    except Exception as e:
+                        messagebox.showerror("Error", f"Could not complete ride: {e}")
+                return _handler
+
+            status_colors = {
+                "pending": "#f59e0b",
+                "confirmed": "#10b981",
+                "completed": "#6b7280",
+                "cancelled": "#ef4444"
+            }
+            with ui_profiler.phase("transform"):
+                cards = [
+                    (
+                        trip["id"],
+                        trip["status"],
+                        status_colors.get(trip["status"], "#6b7280"),
+                        [
+                            ("📍 Pickup:", trip['pickup_location']),
+                            ("📍 Drop-off:", trip['dropoff_location']),
+                            ("📅 Date:", trip['pickup_date']),
+                            ("🕐 Time:", trip['pickup_time']),
+                            ("👤 Customer:", trip.get('customer_name', 'N/A')),
+                            ("📞 Phone:", trip.get('customer_phone', 'N/A')),
+                        ],
+                    )
+                    for trip in trips
+                ]
 
-                tk.Label(
-                    header_row,
-                    text=f"Trip #{trip['id']}",
-                    font=("Segoe UI", 13, "bold"),
-                    bg="#f9fafb",
-                    fg="#1f2937"
-                ).pack(side="left")
-
-                status_color = {
-                    "pending": "#f59e0b",
-                    "confirmed": "#10b981",
-                    "completed": "#6b7280",
-                    "cancelled": "#ef4444"
-                }.get(trip['status'], "#6b7280")
+            with ui_profiler.phase("render"):
+                for trip_id, status, status_color, details in cards:
+                    card = tk.Frame(
+                        scrollable_frame,
+                        bg="#f9fafb",
+                        relief="solid",
+                        bd=1,
+                        highlightbackground="#e5e7eb",
+                        highlightthickness=1
+                    )
+                    card.pack(fill="x", pady=10, padx=5)
 
-                tk.Label(
-                    header_row,
-                    text=trip['status'].upper(),
-                    font=("Segoe UI", 9, "bold"),
-                    bg=status_color,
-                    fg="white",
-                    padx=10,
-                    pady=3
-                ).pack(side="right")
-
-                details = [
-                    ("📍 Pickup:", trip['pickup_location']),
-                    ("📍 Drop-off:", trip['dropoff_location']),
-                    ("📅 Date:", trip['pickup_date']),
-                    ("🕐 Time:", trip['pickup_time']),
-                    ("👤 Customer:", trip.get('customer_name', 'N/A')),
-                    ("📞 Phone:", trip.get('customer_phone', 'N/A')),
-                ]
+                    card_inner = tk.Frame(card, bg="#f9fafb")
+                    card_inner.pack(fill="both", expand=True, padx=20, pady=15)
 
-                for label, value in details:
-                    row = tk.Frame(card_inner, bg="#f9fafb")
-                    row.pack(fill="x", pady=3)
+                    header_row = tk.Frame(card_inner, bg="#f9fafb")
+                    header_row.pack(fill="x", pady=(0, 10))
 
                     tk.Label(
-                        row,
-                        text=label,
-                        font=("Segoe UI", 10, "bold"),
+                        header_row,
+                        text=f"Trip #{trip_id}",
+                        font=("Segoe UI", 13, "bold"),
                         bg="#f9fafb",
-                        fg="#374151",
-                        width=15,
-                        anchor="w"
+                        fg="#1f2937"
                     ).pack(side="left")
 
                     tk.Label(
-                        row,
-                        text=value,
-                        font=("Segoe UI", 10),
-                        bg="#f9fafb",
-                        fg="#6b7280"
-                    ).pack(side="left")
-
-                actions_row = tk.Frame(card_inner, bg="#f9fafb")
-                actions_row.pack(fill="x", pady=(10, 0))
-
-                def make_start_handler(booking_id: int):
-                    def _handler():
-                        try:
-                            booking_service.start_ride(booking_id, self.user["id"])
-                            messagebox.showinfo("Ride started", "Ride has been started successfully.")
-                            self._show_assigned_trips()
-                        except Exception as e:
-                            messagebox.showerror("Error", f"Could not start ride: {e}")
-                    return _handler
-
-                def make_complete_handler(booking_id: int):
-                    def _handler():
-                        try:
-                            booking_service.complete_ride(booking_id, self.user["id"])
-                            messagebox.showinfo("Ride completed", "Ride has been completed successfully.")
-                            self.user["status"] = "available"
-                            self._build_dashboard()
-                        except Exception as e:
-                            messagebox.showerror("Error", f"Could not complete ride: {e}")
-                    return _handler
-
-                status = trip["status"]
-                if status == "assigned":
-                    tk.Button(
-                        actions_row,
-                        text="Start Ride",
-                        font=("Segoe UI", 10, "bold"),
-                        bg="#10b981",
+                        header_row,
+                        text=status.upper(),
+                        font=("Segoe UI", 9, "bold"),
+                        bg=status_color,
                         fg="white",
-                        activebackground="#059669",
-                        activeforeground="white",
-                        relief="flat",
-                        cursor="hand2",
-                        command=make_start_handler(trip["id"]),
-                        padx=15,
-                        pady=6,
-                    ).pack(side="left")
-                elif status == "ongoing":
-                    tk.Button(
-                        actions_row,
-                        text="Complete Ride",
-                        font=("Segoe UI", 10, "bold"),
-                        bg="#3b82f6",
-                        fg="white",
-                        activebackground="#2563eb",
-                        activeforeground="white",
-                        relief="flat",
-                        cursor="hand2",
-                        command=make_complete_handler(trip["id"]),
-                        padx=15,
-                        pady=6,
-                    ).pack(side="left")
-
-            canvas.pack(side="left", fill="both", expand=True)
-            scrollbar.pack(side="right", fill="y")
+                        padx=10,
+                        pady=3
+                    ).pack(side="right")
+
+                    for label, value in details:
+                        row = tk.Frame(card_inner, bg="#f9fafb")
+                        row.pack(fill="x", pady=3)
+
+                        tk.Label(
+                            row,
+                            text=label,
+                            font=("Segoe UI", 10, "bold"),
+                            bg="#f9fafb",
+                            fg="#374151",
+                            width=15,
+                            anchor="w"
+                        ).pack(side="left")
+
+                        tk.Label(
+                            row,
+                            text=value,
+                            font=("Segoe UI", 10),
+                            bg="#f9fafb",
+                            fg="#6b7280"
+                        ).pack(side="left")
+
+                    actions_row = tk.Frame(card_inner, bg="#f9fafb")
+                    actions_row.pack(fill="x", pady=(10, 0))
+
+                    if status == "assigned":
+                        tk.Button(
+                            actions_row,
+                            text="Start Ride",
+                            font=("Segoe UI", 10, "bold"),
+                            bg="#10b981",
+                            fg="white",
+                            activebackground="#059669",
+                            activeforeground="white",
+                            relief="flat",
+                            cursor="hand2",
+                            command=make_start_handler(trip_id),
+                            padx=15,
+                            pady=6,
+                        ).pack(side="left")
+                    elif status == "ongoing":
+                        tk.Button(
+                            actions_row,
+                            text="Complete Ride",
+                            font=("Segoe UI", 10, "bold"),
+                            bg="#3b82f6",
+                            fg="white",
+                            activebackground="#2563eb",
+                            activeforeground="white",
+                            relief="flat",
+                            cursor="hand2",
+                            command=make_complete_handler(trip_id),
+                            padx=15,
+                            pady=6,
+                        ).pack(side="left")
+
+                canvas.pack(side="left", fill="both", expand=True)
+                scrollbar.pack(side="right", fill="y")
 
             tk.Button(
                 trips_frame,
@@ -0,0 +1,94 @@
+# ui/gradient.py
+
+import tkinter as tk
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+RGB = Tuple[int, int, int]
+
+# Sizes are rounded up to a multiple of this, so dragging the window edge
+# reuses the same image until the canvas grows past the next bucket.
+SIZE_BUCKET = 64
+MAX_CACHED_IMAGES = 16
+
+_image_cache: "OrderedDict[tuple, tk.PhotoImage]" = OrderedDict()
+
+
+def _bucket(value: int) -> int:
+    return max(SIZE_BUCKET, -(-value // SIZE_BUCKET) * SIZE_BUCKET)
+
+
+def gradient_image(master: tk.Misc, top: RGB, bottom: RGB, width: int, height: int) -> tk.PhotoImage:
+    """
+    Vertical gradient covering at least width x height, from a small LRU cache.
+
+    The column of colours is rendered once into a 1px-wide image and
+    widened with zoom(), which Tk does in C.
+    """
+    width, height = _bucket(width), _bucket(height)
+    key = (id(master.tk), top, bottom, width, height)
+    image = _image_cache.get(key)
+    if image is not None:
+        _image_cache.move_to_end(key)
+        return image
+
+    colours = []
+    for y in range(height):
+        ratio = y / height
+        r = int(top[0] + (bottom[0] - top[0]) * ratio)
+        g = int(top[1] + (bottom[1] - top[1]) * ratio)
+        b = int(top[2] + (bottom[2] - top[2]) * ratio)
+        colours.append(f"{{#{r:02x}{g:02x}{b:02x}}}")
+
+    column = tk.PhotoImage(master=master, width=1, height=height)
+    column.put(" ".join(colours))
+    image = column.zoom(width, 1)
+
+    _image_cache[key] = image
+    if len(_image_cache) > MAX_CACHED_IMAGES:
+        _image_cache.popitem(last=False)
+    return image
+
+
+class GradientBackground:
+    """
+    Keeps a gradient image behind everything else on a canvas.
+
+    <Configure> events are debounced: a burst of resizes (window drag)
+    produces one redraw `delay_ms` after the last event, and a redraw
+    whose bucketed size did not change is skipped. Nothing runs while the
+    window is idle.
+    """
+
+    def __init__(self, canvas: tk.Canvas, top: RGB, bottom: RGB, delay_ms: int = 50):
+        self.canvas = canvas
+        self.top = top
+        self.bottom = bottom
+        self.delay_ms = delay_ms
+
+        self._item: Optional[int] = None
+        self._image: Optional[tk.PhotoImage] = None
+        self._pending: Optional[str] = None
+
+        canvas.bind("<Configure>", self._on_configure, add="+")
+
+    def _on_configure(self, event=None):
+        if self._pending is not None:
+            self.canvas.after_cancel(self._pending)
+        self._pending = self.canvas.after(self.delay_ms, self.redraw)
+
+    def redraw(self):
+        self._pending = None
+        width = self.canvas.winfo_width() or 900
+        height = self.canvas.winfo_height() or 600
+
+        image = gradient_image(self.canvas, self.top, self.bottom, width, height)
+        if image is self._image:
+            return
+        self._image = image
+
+        if self._item is None:
+            self._item = self.canvas.create_image(0, 0, anchor="nw", image=image, tags="gradient")
+        else:
+            self.canvas.itemconfigure(self._item, image=image)
+        self.canvas.tag_lower(self._item)
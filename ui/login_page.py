@@ -2,7 +2,10 @@
 
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
+
+from services.rate_limiter import LoginRateLimited
+from ui.assets import asset_cache, LOGIN_IMAGE
+from ui.gradient import GradientBackground
 
 
 class LoginPage(tk.Frame):
@@ -18,11 +21,10 @@ class LoginPage(tk.Frame):
         self.controller = controller
 
         self.configure(bg="#667eea")
-        
-        self.bind("<Configure>", self._on_resize)
-        
+
         self.canvas = tk.Canvas(self, highlightthickness=0)
         self.canvas.place(x=0, y=0, relwidth=1, relheight=1)
+        self.background = GradientBackground(self.canvas, top=(102, 126, 234), bottom=(139, 161, 242))
 
         self.main_container = tk.Frame(self.canvas, bg="white")
         self.main_container.place(relx=0.5, rely=0.5, anchor="c", width=800, height=500)
@@ -32,10 +34,7 @@ class LoginPage(tk.Frame):
         self.left_frame.pack_propagate(False)
 
         self.side_image = None
-        try:
-            img = Image.open("assets/login_image.jpg")
-            self._load_side_image()
-        except Exception:
+        if not self._load_side_image():
             self._create_fallback_content()
 
         self.right_frame = tk.Frame(self.main_container, bg="white", width=450)
@@ -111,7 +110,7 @@ class LoginPage(tk.Frame):
         )
         self.password_entry.pack(fill="x", ipady=8, pady=(0, 25))
 
-        login_btn = tk.Button(
+        self.login_btn = tk.Button(
             form_frame,
             text="Login",
             font=("Segoe UI", 11, "bold"),
@@ -125,7 +124,7 @@ class LoginPage(tk.Frame):
             bd=0,
             width=35
         )
-        login_btn.pack(fill="x", ipady=10, pady=(0, 15))
+        self.login_btn.pack(fill="x", ipady=10, pady=(0, 15))
 
         # Divider
         divider_frame = tk.Frame(form_frame, bg="white")
@@ -151,25 +150,6 @@ class LoginPage(tk.Frame):
         )
         register_btn.pack(fill="x", ipady=8)
 
-    def _on_resize(self, event=None):
-        """Handle window resize to redraw gradient"""
-        self.after(10, self._draw_gradient)
-        
-    def _draw_gradient(self):
-        """Draw a gradient background on canvas"""
-        self.canvas.delete("gradient")
-        width = self.canvas.winfo_width() or 900
-        height = self.canvas.winfo_height() or 600
-        
-        step = max(1, height // 100)
-        for i in range(0, height, step):
-            ratio = i / height
-            r = int(102 + (139 - 102) * ratio)
-            g = int(126 + (161 - 126) * ratio)
-            b = int(234 + (242 - 234) * ratio)
-            color = f'#{r:02x}{g:02x}{b:02x}'
-            self.canvas.create_rectangle(0, i, width, i + step, fill=color, outline=color, tags="gradient")
-
     def _create_fallback_content(self):
         """Create fallback decorative content when image not found"""
         deco_frame = tk.Frame(self.left_frame, bg="#667eea")
@@ -200,17 +180,18 @@ class LoginPage(tk.Frame):
             justify="center"
         ).pack(pady=10)
 
-    def _load_side_image(self):
-        """Load and display side image"""
-        try:
-            img = Image.open("assets/login_image.jpg")
-            height = self.left_frame.winfo_height() or 500
-            img = img.resize((350, height), Image.LANCZOS)
-            self.side_image = ImageTk.PhotoImage(img)
-            img_label = tk.Label(self.left_frame, image=self.side_image, bg="#667eea")
-            img_label.place(x=0, y=0, relwidth=1, relheight=1)
-        except:
-            pass
+    def _load_side_image(self) -> bool:
+        """Load and display side image; False if it is not available"""
+        height = self.left_frame.winfo_height()
+        if height <= 1:
+            # not mapped yet
+            height = 500
+        self.side_image = asset_cache.get_photo(LOGIN_IMAGE, (350, height))
+        if self.side_image is None:
+            return False
+        img_label = tk.Label(self.left_frame, image=self.side_image, bg="#667eea")
+        img_label.place(x=0, y=0, relwidth=1, relheight=1)
+        return True
 
     def handle_login(self):
         username = self.username_entry.get().strip()
@@ -220,9 +201,31 @@ class LoginPage(tk.Frame):
             messagebox.showerror("Error", "Please enter both username and password.")
             return
 
-        user_service = self.controller.context.user_service
-        user = user_service.login(username, password)
+        try:
+            # waits here if the background database start-up is still running
+            user_service = self.controller.context.user_service
+        except Exception as e:
+            messagebox.showerror("Database Error", f"Could not connect to the database: {e}")
+            return
+
+        try:
+            pending = user_service.begin_login(username, password)
+        except LoginRateLimited as e:
+            messagebox.showerror("Login failed", str(e))
+            return
+
+        # the password hash is checked on a worker thread; poll for it
+        self.login_btn.config(state="disabled")
+        self._await_login(user_service, pending)
+
+    def _await_login(self, user_service, pending):
+        if not pending.done():
+            self.after(15, self._await_login, user_service, pending)
+            return
+        self.login_btn.config(state="normal")
+        self._complete_login(user_service.finish_login(pending))
 
+    def _complete_login(self, user):
         if not user:
             messagebox.showerror(
                 "Login failed", "Invalid credentials or inactive account."
@@ -234,15 +237,15 @@ class LoginPage(tk.Frame):
 
         role = user["role"]
         if role == "customer":
-            customer_dash = self.controller.frames["CustomerDashboard"]
+            customer_dash = self.controller.get_frame("CustomerDashboard")
             customer_dash.set_user(user)
             self.controller.show_frame("CustomerDashboard")
         elif role == "driver":
-            driver_dash = self.controller.frames["DriverDashboard"]
+            driver_dash = self.controller.get_frame("DriverDashboard")
             driver_dash.set_user(user)
             self.controller.show_frame("DriverDashboard")
         elif role == "admin":
-            admin_dash = self.controller.frames["AdminDashboard"]
+            admin_dash = self.controller.get_frame("AdminDashboard")
             admin_dash.set_user(user)
             self.controller.show_frame("AdminDashboard")
         else:
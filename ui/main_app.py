@@ -1,13 +1,30 @@
-
+import importlib
+import os
+import time
 import tkinter as tk
-from typing import Dict
+from typing import Callable, Dict, Iterable, Optional
 
 from ui.app_context import AppContext
-from ui.login_page import LoginPage
-from ui.register_page import RegisterPage
-from ui.customer_dashboard import CustomerDashboard
-from ui.driver_dashboard import DriverDashboard
-from ui.admin_dashboard import AdminDashboard
+from ui.assets import asset_cache, STARTUP_VARIANTS
+from ui.profiler import ui_profiler
+
+
+# page name -> module defining a class of that name. Modules are imported
+# and frames built the first time the page is shown.
+PAGES: Dict[str, str] = {
+    "LoginPage": "ui.login_page",
+    "RegisterPage": "ui.register_page",
+    "CustomerDashboard": "ui.customer_dashboard",
+    "DriverDashboard": "ui.driver_dashboard",
+    "AdminDashboard": "ui.admin_dashboard",
+}
+
+# Heavy per-user frames dropped on logout; rebuilt on the next login.
+EVICTABLE_PAGES = ("CustomerDashboard", "DriverDashboard", "AdminDashboard")
+
+
+def _print_startup_time(seconds: float) -> None:
+    print(f"Startup: first frame shown after {seconds * 1000:.1f} ms")
 
 
 class MainApp(tk.Tk):
@@ -15,56 +32,114 @@ class MainApp(tk.Tk):
     Root Tkinter application.
     Manages switching between LoginPage, RegisterPage and dashboards
     in the same window/frame.
+
+    Frames are created on first show_frame()/get_frame(), so startup only
+    pays for the login screen. With `evict_on_logout` the dashboards are
+    destroyed when the user logs out.
+
+    `startup_hook(seconds)` is called once the first frame is on screen,
+    with the time since `started_at` (defaults to construction time).
+    Setting TAXI_STARTUP_TIMING=1 prints it when no hook is given.
+
+    `profiler` is the shared UIProfiler; when profiling is enabled
+    (TAXI_UI_PROFILE or main.py --profile) frame builds are traced and
+    the main loop is watched for stalls.
     """
 
-    def __init__(self, context: AppContext):
+    def __init__(
+        self,
+        context: AppContext,
+        evict_on_logout: bool = True,
+        startup_hook: Optional[Callable[[float], None]] = None,
+        started_at: Optional[float] = None,
+    ):
+        self._started_at = started_at if started_at is not None else time.perf_counter()
         super().__init__()
         self.title("Taxi Booking System")
         self.geometry("900x600")
 
         self.context = context
         self.current_user = None
+        self.evict_on_logout = evict_on_logout
 
-        container = tk.Frame(self)
-        container.pack(side="top", fill="both", expand=True)
+        if startup_hook is None and os.environ.get("TAXI_STARTUP_TIMING"):
+            startup_hook = _print_startup_time
+        self.startup_hook = startup_hook
 
-        container.grid_rowconfigure(0, weight=1)
-        container.grid_columnconfigure(0, weight=1)
+        self.container = tk.Frame(self)
+        self.container.pack(side="top", fill="both", expand=True)
+
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
 
         self.frames: Dict[str, tk.Frame] = {}
+        # seconds spent building each frame (last build)
+        self.frame_build_times: Dict[str, float] = {}
 
-        for PageClass in (
-            LoginPage,
-            RegisterPage,
-            CustomerDashboard,
-            DriverDashboard,
-            AdminDashboard,
-        ):
-            page_name = PageClass.__name__
-            frame = PageClass(parent=container, controller=self)
-            self.frames[page_name] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        self.profiler = ui_profiler
+        self.profiler.start_heartbeat(self)
+
+        # decode/resize the side images while the login page is built
+        asset_cache.precompute(STARTUP_VARIANTS)
 
         self.show_frame("LoginPage")
 
-    def show_frame(self, page_name: str):
+        if self.startup_hook is not None:
+            self.after_idle(self._report_startup)
+
+    def _report_startup(self):
+        self.update_idletasks()
+        self.startup_hook(time.perf_counter() - self._started_at)
+
+    def get_frame(self, page_name: str) -> tk.Frame:
         """
-        Bring a frame to the front.
+        Return the frame for `page_name`, building it on first use.
         """
         frame = self.frames.get(page_name)
-        if frame is None:
+        if frame is not None:
+            return frame
+
+        module_name = PAGES.get(page_name)
+        if module_name is None:
             raise ValueError(f"No frame named '{page_name}'")
-        frame.tkraise()
+
+        start = time.perf_counter()
+        with self.profiler.view(f"build {page_name}"):
+            PageClass = getattr(importlib.import_module(module_name), page_name)
+            frame = PageClass(parent=self.container, controller=self)
+            frame.grid(row=0, column=0, sticky="nsew")
+        self.frames[page_name] = frame
+        self.frame_build_times[page_name] = time.perf_counter() - start
+        return frame
+
+    def show_frame(self, page_name: str):
+        """
+        Bring a frame to the front.
+        """
+        self.get_frame(page_name).tkraise()
+
+    def evict_frames(self, pages: Iterable[str] = EVICTABLE_PAGES):
+        """
+        Destroy cached frames that are not currently needed.
+        """
+        for page_name in pages:
+            frame = self.frames.pop(page_name, None)
+            if frame is not None:
+                frame.destroy()
 
     def set_current_user(self, user: dict):
         """
         Store the logged-in user dict.
         """
         self.current_user = user
+        if user is None and self.evict_on_logout:
+            # dashboards call this from their own logout handler, so wait
+            # until that handler has returned before destroying them
+            self.after_idle(self.evict_frames)
 
     def logout(self):
         """
         Log out current user and go back to LoginPage.
         """
-        self.current_user = None
+        self.set_current_user(None)
         self.show_frame("LoginPage")
@@ -0,0 +1,200 @@
+# ui/profiler.py
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, List, Optional
+
+
+_DEFAULT_TRACE_PATH = "taxi-ui-trace.json"
+
+
+class UIProfiler:
+    """
+    Opt-in profiler for the Tk screens.
+
+    - view(name) times a whole screen build and phase(name) the steps
+      inside it (fetch = service/DB calls, transform = Python row
+      formatting, render = widget creation). After the view, the time
+      until Tk has processed its pending idle work (geometry, drawing)
+      is recorded as a "layout+paint" phase.
+    - An after() heartbeat on the Tk root records a "stall" whenever the
+      main loop was blocked for more than `stall_ms`.
+    - write_trace() saves everything in the Chrome trace-event format,
+      viewable in chrome://tracing, Perfetto or speedscope.
+
+    Enable with TAXI_UI_PROFILE=1 (or =<trace path>), or main.py --profile.
+    While disabled, view()/phase() return a shared no-op context.
+    """
+
+    def __init__(self, stall_ms: float = 50.0, heartbeat_ms: int = 10, max_events: int = 100_000):
+        self.enabled = False
+        self.stall_ms = stall_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.trace_path = _DEFAULT_TRACE_PATH
+        self._events: deque = deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+        self._root = None
+        self._last_beat: Optional[float] = None
+        self._current_view: Optional[str] = None
+        self._last_view: Optional[str] = None
+        self._noop = nullcontext()
+
+    def enable(self, trace_path: Optional[str] = None) -> None:
+        """
+        Start profiling; the trace is written to `trace_path` at exit.
+        """
+        if trace_path:
+            self.trace_path = trace_path
+        if not self.enabled:
+            self.enabled = True
+            atexit.register(self._write_at_exit)
+
+    # ---- recording -------------------------------------------------------
+
+    def _micros(self, t: float) -> float:
+        return (t - self._origin) * 1_000_000
+
+    def _complete_event(self, name: str, category: str, start: float, end: float, **args: Any) -> None:
+        self._events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self._micros(start),
+            "dur": (end - start) * 1_000_000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+
+    def view(self, name: str):
+        if not self.enabled:
+            return self._noop
+        return self._view(name)
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return self._noop
+        return self._phase(name)
+
+    @contextmanager
+    def _view(self, name: str):
+        outer = self._current_view
+        self._current_view = self._last_view = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._current_view = outer
+            self._complete_event(name, "view", start, end)
+            if self._root is not None and outer is None:
+                # queued behind Tk's own redraw/geometry idle handlers
+                self._root.after_idle(
+                    lambda: self._complete_event(
+                        "layout+paint", "phase", end, time.perf_counter(), view=name
+                    )
+                )
+
+    @contextmanager
+    def _phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._complete_event(name, "phase", start, time.perf_counter(), view=self._current_view)
+
+    # ---- stall detection ---------------------------------------------------
+
+    def start_heartbeat(self, root) -> None:
+        """
+        Watch `root`'s event loop for stalls while profiling is enabled.
+        """
+        if not self.enabled:
+            return
+        self._root = root
+        self._last_beat = time.perf_counter()
+        root.after(self.heartbeat_ms, self._beat)
+
+    def _beat(self) -> None:
+        now = time.perf_counter()
+        expected = self._last_beat + self.heartbeat_ms / 1000
+        late_ms = (now - expected) * 1000
+        if late_ms > self.stall_ms:
+            self._complete_event(
+                "stall", "stall", expected, now,
+                late_ms=round(late_ms, 1),
+                during=self._current_view or self._last_view,
+            )
+        self._last_beat = now
+        try:
+            self._root.after(self.heartbeat_ms, self._beat)
+        except Exception:
+            # the window is being destroyed
+            pass
+
+    # ---- output ------------------------------------------------------------
+
+    def events(self) -> List[Dict[str, Any]]:
+        return list(self._events)
+
+    def write_trace(self, path: Optional[str] = None) -> str:
+        path = path or self.trace_path
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f)
+        return path
+
+    def summary(self) -> str:
+        """
+        Total and worst time per view/phase, plus the number of stalls.
+        """
+        totals: Dict[tuple, List[float]] = {}
+        stalls = 0
+        for event in self._events:
+            if event["cat"] == "stall":
+                stalls += 1
+                continue
+            if event["cat"] == "view":
+                key = (event["name"], "")
+            else:
+                key = (str(event["args"].get("view")), event["name"])
+            totals.setdefault(key, []).append(event["dur"] / 1000)
+        lines = [f"{'count':>6} {'total ms':>10} {'max ms':>9}  view / phase"]
+        for (view, phase), durations in sorted(totals.items()):
+            label = f"  {phase}" if phase else view
+            lines.append(f"{len(durations):>6} {sum(durations):>10.1f} {max(durations):>9.1f}  {label}")
+        lines.append(f"{stalls} main-thread stalls over {self.stall_ms:.0f} ms")
+        return "\n".join(lines)
+
+    def _write_at_exit(self) -> None:
+        if self._events:
+            path = self.write_trace()
+            print(self.summary())
+            print(f"UI trace written to {path}")
+
+
+ui_profiler = UIProfiler()
+
+_env = os.environ.get("TAXI_UI_PROFILE", "").strip()
+if _env and _env.lower() not in ("0", "false", "no", "off"):
+    ui_profiler.enable(None if _env.lower() in ("1", "true", "yes", "on") else _env)
+
+
+def profiled_view(method: Callable) -> Callable:
+    """
+    Decorator for dashboard _show_* methods: profile the call as a view
+    named "<Class>.<method>".
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not ui_profiler.enabled:
+            return method(self, *args, **kwargs)
+        with ui_profiler.view(f"{type(self).__name__}.{method.__name__}"):
+            return method(self, *args, **kwargs)
+
+    return wrapper
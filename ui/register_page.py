@@ -2,7 +2,9 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
+
+from ui.assets import asset_cache, REGISTER_IMAGE
+from ui.gradient import GradientBackground
 
 
 class RegisterPage(tk.Frame):
@@ -12,11 +14,10 @@ class RegisterPage(tk.Frame):
         self.controller = controller
 
         self.configure(bg="#764ba2")
-        
-        self.bind("<Configure>", self._on_resize)
-        
+
         self.canvas = tk.Canvas(self, highlightthickness=0)
         self.canvas.place(x=0, y=0, relwidth=1, relheight=1)
+        self.background = GradientBackground(self.canvas, top=(118, 75, 162), bottom=(247, 167, 216))
 
         self.main_container = tk.Frame(self.canvas, bg="white")
         self.main_container.place(relx=0.5, rely=0.5, anchor="c", width=820, height=550)
@@ -141,31 +142,9 @@ class RegisterPage(tk.Frame):
         self.right_frame.pack_propagate(False)
 
         self.side_image = None
-        try:
-            img = Image.open("assets/register_image.jpg")
-            self._load_side_image()
-        except Exception:
+        if not self._load_side_image():
             self._create_fallback_content()
 
-    def _on_resize(self, event=None):
-        """Handle window resize to redraw gradient"""
-        self.after(10, self._draw_gradient)
-
-    def _draw_gradient(self):
-        """Draw a gradient background on canvas"""
-        self.canvas.delete("gradient")
-        width = self.canvas.winfo_width() or 900
-        height = self.canvas.winfo_height() or 600
-        
-        step = max(1, height // 100)
-        for i in range(0, height, step):
-            ratio = i / height
-            r = int(118 + (247 - 118) * ratio)
-            g = int(75 + (167 - 75) * ratio)
-            b = int(162 + (216 - 162) * ratio)
-            color = f'#{r:02x}{g:02x}{b:02x}'
-            self.canvas.create_rectangle(0, i, width, i + step, fill=color, outline=color, tags="gradient")
-
     def _create_fallback_content(self):
         """Create fallback decorative content when image not found"""
         deco_frame = tk.Frame(self.right_frame, bg="#764ba2")
@@ -285,17 +264,18 @@ class RegisterPage(tk.Frame):
             entry.pack(fill="x", ipady=6, padx=5)
             self.entries[f"{label_text}:"] = entry
 
-    def _load_side_image(self):
-        """Load and display side image"""
-        try:
-            img = Image.open("assets/register_image.jpg")
-            height = self.right_frame.winfo_height() or 550
-            img = img.resize((320, height), Image.LANCZOS)
-            self.side_image = ImageTk.PhotoImage(img)
-            img_label = tk.Label(self.right_frame, image=self.side_image, bg="#764ba2")
-            img_label.place(x=0, y=0, relwidth=1, relheight=1)
-        except:
-            pass
+    def _load_side_image(self) -> bool:
+        """Load and display side image; False if it is not available"""
+        height = self.right_frame.winfo_height()
+        if height <= 1:
+            # not mapped yet
+            height = 550
+        self.side_image = asset_cache.get_photo(REGISTER_IMAGE, (320, height))
+        if self.side_image is None:
+            return False
+        img_label = tk.Label(self.right_frame, image=self.side_image, bg="#764ba2")
+        img_label.place(x=0, y=0, relwidth=1, relheight=1)
+        return True
 
     def handle_register(self):
         user_type = self.user_type_var.get()